@@ -0,0 +1,109 @@
+# ============================================================
+# ⏱️ Benchmark : discrétisation des étages / années de construction
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Comparer l'ancien chemin par chaînes
+#     (`np.select` / `.apply` ligne à ligne + `OrdinalEncoder`)
+#     aux codes directs de `src/binning.py` (`np.searchsorted`).
+# 📌 **Méthode :**
+#     - Part du CSV brut (3 376 bâtiments), imputé comme le prétraitement.
+#     - Le réplique ×1, ×30, ×300, ×1000 (jusqu'à ~3,4 M lignes).
+#     - Vérifie l'égalité des codes, puis écrit les temps en JSON dans `logs/`.
+# ============================================================
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import OrdinalEncoder
+from loguru import logger
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.config import RAW_DATA_PATH, LOGS_DIR
+from src.preprocessing import COLUMNS_MAPPING, FIXED_MEDIANS
+from src.binning import add_bins, FLOORS_CATEGORIES, YEAR_BUILT_CATEGORIES
+
+
+# ============================================================
+# 🐢 Ancien chemin : chaînes puis OrdinalEncoder
+# ============================================================
+def year_built_category(year):
+    if year <= 1960:
+        return '1900-1960'
+    elif year <= 1976:
+        return '1961-1976'
+    elif year <= 1980:
+        return '1977-1980'
+    elif year <= 1994:
+        return '1981-1994'
+    else:
+        return '1995-2015'
+
+
+def legacy_categories(df):
+    """🐢 Reproduction de l'ancien `add_categories`."""
+    conditions_floors = [
+        (df["num_floors"] <= 4),
+        (df["num_floors"] > 4) & (df["num_floors"] <= 8),
+        (df["num_floors"] > 8)
+    ]
+    floors = pd.DataFrame({"floors_cat": np.select(conditions_floors, FLOORS_CATEGORIES)})
+    floors_cat = OrdinalEncoder(categories=[FLOORS_CATEGORIES]).fit_transform(floors).astype(int) + 1
+    years = pd.DataFrame({"year_built_cat": df["year_built"].apply(year_built_category)})
+    year_built_cat = OrdinalEncoder(categories=[YEAR_BUILT_CATEGORIES]).fit_transform(years).astype(int) + 1
+    return {"floors_cat": floors_cat.ravel(), "year_built_cat": year_built_cat.ravel()}
+
+
+def best_of(func, df, repeats):
+    """⏱️ Meilleur temps (s) sur `repeats` exécutions, et le dernier résultat."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main(args):
+    raw = pd.read_csv(RAW_DATA_PATH, usecols=["NumberofFloors", "YearBuilt"]).rename(columns=COLUMNS_MAPPING)
+    raw = raw.fillna({col: FIXED_MEDIANS[col] for col in raw.columns})
+    logger.info(f"📂 {len(raw)} bâtiments bruts chargés depuis : {RAW_DATA_PATH}")
+
+    results = []
+    for factor in args.scales:
+        df = pd.DataFrame({col: np.tile(raw[col].to_numpy(), factor) for col in raw.columns})
+        legacy_s, expected = best_of(legacy_categories, df, args.repeats)
+        binned_s, codes = best_of(add_bins, df, args.repeats)
+        for feature in expected:
+            np.testing.assert_array_equal(codes[feature], expected[feature], err_msg=feature)
+
+        results.append({
+            "rows": len(df),
+            "legacy_s": legacy_s,
+            "binning_s": binned_s,
+            "speedup": legacy_s / binned_s,
+            "binning_rows_per_s": len(df) / binned_s,
+        })
+        logger.info(f"⏱️ {len(df):>9} lignes : {legacy_s:.4f}s → {binned_s:.4f}s (×{legacy_s / binned_s:.0f})")
+
+    output = LOGS_DIR / "bench_binning.json"
+    output.write_text(json.dumps(results, indent=2))
+    logger.info(f"💾 Résultats écrits dans : {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de la discrétisation vectorisée.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 30, 300, 1000],
+                        help="Facteurs de réplication du fichier brut.")
+    parser.add_argument("--repeats", type=int, default=3)
+    main(parser.parse_args())
+
+# ============================================================
+# 🎉 Exécution :
+#     ➔ python benchmarks/bench_binning.py
+# ============================================================
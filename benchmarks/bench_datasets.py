@@ -0,0 +1,105 @@
+# ============================================================
+# ⏱️ Benchmark : chargement des datasets CSV vs Parquet vs Feather
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Mesurer le temps de chargement et la mémoire
+#     résidente (RSS) des datasets traités selon leur format.
+# 📌 **Méthode :**
+#     - Part de `dataset_cleaned.csv` (1 668 bâtiments, 31 colonnes).
+#     - Le réplique ×1, ×30, ×300 et l'écrit en CSV, puis en
+#       Parquet / Feather typés via `src/datasets.write_columnar`.
+#     - Chaque chargement tourne dans un processus neuf (RSS propre) :
+#       fichier complet, puis seulement les 10 features du modèle Énergie.
+#     - Écrit les résultats en JSON dans `logs/`.
+# ============================================================
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.config import CLEANED_DATA_PATH, LOGS_DIR
+from src.datasets import write_columnar
+
+ENERGY_FEATURES = ["site_eui", "f_is_large_building", "floors_cat", "building_density", "gas_ratio",
+                   "electricity_ratio", "year_built_cat", "property_type_office", "f_has_natural_gas",
+                   "property_type_storage"]
+
+# 🧪 Script exécuté dans un processus neuf : RSS mesurée juste après le chargement
+CHILD_SCRIPT = """
+import json, sys, time, psutil
+sys.path.insert(0, {root!r})
+import numpy as np
+import pandas as pd
+from src.datasets import load_dataset
+process = psutil.Process()
+rss_before = process.memory_info().rss
+start = time.perf_counter()
+if {path!r}.endswith(".csv"):
+    frame = pd.read_csv({path!r}, usecols={columns!r})  # Chemin actuel : texte reparsé
+else:
+    frame = load_dataset({path!r}, columns={columns!r})
+loaded = time.perf_counter() - start
+rss_mb = (process.memory_info().rss - rss_before) / 2**20
+checksum = float(np.nansum(frame.select_dtypes("number").to_numpy(dtype=np.float64)))
+print(json.dumps({{"load_s": loaded, "rss_mb": rss_mb, "checksum": checksum}}))
+"""
+
+def measure(path, columns):
+    """⏱️ Meilleur temps sur 3 processus neufs ; RSS et somme de contrôle du dernier."""
+    runs = []
+    for _ in range(3):
+        code = CHILD_SCRIPT.format(root=str(BASE_DIR), path=str(path), columns=columns)
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        runs.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    return {"load_s": min(r["load_s"] for r in runs), "rss_mb": runs[-1]["rss_mb"], "checksum": runs[-1]["checksum"]}
+
+
+def main(args):
+    base = pd.read_csv(CLEANED_DATA_PATH)
+    logger.info(f"📂 {len(base)} lignes × {base.shape[1]} colonnes chargées depuis : {CLEANED_DATA_PATH}")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for factor in args.scales:
+            csv_path = Path(tmp) / f"cleaned_x{factor}.csv"
+            pd.concat([base] * factor, ignore_index=True).to_csv(csv_path, index=False)
+            write_columnar(csv_path)
+            sizes = {suffix: csv_path.with_suffix(suffix).stat().st_size / 2**20
+                     for suffix in [".csv", ".parquet", ".feather"]}
+
+            for label, columns in [("all_columns", None), ("energy_features", ENERGY_FEATURES)]:
+                row = {"rows": len(base) * factor, "columns": label}
+                for suffix in [".csv", ".parquet", ".feather"]:
+                    stats = measure(csv_path.with_suffix(suffix), columns)
+                    row[suffix[1:]] = {**stats, "file_mb": sizes[suffix]}
+                # ✅ Mêmes données (à l'arrondi float32 près)
+                checksums = [row[fmt]["checksum"] for fmt in ["csv", "parquet", "feather"]]
+                assert np.allclose(checksums, checksums[0], rtol=1e-5), checksums
+                results.append(row)
+                logger.info(f"⏱️ {row['rows']:>8} lignes, {label:<15} : " + " | ".join(
+                    f"{fmt} {row[fmt]['load_s'] * 1000:.1f} ms / {row[fmt]['rss_mb']:.1f} Mo"
+                    for fmt in ["csv", "parquet", "feather"]))
+
+    output = LOGS_DIR / "bench_datasets.json"
+    output.write_text(json.dumps(results, indent=2))
+    logger.info(f"💾 Résultats écrits dans : {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de chargement CSV / Parquet / Feather.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 30, 300],
+                        help="Facteurs de réplication du dataset nettoyé.")
+    main(parser.parse_args())
+
+# ============================================================
+# 🎉 Exécution :
+#     ➔ python benchmarks/bench_datasets.py
+# ============================================================
@@ -0,0 +1,81 @@
+# ============================================================
+# ⏱️ Benchmark : coût des statistiques de dérive par requête
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Vérifier que `DriftMonitor.observe` reste dans
+#     un budget de quelques µs par requête sur le chemin critique.
+# 📌 **Méthode :**
+#     - Données synthétiques (k features, 10 bins comme `DRIFT_BINS`) :
+#       référence sur `--rows` lignes, puis lignes rejouées par lots de
+#       1 (`/predict_<cible>`), 16, 256 et 4 096 lignes.
+#     - Médiane sur `--repeats` appels, en µs par appel et par ligne.
+#     - Écrit les résultats en JSON dans `logs/`.
+# ============================================================
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.config import LOGS_DIR, RANDOM_STATE
+from src.drift import DriftMonitor, reference_stats
+
+
+def median_us(function, repeats):
+    """⏱️ Médiane (µs) de `repeats` appels."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1e6
+
+
+def bench_features(n_features, args):
+    """⏱️ Coût de `observe` (par lot) et de `report` pour `n_features` features."""
+    rng = np.random.default_rng(RANDOM_STATE)
+    data = rng.normal(size=(args.rows, n_features))
+    features = [f"f{j}" for j in range(n_features)]
+    reference = reference_stats(pd.DataFrame(data, columns=features), features)
+
+    results = {"n_features": n_features, "observe": []}
+    for batch in args.batches:
+        monitor = DriftMonitor("bench", features, reference, publish_seconds=0)
+        rows = data[np.arange(batch) % len(data)]
+        per_call = median_us(lambda: monitor.observe(rows), args.repeats)
+        results["observe"].append({"rows": batch, "us_per_call": per_call, "us_per_row": per_call / batch})
+        logger.info(f"⏱️ {n_features} features, {batch:>5} ligne(s) : {per_call:.1f} µs par appel, "
+                    f"{per_call / batch:.3f} µs par ligne")
+
+    monitor = DriftMonitor("bench", features, reference, publish_seconds=0)
+    monitor.observe(data)
+    results["report_us"] = median_us(monitor.report, 200)
+    logger.info(f"📊 {n_features} features : rapport `/drift_<cible>` en {results['report_us']:.0f} µs")
+    return results
+
+
+def main(args):
+    results = [bench_features(n_features, args) for n_features in args.features]
+    output = LOGS_DIR / "bench_drift.json"
+    output.write_text(json.dumps(results, indent=2))
+    logger.info(f"💾 Résultats écrits dans : {output}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark des statistiques de dérive par requête.")
+    parser.add_argument("--batches", type=int, nargs="+", default=[1, 16, 256, 4096], help="Tailles de lot.")
+    parser.add_argument("--features", type=int, nargs="+", default=[10, 30], help="Nombres de features.")
+    parser.add_argument("--rows", type=int, default=20_000, help="Lignes de la référence.")
+    parser.add_argument("--repeats", type=int, default=2000, help="Appels mesurés par taille de lot.")
+    main(parser.parse_args())
+
+# ============================================================
+# 🎉 Exécution :
+#     ➔ python benchmarks/bench_drift.py
+# ============================================================
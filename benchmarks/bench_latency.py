@@ -0,0 +1,228 @@
+# ============================================================
+# ⏱️ Benchmark : débit et latence des services de prédiction
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Mesurer RPS et latences p50/p95/p99 de
+#     `/predict_energy` et `/predict_co2`, et détecter les régressions.
+# 📌 **Méthode :**
+#     - Rejoue des lignes du dataset nettoyé (`CLEANED_DATA_PATH`,
+#       seul fichier contenant toutes les features des deux modèles).
+#     - Client asyncio `aiohttp`, une ou plusieurs concurrences.
+#     - 🌐 `--mode remote` : services déjà lancés (ports de config.py).
+#     - 🏠 `--mode inprocess` : le service BentoML est importé, ses runners
+#       initialisés localement et servi par uvicorn dans ce processus.
+#     - Écrit un JSON dans `logs/` ; `--baseline` compare à un run précédent.
+# ============================================================
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import aiohttp
+import bentoml
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.config import CLEANED_DATA_PATH, ENERGY_SERVICE_PORT, CO2_SERVICE_PORT, LOGS_DIR
+
+# 🎯 Cibles disponibles : (modèle BentoML, port du service dédié, endpoint)
+TARGETS = {
+    "energy": ("site_energy_use_model:latest", ENERGY_SERVICE_PORT, "predict_energy"),
+    "co2": ("ghg_emissions_model:latest", CO2_SERVICE_PORT, "predict_co2"),
+}
+
+
+# ============================================================
+# 🏠 Service BentoML dans le processus courant
+# ============================================================
+class InProcessService:
+    """
+    📄 **Description :**
+    - Importe `module:attribut`, initialise les runners en local (pas de
+      processus runner séparé) et sert l'application ASGI avec uvicorn
+      sur un port libre, dans la boucle asyncio du benchmark.
+    """
+
+    def __init__(self, service_path):
+        import uvicorn  # Fourni avec BentoML
+
+        module_name, attribute = service_path.split(":")
+        service = getattr(importlib.import_module(module_name), attribute)
+        for runner in service.runners:
+            runner.init_local(quiet=True)
+        # ⚠️ lifespan désactivé : les runners sont déjà initialisés localement
+        config = uvicorn.Config(service.asgi_app, host="127.0.0.1", port=0, log_level="warning", lifespan="off")
+        self.server = uvicorn.Server(config)
+        self.task = None
+
+    async def __aenter__(self):
+        self.task = asyncio.create_task(self.server.serve())
+        while not self.server.started:
+            await asyncio.sleep(0.05)
+        self.port = self.server.servers[0].sockets[0].getsockname()[1]
+        logger.info(f"🏠 Service en processus sur le port {self.port}")
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.should_exit = True
+        await self.task
+
+
+# ============================================================
+# 🚀 Salve de requêtes concurrentes d'une ligne
+# ============================================================
+async def run_load(session, url, rows, concurrency):
+    """🚀 Envoie chaque ligne dans sa propre requête ; retourne latences (s), erreurs, durée."""
+    latencies = np.full(len(rows), np.nan)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_request(index, row):
+        async with semaphore:
+            start = time.perf_counter()
+            async with session.post(url, json={"features": row}) as response:
+                body = await response.read()
+            if response.status == 200 and b'"error"' not in body:
+                latencies[index] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request(i, row) for i, row in enumerate(rows)))
+    elapsed = time.perf_counter() - start
+    ok = latencies[~np.isnan(latencies)]
+    return ok, len(rows) - len(ok), elapsed
+
+
+def summarize(target, endpoint, concurrency, latencies, errors, elapsed):
+    """📊 Statistiques d'une salve (latences en millisecondes)."""
+    ms = latencies * 1000 if len(latencies) else np.array([np.nan])
+    return {
+        "target": target,
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": int(len(latencies) + errors),
+        "errors": int(errors),
+        "rps": float(len(latencies) / elapsed),
+        "latency_ms": {
+            "mean": float(np.mean(ms)),
+            "p50": float(np.percentile(ms, 50)),
+            "p95": float(np.percentile(ms, 95)),
+            "p99": float(np.percentile(ms, 99)),
+            "max": float(np.max(ms)),
+        },
+    }
+
+
+# ============================================================
+# 📉 Comparaison avec un run de référence
+# ============================================================
+def compare(results, baseline_path, tolerance):
+    """📉 Liste les régressions (RPS en baisse / p99 en hausse au-delà de `tolerance`)."""
+    baseline = {(r["target"], r["concurrency"]): r for r in json.loads(Path(baseline_path).read_text())["results"]}
+    regressions = []
+    for result in results:
+        reference = baseline.get((result["target"], result["concurrency"]))
+        if reference is None:
+            continue
+        if result["rps"] < reference["rps"] * (1 - tolerance):
+            regressions.append(f"{result['target']}@{result['concurrency']} RPS {reference['rps']:.0f} → {result['rps']:.0f}")
+        if result["latency_ms"]["p99"] > reference["latency_ms"]["p99"] * (1 + tolerance):
+            regressions.append(f"{result['target']}@{result['concurrency']} p99 "
+                               f"{reference['latency_ms']['p99']:.1f} → {result['latency_ms']['p99']:.1f} ms")
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def benchmark(args, ports):
+    data = pd.read_csv(CLEANED_DATA_PATH)
+    results = []
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)) as session:
+        for target in args.targets:
+            model_tag, _, endpoint = TARGETS[target]
+            features = bentoml.sklearn.get(model_tag).custom_objects["features"]
+            url = f"http://{args.host}:{ports[target]}/{endpoint}"
+            warmup = data[features].sample(n=args.warmup, replace=True, random_state=1).values.tolist()
+            await run_load(session, url, warmup, max(args.concurrency))
+
+            for concurrency in args.concurrency:
+                rows = data[features].sample(n=args.requests, replace=True, random_state=0).values.tolist()
+                latencies, errors, elapsed = await run_load(session, url, rows, concurrency)
+                result = summarize(target, endpoint, concurrency, latencies, errors, elapsed)
+                results.append(result)
+                logger.info(f"⏱️ {target} @ {concurrency} : {result['rps']:.0f} RPS, "
+                            f"p50 {result['latency_ms']['p50']:.1f} / p95 {result['latency_ms']['p95']:.1f} / "
+                            f"p99 {result['latency_ms']['p99']:.1f} ms, {errors} erreur(s)")
+    return results
+
+
+async def main(args):
+    if args.mode == "inprocess":
+        async with InProcessService(args.service) as service:
+            results = await benchmark(args, {target: service.port for target in args.targets})
+    else:
+        ports = {target: args.port or TARGETS[target][1] for target in args.targets}
+        results = await benchmark(args, ports)
+
+    report = {
+        "label": args.label,
+        "mode": args.mode,
+        "service": args.service if args.mode == "inprocess" else args.host,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "results": results,
+    }
+    output = args.output or LOGS_DIR / f"bench_latency_{args.label}.json"
+    Path(output).write_text(json.dumps(report, indent=2))
+    logger.info(f"💾 Résultats écrits dans : {output}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        for regression in regressions:
+            logger.error(f"📉 Régression : {regression}")
+        if regressions:
+            sys.exit(1)
+        logger.success(f"✅ Aucune régression au-delà de {args.tolerance:.0%} par rapport à {args.baseline}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de débit et de latence des services de prédiction.")
+    parser.add_argument("--targets", nargs="+", choices=sorted(TARGETS), default=["energy", "co2"])
+    parser.add_argument("--mode", choices=["remote", "inprocess"], default="remote")
+    parser.add_argument("--service", default="src.service:EnergyCO2PredictionService",
+                        help="Service importé en mode inprocess (module:attribut).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="Port unique (service combiné) en mode remote.")
+    parser.add_argument("--requests", type=int, default=2000, help="Requêtes par palier de concurrence.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Mode inprocess : désactive le cache de prédictions (PREDICTION_CACHE_MAX_BYTES=0).")
+    parser.add_argument("--label", default="run", help="Suffixe du fichier de résultats.")
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None, help="JSON d'un run précédent à comparer.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Écart toléré avant de signaler une régression.")
+    arguments = parser.parse_args()
+    if arguments.no_cache:
+        os.environ["PREDICTION_CACHE_MAX_BYTES"] = "0"  # ⚠️ Avant l'import du service
+    asyncio.run(main(arguments))
+
+# ============================================================
+# 🎉 Exemples :
+#     ➔ python benchmarks/bench_latency.py --mode inprocess --no-cache --label baseline
+#     ➔ python benchmarks/bench_latency.py --mode inprocess --no-cache --label pr --baseline logs/bench_latency_baseline.json
+#     ➔ python benchmarks/bench_latency.py --mode remote --port 3000   (service combiné déjà lancé)
+# ============================================================
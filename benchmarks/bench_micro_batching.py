@@ -0,0 +1,129 @@
+# ============================================================
+# ⏱️ Benchmark : micro-batching adaptatif des runners
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Mesurer l'effet du regroupement des requêtes
+#     concurrentes d'une ligne sur la latence (p50/p99) et la
+#     taille réelle des lots exécutés par le runner.
+# 📌 **Méthode :**
+#     - Envoie N requêtes `/predict_energy` ou `/predict_co2`
+#       avec C requêtes simultanées (client asyncio `aiohttp`).
+#     - Lit l'histogramme `bentoml_runner_adaptive_batch_size`
+#       exposé sur `/metrics` avant et après la salve.
+#     - Écrit le résultat en JSON dans `logs/` pour comparaison.
+# ============================================================
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+import bentoml
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.config import CLEANED_DATA_PATH, ENERGY_SERVICE_PORT, CO2_SERVICE_PORT, LOGS_DIR
+
+# 🎯 Cibles disponibles : (modèle BentoML, port, endpoint)
+TARGETS = {
+    "energy": ("site_energy_use_model:latest", ENERGY_SERVICE_PORT, "predict_energy"),
+    "co2": ("ghg_emissions_model:latest", CO2_SERVICE_PORT, "predict_co2"),
+}
+
+BATCH_METRIC = re.compile(r'^bentoml_runner_adaptive_batch_size_(sum|count)\{[^}]*method_name="predict"[^}]*\}\s+(\S+)$')
+
+
+# ============================================================
+# 📊 Lecture de l'histogramme des tailles de lot
+# ============================================================
+async def read_batch_metrics(session, base_url):
+    """📊 Retourne (somme, nombre) cumulés des tailles de lot du runner."""
+    totals = {"sum": 0.0, "count": 0.0}
+    async with session.get(f"{base_url}/metrics") as response:
+        for line in (await response.text()).splitlines():
+            match = BATCH_METRIC.match(line)
+            if match:
+                totals[match.group(1)] += float(match.group(2))
+    return totals["sum"], totals["count"]
+
+
+# ============================================================
+# 🚀 Salve de requêtes concurrentes d'une ligne
+# ============================================================
+async def run_load(url, rows, concurrency):
+    """🚀 Envoie chaque ligne dans sa propre requête, `concurrency` à la fois."""
+    latencies = np.empty(len(rows))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_request(session, index, row):
+        async with semaphore:
+            start = time.perf_counter()
+            async with session.post(url, json={"features": row}) as response:
+                await response.read()
+                if response.status != 200:
+                    raise RuntimeError(f"❌ HTTP {response.status} sur {url}")
+            latencies[index] = time.perf_counter() - start
+
+    async with aiohttp.ClientSession() as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(one_request(session, i, row) for i, row in enumerate(rows)))
+        elapsed = time.perf_counter() - start
+    return latencies, elapsed
+
+
+async def main(args):
+    model_tag, port, endpoint = TARGETS[args.target]
+    features = bentoml.sklearn.get(model_tag).custom_objects["features"]
+    data = pd.read_csv(CLEANED_DATA_PATH)[features]
+    rows = data.sample(n=args.requests, replace=True, random_state=0).values.tolist()
+
+    base_url = f"http://{args.host}:{port}"
+    async with aiohttp.ClientSession() as session:
+        sum_before, count_before = await read_batch_metrics(session, base_url)
+        latencies, elapsed = await run_load(f"{base_url}/{endpoint}", rows, args.concurrency)
+        sum_after, count_after = await read_batch_metrics(session, base_url)
+
+    runner_calls = count_after - count_before
+    result = {
+        "label": args.label,
+        "target": args.target,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "rps": args.requests / elapsed,
+        "latency_ms": {
+            "p50": float(np.percentile(latencies, 50) * 1000),
+            "p99": float(np.percentile(latencies, 99) * 1000),
+        },
+        "runner_calls": int(runner_calls),
+        "mean_batch_size": (sum_after - sum_before) / runner_calls if runner_calls else None,
+    }
+
+    output = LOGS_DIR / f"bench_micro_batching_{args.target}_{args.label}.json"
+    output.write_text(json.dumps(result, indent=2))
+    logger.success(f"✅ {result}")
+    logger.info(f"💾 Résultats écrits dans : {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark du micro-batching adaptatif des runners.")
+    parser.add_argument("--target", choices=sorted(TARGETS), default="energy")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--label", default="batching", help="Suffixe du fichier de résultats (ex. 'no_batching').")
+    asyncio.run(main(parser.parse_args()))
+
+# ============================================================
+# 🎉 Comparaison avec / sans regroupement :
+#     ➔ BENTOML_CONFIG_OPTIONS="runners.batching.enabled=false" bentoml serve src.energy_service:energy_prediction_service --port 3000
+#     ➔ python benchmarks/bench_micro_batching.py --label no_batching
+#     ➔ bentoml serve src.energy_service:energy_prediction_service --port 3000
+#     ➔ python benchmarks/bench_micro_batching.py --label batching
+# ============================================================
@@ -0,0 +1,117 @@
+# ============================================================
+# ⏱️ Benchmark : validation des features par requête
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Comparer l'ancien chemin pydantic (coercition
+#     élément par élément, contrôle de longueur seul) au
+#     `FeatureValidator` de `src/validation.py`, qui contrôle en plus
+#     finitude et plages d'entraînement.
+# 📌 **Méthode :**
+#     - Lignes réelles du dataset nettoyé, features du modèle Énergie,
+#       plages apprises sur ces mêmes lignes (marge de config.py).
+#     - Une ligne (`/predict_energy`, chemin le plus fréquent) et des
+#       lots de 256 lignes (`/predict_energy_batch`).
+#     - Coût par appel (µs) : meilleur de `--repeats` passes sur toutes
+#       les lignes ; résultats écrits en JSON dans `logs/`.
+# ============================================================
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from loguru import logger
+from pydantic import BaseModel, Field, field_validator
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.config import CLEANED_DATA_PATH, ENERGY_FEATURES_PATH, FEATURE_RANGE_MARGIN, LOGS_DIR
+from src.validation import FeatureValidator, feature_ranges, to_feature_matrix
+
+FEATURES = joblib.load(ENERGY_FEATURES_PATH)
+
+
+# ============================================================
+# 🐢 Ancien chemin : modèles pydantic des endpoints JSON
+# ============================================================
+class LegacyRow(BaseModel):
+    features: list[float] = Field(...)
+
+    @field_validator("features")
+    @classmethod
+    def check_length(cls, v):
+        if len(v) != len(FEATURES):
+            raise ValueError(f"❌ {len(FEATURES)} attendues, {len(v)} reçues.")
+        return v
+
+
+class LegacyBatch(BaseModel):
+    features: list[list[float]] = Field(...)
+
+    @field_validator("features")
+    @classmethod
+    def check_shape(cls, v):
+        return to_feature_matrix(v, FEATURES)
+
+
+def legacy_row(payload):
+    return np.array(LegacyRow.model_validate(payload).features, dtype=np.float64).reshape(1, -1)
+
+
+def legacy_batch(payload):
+    return LegacyBatch.model_validate(payload).features
+
+
+def per_call_us(func, payloads, repeats):
+    """⏱️ Coût moyen d'un appel (µs) sur la meilleure de `repeats` passes."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for payload in payloads:
+            func(payload)
+        timings.append(time.perf_counter() - start)
+    return min(timings) / len(payloads) * 1e6
+
+
+def main(args):
+    data = pd.read_csv(CLEANED_DATA_PATH)
+    validator = FeatureValidator(FEATURES, feature_ranges(data, FEATURES), margin=FEATURE_RANGE_MARGIN)
+    rows = data[FEATURES].to_numpy(dtype=np.float64).tolist()  # Corps JSON décodés : listes de floats Python
+    logger.info(f"📂 {len(rows)} bâtiments, {len(FEATURES)} features (modèle Énergie)")
+
+    single = [{"features": row} for row in rows]
+    batches = [{"features": rows[start:start + args.batch_size]}
+               for start in range(0, len(rows) - args.batch_size + 1, args.batch_size)]
+    cases = [("single_row", legacy_row, validator.validate_row, single),
+             (f"batch_{args.batch_size}", legacy_batch, validator.validate_rows, batches)]
+
+    results = []
+    for label, legacy, current, payloads in cases:
+        for payload in payloads[:50]:  # ✅ Mêmes matrices par les deux chemins
+            np.testing.assert_array_equal(current(payload), legacy(payload))
+        legacy_us = per_call_us(legacy, payloads, args.repeats)
+        current_us = per_call_us(current, payloads, args.repeats)
+        results.append({"case": label, "calls": len(payloads), "pydantic_us": legacy_us, "validator_us": current_us,
+                        "speedup": legacy_us / current_us})
+        logger.info(f"⏱️ {label:>10} : pydantic {legacy_us:.2f} µs → FeatureValidator {current_us:.2f} µs "
+                    f"(×{legacy_us / current_us:.2f})")
+
+    output = LOGS_DIR / "bench_validation.json"
+    output.write_text(json.dumps(results, indent=2))
+    logger.info(f"💾 Résultats écrits dans : {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de la validation des features par requête.")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--repeats", type=int, default=20)
+    main(parser.parse_args())
+
+# ============================================================
+# 🎉 Exécution :
+#     ➔ python benchmarks/bench_validation.py
+# ============================================================
@@ -0,0 +1,121 @@
+# ============================================================
+# ⏱️ Profil du démarrage à froid des services
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Suivre le temps avant la première réponse d'un
+#     réplica (auto-scaling) et le comparer à `STARTUP_BUDGET_S`.
+# 📌 **Mesures (chacune dans un processus Python neuf) :**
+#     - 📦 `python -X importtime` : modules les plus coûteux à l'import.
+#     - ⏱️ Étapes : import du service, initialisation de chaque runner
+#       (chargement du modèle), première prédiction.
+#     - 🧠 Modules lourds effectivement chargés (lightgbm, sklearn, pandas…).
+#     - Écrit un JSON dans `logs/` ; code de sortie 1 si budget dépassé.
+# ============================================================
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from loguru import logger
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.config import LOGS_DIR, STARTUP_BUDGET_S
+
+HEAVY_MODULES = ["lightgbm", "sklearn", "pandas", "scipy", "pyarrow"]
+
+# 🧪 Exécuté dans un processus neuf : mesure les étapes et affiche un JSON
+CHILD_SCRIPT = """
+import importlib, json, sys, time
+import numpy as np
+start = time.perf_counter()
+module_name, attribute = sys.argv[1].split(":")
+service = getattr(importlib.import_module(module_name), attribute)
+stages = {"import_service_s": time.perf_counter() - start}
+for runner in service.runners:
+    t = time.perf_counter()
+    runner.init_local(quiet=True)
+    stages[f"init_runner_{runner.name}_s"] = time.perf_counter() - t
+t = time.perf_counter()
+for runner in service.runners:
+    n_features = len(runner.models[0].custom_objects["features"])
+    runner.predict.run(np.zeros((1, n_features)))
+stages["first_prediction_s"] = time.perf_counter() - t
+stages["total_s"] = time.perf_counter() - start
+heavy = sorted({name.split(".")[0] for name in sys.modules} & set(sys.argv[2].split(",")))
+print(json.dumps({"stages": stages, "heavy_modules_loaded": heavy}))
+"""
+
+
+def run_child(python_args, env):
+    """🧪 Lance `python <python_args>` dans un processus neuf."""
+    return subprocess.run([sys.executable, *python_args], cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True)
+
+
+def import_profile(service_path, env, top):
+    """📦 Modules les plus coûteux (temps cumulé) d'après `-X importtime`."""
+    module_name = service_path.split(":")[0]
+    completed = run_child(["-X", "importtime", "-c", f"import {module_name}"], env)
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cumulative_us, name = [part.strip() for part in line.replace("import time:", "|").split("|")]
+        entries.append({"module": name.strip(), "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000})
+    total = next((e["cumulative_ms"] for e in entries if e["module"] == module_name), None)
+    return total, sorted(entries, key=lambda e: e["cumulative_ms"], reverse=True)[:top]
+
+
+def main(args):
+    env = {**os.environ, "INFERENCE_BACKEND": args.backend, "PYTHONPATH": str(BASE_DIR)}
+    import_total_ms, top_imports = import_profile(args.service, env, args.top)
+
+    runs = []
+    for _ in range(args.repeats):
+        completed = run_child(["-c", CHILD_SCRIPT, args.service, ",".join(HEAVY_MODULES)], env)
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    best = min(runs, key=lambda run: run["stages"]["total_s"])
+
+    report = {
+        "label": args.label,
+        "service": args.service,
+        "backend": args.backend,
+        "budget_s": args.budget_s,
+        "import_total_ms": import_total_ms,
+        "top_imports": top_imports,
+        "stages": best["stages"],
+        "heavy_modules_loaded": best["heavy_modules_loaded"],
+    }
+    output = LOGS_DIR / f"cold_start_{args.label}.json"
+    output.write_text(json.dumps(report, indent=2))
+
+    for name, seconds in best["stages"].items():
+        logger.info(f"⏱️ {name:<45} {seconds * 1000:8.1f} ms")
+    logger.info(f"🧠 Modules lourds chargés : {best['heavy_modules_loaded'] or 'aucun'}")
+    logger.info(f"💾 Résultats écrits dans : {output}")
+    if best["stages"]["total_s"] > args.budget_s:
+        logger.error(f"❌ Démarrage {best['stages']['total_s']:.2f}s > budget {args.budget_s:.2f}s")
+        sys.exit(1)
+    logger.success(f"✅ Démarrage {best['stages']['total_s']:.2f}s ≤ budget {args.budget_s:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profil du démarrage à froid d'un service BentoML.")
+    parser.add_argument("--service", default="src.service:EnergyCO2PredictionService")
+    parser.add_argument("--backend", choices=["sklearn", "flat_trees"], default=os.getenv("INFERENCE_BACKEND", "sklearn"))
+    parser.add_argument("--budget-s", type=float, default=STARTUP_BUDGET_S)
+    parser.add_argument("--repeats", type=int, default=3, help="Meilleur de N démarrages.")
+    parser.add_argument("--top", type=int, default=15, help="Nombre de modules affichés dans le profil d'import.")
+    parser.add_argument("--label", default=None)
+    arguments = parser.parse_args()
+    arguments.label = arguments.label or arguments.backend
+    main(arguments)
+
+# ============================================================
+# 🎉 Exemples :
+#     ➔ python benchmarks/profile_cold_start.py --backend sklearn
+#     ➔ python benchmarks/profile_cold_start.py --backend flat_trees --budget-s 2
+# ============================================================
@@ -0,0 +1,122 @@
+# ============================================================
+# 🔬 Profil du prétraitement (et de l'enregistrement) par étape
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Voir où passe le temps quand le dataset brut
+#     grossit, et faire échouer la CI si une étape régresse.
+# 📌 **Méthode :**
+#     - CSV brut répété `--scale` fois (dans un répertoire temporaire) ;
+#       prétraitement complet : ajustement, transformation, export CSV
+#       puis Parquet / Feather (mêmes fonctions que le script).
+#     - `--register` : enregistre aussi le modèle Énergie dans un store
+#       BentoML temporaire (le store réel n'est pas modifié).
+#     - Par étape : temps mural, part du total, lignes/s, pic mémoire ;
+#       `logs/profile_<label>.json` + `logs/profile_<label>.prof` (cProfile).
+#     - `--baseline logs/profile_<ref>.json` : code de sortie 1 si une étape
+#       est plus lente de `PROFILE_TOLERANCE` et `PROFILE_MIN_SECONDS`.
+# ============================================================
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+from loguru import logger
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.config import (
+    RAW_DATA_PATH, CLEANED_DATA_PATH, ENERGY_MODEL_PATH, ENERGY_FEATURES_PATH, PREPROCESSING_CHUNKSIZE, LOGS_DIR,
+    PROFILE_TOLERANCE, PROFILE_MIN_SECONDS,
+)
+from src.preprocessing import fit_preprocessing, transform_to_files
+from src.datasets import export_columnar
+from src.profiling import profiling, stage, compare_to_baseline
+
+
+def scaled_raw_csv(raw_path, scale, workdir):
+    """📂 CSV brut répété `scale` fois (croissance du dataset simulée)."""
+    if scale == 1:
+        return Path(raw_path)
+    path = workdir / "raw_scaled.csv"
+    raw = pd.read_csv(raw_path)
+    pd.concat([raw] * scale, ignore_index=True).to_csv(path, index=False)
+    return path
+
+
+def run_preprocessing(raw_path, workdir, chunksize):
+    """🔄 Prétraitement complet vers `workdir` (étapes balisées dans src/preprocessing.py)."""
+    co2_path, energy_path = workdir / "co2.csv", workdir / "energy.csv"
+    with stage("fit"):
+        params = fit_preprocessing(raw_path, chunksize=chunksize)
+    with stage("transform"):
+        transform_to_files(raw_path, params, co2_path=co2_path, energy_path=energy_path, chunksize=chunksize)
+    with stage("columnar"):
+        for path in (co2_path, energy_path):
+            export_columnar(path, chunksize=chunksize)
+
+
+def run_registration(workdir):
+    """💾 Enregistrement du modèle Énergie dans un store BentoML temporaire."""
+    import joblib
+
+    os.environ["BENTOML_HOME"] = str(workdir / "bentoml")  # Avant le premier import de bentoml
+    from src.model_registry import register_model
+    from src.datasets import load_dataset
+
+    with stage("registration"):
+        data = load_dataset(CLEANED_DATA_PATH) if CLEANED_DATA_PATH.exists() else None
+        register_model("site_energy_use_model", joblib.load(ENERGY_MODEL_PATH), joblib.load(ENERGY_FEATURES_PATH),
+                       data)
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        raw_path = scaled_raw_csv(args.raw, args.scale, workdir)
+        logger.info(f"📂 Profil sur {raw_path.name} (×{args.scale}, morceaux de {args.chunksize} lignes)")
+        with profiling(args.label, trace_memory=not args.no_memory, use_cprofile=not args.no_cprofile) as report:
+            run_preprocessing(raw_path, workdir, args.chunksize)
+            if args.register:
+                run_registration(workdir)
+    report["scale"] = args.scale
+    report["chunksize"] = args.chunksize
+
+    if args.baseline is None:
+        return
+    baseline = json.loads(Path(args.baseline).read_text())
+    regressions = compare_to_baseline(report, baseline, args.tolerance, args.min_seconds)
+    for regression in regressions:
+        logger.error(f"❌ {regression['stage']} : {regression['seconds']:.3f} s "
+                     f"(référence {regression['baseline_s']:.3f} s, ×{regression['ratio']:.2f})")
+    if regressions:
+        sys.exit(1)
+    logger.success(f"✅ Aucune étape plus lente que {args.baseline} (tolérance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profil par étape du prétraitement et de l'enregistrement.")
+    parser.add_argument("--raw", type=Path, default=RAW_DATA_PATH, help="CSV brut à prétraiter.")
+    parser.add_argument("--scale", type=int, default=1, help="Nombre de répétitions du CSV brut.")
+    parser.add_argument("--chunksize", type=int, default=PREPROCESSING_CHUNKSIZE)
+    parser.add_argument("--register", action="store_true", help="Profile aussi l'enregistrement (store temporaire).")
+    parser.add_argument("--no-memory", action="store_true", help="Sans tracemalloc (temps moins perturbés).")
+    parser.add_argument("--no-cprofile", action="store_true", help="Sans cProfile (temps moins perturbés).")
+    parser.add_argument("--baseline", type=Path, default=None, help="Profil de référence (JSON) à ne pas dépasser.")
+    parser.add_argument("--tolerance", type=float, default=PROFILE_TOLERANCE)
+    parser.add_argument("--min-seconds", type=float, default=PROFILE_MIN_SECONDS)
+    parser.add_argument("--label", default=None)
+    arguments = parser.parse_args()
+    arguments.label = arguments.label or f"pipeline_x{arguments.scale}"
+    main(arguments)
+
+# ============================================================
+# 🎉 Exemples :
+#     ➔ python benchmarks/profile_pipeline.py --scale 10 --register
+#     ➔ python benchmarks/profile_pipeline.py --scale 10 --no-memory --no-cprofile \
+#         --label ci --baseline logs/profile_reference.json
+#     ➔ snakeviz logs/profile_pipeline_x10.prof  (ou flameprof → flamegraph SVG)
+# ============================================================
@@ -0,0 +1,30 @@
+# ============================================================
+# 📦 Découpage des lots pour les runners (src/batching.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Envoyer une matrice de taille quelconque à un
+#     runner dont le micro-batching limite la taille d'un appel.
+# 📌 **Rôle :** BentoML refuse toute entrée plus grande que
+#     `max_batch_size` : on découpe donc en tranches de cette
+#     taille, exécutées en parallèle puis recollées dans l'ordre.
+# ============================================================
+
+import asyncio  # Exécution concurrente des tranches
+import numpy as np  # Manipulation numérique efficace
+
+
+# ============================================================
+# 🏃 Prédiction d'une matrice par tranches concurrentes
+# ============================================================
+async def predict_in_chunks(runner_method, matrix, max_batch_size):
+    """
+    📄 **Description :**
+    - Découpe `matrix` en tranches de `max_batch_size` lignes (vues numpy, sans copie).
+    - Lance toutes les tranches en parallèle sur `runner_method.async_run`.
+    - Retourne les prédictions concaténées dans l'ordre des lignes.
+    """
+    if matrix.shape[0] <= max_batch_size:
+        return np.asarray(await runner_method.async_run(matrix))
+
+    chunks = [matrix[start:start + max_batch_size] for start in range(0, matrix.shape[0], max_batch_size)]
+    results = await asyncio.gather(*(runner_method.async_run(chunk) for chunk in chunks))
+    return np.concatenate([np.asarray(result) for result in results])
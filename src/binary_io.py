@@ -0,0 +1,95 @@
+# ============================================================
+# 🧱 Formats binaires colonnaires pour les prédictions (src/binary_io.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Éviter le parsing JSON → list[float] → numpy
+#     pour les clients qui envoient de gros volumes de lignes.
+# 📌 **Formats acceptés (détectés par leurs premiers octets) :**
+#     - 🔢 **NDF8** : en-tête de 16 octets + float64 little-endian
+#       en ordre C (lignes contiguës). Lecture sans copie via
+#       `np.frombuffer`.
+#     - 🏹 **Arrow IPC** (stream ou file) : colonnes nommées comme
+#       les features du modèle (pyarrow requis, import à la demande).
+#
+# 📐 **En-tête NDF8 (little-endian) :**
+#     | octets | contenu                          |
+#     |--------|----------------------------------|
+#     | 0-3    | magic `b"NDF8"`                  |
+#     | 4-7    | uint32 : nombre de lignes        |
+#     | 8-11   | uint32 : nombre de colonnes      |
+#     | 12-15  | uint32 : réservé (0)             |
+# ============================================================
+
+import struct  # Lecture/écriture de l'en-tête binaire
+import numpy as np  # Manipulation numérique efficace
+
+NDF8_MAGIC = b"NDF8"
+NDF8_HEADER = struct.Struct("<4sIII")
+ARROW_FILE_MAGIC = b"ARROW1"
+ARROW_STREAM_CONTINUATION = b"\xff\xff\xff\xff"
+
+
+# ============================================================
+# 📤 Encodage côté client : matrice numpy → charge utile NDF8
+# ============================================================
+def encode_feature_matrix(matrix):
+    """📤 Sérialise une matrice `(n, k)` au format NDF8 (en-tête + float64 LE)."""
+    matrix = np.ascontiguousarray(matrix, dtype="<f8")
+    if matrix.ndim != 2:
+        raise ValueError(f"❌ Matrice 2D attendue, {matrix.ndim} dimension(s) reçue(s).")
+    return NDF8_HEADER.pack(NDF8_MAGIC, matrix.shape[0], matrix.shape[1], 0) + matrix.tobytes()
+
+
+# ============================================================
+# 📥 Décodage côté service : charge utile → matrice du runner
+# ============================================================
+def decode_feature_matrix(payload, features):
+    """
+    📄 **Description :**
+    - Détecte le format (NDF8 ou Arrow IPC) à partir des premiers octets.
+    - Retourne une matrice float64 `(n, len(features))` prête pour le runner.
+    - Les contrôles de dimension portent sur la forme du buffer, jamais par valeur.
+
+    ⚠️ Lève `ValueError` si le format est inconnu ou la forme incorrecte.
+    """
+    if payload[:4] == NDF8_MAGIC:
+        return _decode_ndf8(payload, features)
+    if payload[:6] == ARROW_FILE_MAGIC or payload[:4] == ARROW_STREAM_CONTINUATION:
+        return _decode_arrow(payload, features)
+    raise ValueError("❌ Format binaire inconnu : en-tête NDF8 ou Arrow IPC attendu.")
+
+
+def _decode_ndf8(payload, features):
+    """🔢 Vue float64 directe sur le buffer reçu (aucune copie des valeurs)."""
+    if len(payload) < NDF8_HEADER.size:
+        raise ValueError("❌ En-tête NDF8 tronqué.")
+    _, n_rows, n_cols, _ = NDF8_HEADER.unpack_from(payload)
+    if n_cols != len(features):
+        raise ValueError(f"❌ {len(features)} colonnes attendues, {n_cols} reçues.")
+    if n_rows == 0:
+        raise ValueError("❌ Lot vide : au moins une ligne attendue.")
+    expected = NDF8_HEADER.size + n_rows * n_cols * 8
+    if len(payload) != expected:
+        raise ValueError(f"❌ Taille incohérente : {expected} octets attendus, {len(payload)} reçus.")
+    return np.frombuffer(payload, dtype="<f8", offset=NDF8_HEADER.size).reshape(n_rows, n_cols)
+
+
+def _decode_arrow(payload, features):
+    """🏹 Lecture Arrow IPC ; les colonnes sont sélectionnées par nom de feature."""
+    try:
+        import pyarrow as pa  # Dépendance optionnelle, chargée uniquement pour ce format
+    except ImportError:
+        raise ValueError("❌ Format Arrow reçu mais pyarrow n'est pas installé sur le service.")
+
+    reader = pa.ipc.open_file if payload[:6] == ARROW_FILE_MAGIC else pa.ipc.open_stream
+    table = reader(pa.py_buffer(payload)).read_all()
+    missing = [f for f in features if f not in table.column_names]
+    if missing:
+        raise ValueError(f"❌ Colonnes Arrow manquantes : {missing}")
+    if table.num_rows == 0:
+        raise ValueError("❌ Lot vide : au moins une ligne attendue.")
+
+    # 🧮 Une seule copie : colonnes Arrow → matrice contiguë consommée par le runner
+    matrix = np.empty((table.num_rows, len(features)), dtype=np.float64)
+    for position, feature in enumerate(features):
+        matrix[:, position] = table.column(feature).to_numpy()
+    return matrix
@@ -0,0 +1,42 @@
+# ============================================================
+# 🏢 Discrétisation vectorisée (src/binning.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Transformer directement une colonne numérique
+#     en codes entiers de catégorie, sans passer par des chaînes
+#     ni par un `OrdinalEncoder`.
+# 📌 **Rôle :** Partagé par le prétraitement (`src/preprocessing.py`)
+#     et la transformation côté service (`src/feature_transform.py`)
+#     pour que les deux utilisent exactement les mêmes bornes.
+# ============================================================
+
+import numpy as np  # Recherche dichotomique vectorisée
+
+# 🏢 Bornes des catégories : valeur ≤ borne → catégorie inférieure
+FLOORS_EDGES = np.array([4, 8], dtype=np.float64)
+YEAR_BUILT_EDGES = np.array([1960, 1976, 1980, 1994], dtype=np.float64)
+
+# 🏷️ Libellés historiques (code 1 = premier libellé)
+FLOORS_CATEGORIES = ["0-4 étages", "5-8 étages", "8+ étages"]
+YEAR_BUILT_CATEGORIES = ["1900-1960", "1961-1976", "1977-1980", "1981-1994", "1995-2015"]
+
+# 📋 Feature produite → (colonne source, bornes)
+BINNINGS = {
+    "floors_cat": ("num_floors", FLOORS_EDGES),
+    "year_built_cat": ("year_built", YEAR_BUILT_EDGES),
+}
+
+
+def bin_codes(values, edges):
+    """
+    📄 **Description :**
+    - Retourne le code (1..len(edges)+1) de chaque valeur, bornes incluses à gauche.
+    - Une seule recherche dichotomique numpy pour tout le tableau.
+    - Une valeur manquante (NaN) tombe dans la dernière catégorie,
+      comme l'ancienne cascade de `if` par ligne.
+    """
+    return np.searchsorted(edges, np.asarray(values, dtype=np.float64), side="left") + 1
+
+
+def add_bins(columns):
+    """🏢 Calcule toutes les features de `BINNINGS` à partir d'un dict/DataFrame de colonnes."""
+    return {feature: bin_codes(columns[source], edges) for feature, (source, edges) in BINNINGS.items()}
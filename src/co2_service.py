@@ -14,33 +14,78 @@
 
 # 📦 **Imports nécessaires et leur rôle**
 import bentoml  # Framework pour le déploiement rapide de modèles ML
-from bentoml.io import JSON  # Gestion des entrées/sorties au format JSON
+from bentoml.io import JSON, File  # Entrées/sorties JSON et binaires
+from typing import Optional  # Valeurs manquantes dans les colonnes brutes
 from pydantic import BaseModel, Field, validator  # Validation robuste des données
 import numpy as np  # Manipulation numérique efficace
 from loguru import logger  # Gestion avancée et lisible des logs
-from src.config import CO2_SERVICE_PORT  # Port d'écoute configuré
+from src.validation import to_column_arrays  # Conversion des colonnes brutes
+from src.prediction_cache import PredictionCache, predict_with_cache  # Cache LRU/TTL des prédictions
+from src.binary_io import decode_feature_matrix  # Entrées binaires NDF8 / Arrow
+from src.runners import make_runner, make_variant_runners  # Backend d'inférence choisi par configuration
+from src.observability import timed, sample_request_log, configure_service_logging  # Métriques et logs échantillonnés
+from src.grpc_service import GrpcTarget, mount_prediction_servicer  # Interface gRPC (mêmes runners)
+from src.batching import predict_in_chunks  # Appels `predict_bulk` par tranches
+from src.what_if import WhatIfPlan  # Scénarios « what-if » développés en une matrice
+from src.hot_swap import ModelSlot, FULL_MODEL, select_slot, variant_of  # Modèle servi (à chaud) et variantes
+from src.config import (  # Port, micro-batching et cache
+    CO2_SERVICE_PORT, RUNNER_MAX_BATCH_SIZE, RUNNER_MAX_LATENCY_MS, INFERENCE_BACKEND,
+    PREDICTION_CACHE_MAX_BYTES, PREDICTION_CACHE_TTL_SECONDS, HOT_SWAP_POLL_SECONDS, WHAT_IF_CHUNK_ROWS,
+    EXPLAIN_CACHE_MAX_BYTES,
+)
+
+configure_service_logging()  # 📝 Sink loguru asynchrone (hors du chemin critique)
 
 # 🔗 **Chargement du modèle CO₂ depuis BentoML**
 logger.info(f"🔄 Chargement du modèle CO₂ sur le port {CO2_SERVICE_PORT}...")
 model_co2_ref = bentoml.sklearn.get("ghg_emissions_model:latest")  # Dernier modèle CO₂ enregistré
 features_co2 = model_co2_ref.custom_objects.get("features", [])  # Features utilisées lors de l'entraînement
 logger.info(f"📋 Features CO₂ : {features_co2}")
-co2_runner = model_co2_ref.to_runner()  # Création du runner pour exécution asynchrone
-logger.info("🌿 Runner CO₂ configuré.")
+# 📦 Runner avec micro-batching adaptatif : les requêtes concurrentes sont regroupées
+#    en une seule matrice (signature `predict` déclarée batchable à l'enregistrement)
+#    Backend (`INFERENCE_BACKEND`) : "sklearn" ou tables de nœuds compilées "flat_trees"
+co2_runner = make_runner(model_co2_ref)
+logger.info(f"🌿 Runner CO₂ configuré (backend : {INFERENCE_BACKEND}, lot max : {RUNNER_MAX_BATCH_SIZE}, latence max : {RUNNER_MAX_LATENCY_MS} ms).")
+# ♻️ Version servie : validateur, transformation brute et runner liés au tag ; remplacée à chaud
+#    (store surveillé toutes les HOT_SWAP_POLL_SECONDS ou `/reload_co2_model`, voir src/hot_swap.py)
+co2_slot = ModelSlot(model_co2_ref.tag.name, co2_runner.predict, model_co2_ref,
+                     bulk_method=co2_runner.predict_bulk, explain_method=co2_runner.explain)
+logger.info(f"♻️ Remplacement à chaud CO₂ : store vérifié toutes les {HOT_SWAP_POLL_SECONDS} s (0 : admin seulement).")
+# 🪶 Variantes allégées enregistrées (src/variants.py) : un runner et un emplacement chacune,
+#    choisies par requête avec `"variant": "float32" | "first_n" | "distilled"` (défaut : modèle complet)
+co2_variant_runners = make_variant_runners(model_co2_ref.tag.name)
+co2_slots = {FULL_MODEL: co2_slot, **{
+    variant: ModelSlot(ref.tag.name, runner.predict, ref, bulk_method=runner.predict_bulk,
+                       explain_method=runner.explain)
+    for variant, (runner, ref) in co2_variant_runners.items()}}
+co2_cache = PredictionCache(PREDICTION_CACHE_MAX_BYTES, PREDICTION_CACHE_TTL_SECONDS)  # 🗃️ Clés liées au tag servi
+logger.info(f"🗃️ Cache CO₂ : {co2_cache.max_entries} entrées max, TTL {PREDICTION_CACHE_TTL_SECONDS} s.")
+# 🔍 Cache des attributions (`/explain_co2`) : un vecteur de k + 1 valeurs par ligne
+co2_explain_cache = PredictionCache(EXPLAIN_CACHE_MAX_BYTES, PREDICTION_CACHE_TTL_SECONDS, width=len(features_co2) + 1)
 logger.info(f"🚀 ✅ Service CO₂ disponible sur http://127.0.0.1:{CO2_SERVICE_PORT}")
 
 # 🌐 **Définition du service BentoML (port explicitement configuré)**
 co2_prediction_service = bentoml.Service(
     name="co2_prediction_service",
-    runners=[co2_runner]
+    runners=[co2_runner, *(runner for runner, _ in co2_variant_runners.values())]
 )
 
 # 📜 **Validation des données entrantes pour le CO₂**
-class CO2InputData(BaseModel):
+#    Le corps JSON est converti directement en float64 puis contrôlé en une passe numpy :
+#    forme, valeurs finies et plages observées à l'entraînement (voir `src/validation.py`).
+#    Validateur propre à la version servie : `co2_slot.acquire().validator`.
+
+# ✨ **Endpoint principal pour la prédiction des émissions de CO₂**
+@co2_prediction_service.api(input=JSON(), output=JSON())
+async def predict_co2(data):
     """
-    📄 **Description :**
-    - Reçoit une liste de valeurs numériques correspondant aux features du modèle CO₂.
-    - Valide la longueur de la liste pour correspondre aux features attendues.
+    🌿 **Endpoint :** `/predict_co2`
+    - 🛡️ Convertit `features` en float64 et rejette NaN / inf / valeurs hors plage
+      avec des erreurs indexées (ligne, feature).
+    - 🗃️ Sert la prédiction depuis le cache si la ligne est déjà connue.
+    - 🏃 Sinon exécute la prédiction via le runner.
+    - 🌟 Retourne la prédiction sous forme JSON, avec le tag du modèle ayant répondu.
+    - 🪶 `"variant"` (optionnel) : variante allégée servie à la place du modèle complet.
 
     💡 **Exemple JSON attendu :**
     ```json
@@ -59,52 +104,331 @@ class CO2InputData(BaseModel):
     8. `property_use_list_office` : Indicateur pour usage de type bureau.
     9. `building_density` : Densité du bâtiment (surface/volume).
     10. `property_type_office` : Indicateur pour propriété de type bureau.
+    📝 **Réponse JSON exemple :**
+    ```json
+    {
+        "ghg_emissions_total": 250.75,
+        "model_tag": "ghg_emissions_model:4ffx2ybq5ogkcqhq"
+    }
+    ```
     """
-    features: list[float] = Field(..., description=f"{len(features_co2)} valeurs attendues.")
+    try:
+        version = select_slot(co2_slots, variant_of(data)).acquire()  # ♻️ Une version pour toute la requête
+        with timed("predict_co2", "validation"):
+            input_features = version.validator.validate_row(data)
+        with timed("predict_co2", "drift_stats"):
+            version.observe(input_features)  # 📡 Statistiques des entrées servies
+        co2_pred = await predict_with_cache(co2_cache, version.runner_method, input_features, version.tag,
+                                            RUNNER_MAX_BATCH_SIZE, endpoint="predict_co2")
+        if sample_request_log():
+            logger.info(f"🌿 Résultat CO₂ : {co2_pred[0]:.2f} tonnes.")
+        with timed("predict_co2", "serialization"):
+            return {"ghg_emissions_total": float(co2_pred[0]), "model_tag": str(version.tag)}
+    except Exception as e:
+        logger.error(f"❌ Erreur CO₂ : {str(e)}")
+        return {"error": str(e)}
 
-    @validator('features')
-    def check_length(cls, v):
-        if len(v) != len(features_co2):
-            raise ValueError(f"❌ {len(features_co2)} attendues, {len(v)} reçues.")
-        return v
+# 📦 **Endpoint de prédiction CO₂ par lot**
+@co2_prediction_service.api(input=JSON(), output=JSON())
+async def predict_co2_batch(data):
+    """
+    🌿 **Endpoint :** `/predict_co2_batch`
+    - 🧮 Convertit la matrice en float64 et la valide en une passe (forme, finitude, plages).
+    - 🏃 Envoie au runner les seules lignes absentes du cache, par tranches de `RUNNER_MAX_BATCH_SIZE`.
+    - 🌟 Retourne les prédictions sous forme de tableau colonne.
+    - 🪶 `"variant"` (optionnel) : variante allégée servie à la place du modèle complet.
 
-# ✨ **Endpoint principal pour la prédiction des émissions de CO₂**
-@co2_prediction_service.api(input=JSON(pydantic_model=CO2InputData), output=JSON())
-async def predict_co2(data: CO2InputData):
+    💡 **Exemple JSON attendu :**
+    ```json
+    {
+        "features": [
+            [120000.0, 0.6, 0.4, 3, 2010, 1, 75.0, 0, 150.0, 1],
+            [85000.0, 0.8, 0.2, 1, 1975, 0, 52.0, 1, 110.0, 0]
+        ]
+    }
+    ```
+    📝 **Réponse JSON exemple :**
+    ```json
+    {
+        "ghg_emissions_total": [250.75, 180.10],
+        "count": 2,
+        "model_tag": "ghg_emissions_model:4ffx2ybq5ogkcqhq"
+    }
+    ```
     """
-    🌿 **Endpoint :** `/predict_co2`
-    - 🔄 Transforme les données entrantes en tableau numpy.
-    - 🏃 Exécute la prédiction via le runner.
-    - 🌟 Retourne la prédiction sous forme JSON.
+    try:
+        version = select_slot(co2_slots, variant_of(data)).acquire()  # ♻️ Une version pour toute la requête
+        with timed("predict_co2_batch", "validation"):
+            matrix = version.validator.validate_rows(data)
+        with timed("predict_co2_batch", "drift_stats"):
+            version.observe(matrix)
+        co2_pred = await predict_with_cache(co2_cache, version.runner_method, matrix, version.tag,
+                                            RUNNER_MAX_BATCH_SIZE, endpoint="predict_co2_batch")
+        if sample_request_log():
+            logger.info(f"🌿 Lot CO₂ terminé : {len(co2_pred)} prédictions.")
+        with timed("predict_co2_batch", "serialization"):
+            return {"ghg_emissions_total": co2_pred.astype(float).tolist(), "count": int(len(co2_pred)),
+                    "model_tag": str(version.tag)}
+    except Exception as e:
+        logger.error(f"❌ Erreur CO₂ (lot) : {str(e)}")
+        return {"error": str(e)}
+
+# 🧱 **Endpoint de prédiction par lot au format binaire (NDF8 / Arrow IPC)**
+@co2_prediction_service.api(input=File(), output=JSON())
+async def predict_co2_binary(data, ctx: bentoml.Context):
+    """
+    🌿 **Endpoint :** `/predict_co2_binary`
+    - 🧱 Reçoit le corps brut : NDF8 (float64 LE + en-tête) ou Arrow IPC.
+    - 🔢 Mappe le buffer en matrice numpy sans parsing JSON (voir `src/binary_io.py`).
+    - 🏃 Envoie au runner les seules lignes absentes du cache, par tranches de `RUNNER_MAX_BATCH_SIZE`.
+
+    💡 **Exemple client :**
+    ```python
+    from src.binary_io import encode_feature_matrix
+    requests.post(url, data=encode_feature_matrix(matrix),
+                  headers={"Content-Type": "application/octet-stream"})
+    ```
+    - 🪶 Variante allégée : paramètre d'URL `?variant=distilled` (défaut : modèle complet).
+    """
+    try:
+        variant = ctx.request.query_params.get("variant")  # 🪶 `?variant=...` (corps binaire)
+        version = select_slot(co2_slots, variant).acquire()  # ♻️ Une version pour toute la requête
+        with timed("predict_co2_binary", "validation"):
+            matrix = version.validator.check(decode_feature_matrix(data.read(), version.features))
+        with timed("predict_co2_binary", "drift_stats"):
+            version.observe(matrix)
+        co2_pred = await predict_with_cache(co2_cache, version.runner_method, matrix, version.tag,
+                                            RUNNER_MAX_BATCH_SIZE, endpoint="predict_co2_binary")
+        if sample_request_log():
+            logger.info(f"🔍 Prédiction CO₂ binaire : {matrix.shape[0]} bâtiments.")
+        with timed("predict_co2_binary", "serialization"):
+            return {"ghg_emissions_total": co2_pred.astype(float).tolist(), "count": int(len(co2_pred)),
+                    "model_tag": str(version.tag)}
+    except Exception as e:
+        logger.error(f"❌ Erreur CO₂ (binaire) : {str(e)}")
+        return {"error": str(e)}
+
+# 📜 **Validation des attributs bruts (format colonnaire) pour le CO₂**
+class CO2RawInputData(BaseModel):
+    """
+    📄 **Description :**
+    - Reçoit les attributs bruts des bâtiments, une liste par colonne.
+    - `null` est accepté : la valeur est imputée comme lors du prétraitement.
+    - Colonnes attendues : voir `required_columns(features_co2)` (`src/feature_transform.py`).
 
     💡 **Exemple JSON attendu :**
     ```json
     {
-        "features": [120000.0, 0.6, 0.4, 3, 2010, 1, 75.0, 0, 150.0, 1]
+        "columns": {
+            "site_energy_use": [7226362.5, null],
+            "electricity_kbtu": [3946027.0, 1811213.0],
+            "natural_gas_kbtu": [1276453.0, 0.0],
+            "site_eui": [81.7, 94.8],
+            "gfa_total": [88434, 103566],
+            "num_floors": [12, 11],
+            "year_built": [1927, 1996],
+            "property_type_office": [0, 1]
+        }
+    }
+    ```
+    """
+    columns: dict[str, list[Optional[float]]] = Field(..., description="Attributs bruts : une liste de valeurs par colonne.")
+    variant: Optional[str] = Field(None, description="Variante allégée (défaut : modèle complet).")
+
+    @validator('columns')
+    def check_columns(cls, v):
+        with timed("predict_co2_raw", "validation"):
+            return to_column_arrays(v)
+
+# 🏗️ **Endpoint de prédiction à partir des attributs bruts**
+@co2_prediction_service.api(input=JSON(pydantic_model=CO2RawInputData), output=JSON())
+async def predict_co2_raw(data: CO2RawInputData):
+    """
+    🌿 **Endpoint :** `/predict_co2_raw`
+    - 🏗️ Calcule les features (imputation, bornes IQR, ratios, catégories,
+      standardisation) en numpy, sur tout le lot, avec les paramètres du modèle.
+    - 🛡️ Matrice contrôlée comme `/predict_co2_batch` (finitude + plages) avant dérive et prédiction.
+    - 🏃 Prédit comme `/predict_co2_batch` (cache + runner).
+    """
+    try:
+        version = select_slot(co2_slots, data.variant).acquire()  # ♻️ Une version pour toute la requête
+        if version.transform is None:
+            raise ValueError("❌ Modèle enregistré sans paramètres de l'espace des features (fit_model_features).")
+        with timed("predict_co2_raw", "array_conversion"):
+            matrix = version.transform.to_matrix(data.columns, version.features)
+        with timed("predict_co2_raw", "validation"):
+            version.validator.check(matrix)  # 🛡️ Indicateurs repris de l'entrée : `null` → NaN refusé
+        with timed("predict_co2_raw", "drift_stats"):
+            version.observe(matrix)
+        co2_pred = await predict_with_cache(co2_cache, version.runner_method, matrix, version.tag,
+                                            RUNNER_MAX_BATCH_SIZE, endpoint="predict_co2_raw")
+        if sample_request_log():
+            logger.info(f"🔍 Prédiction CO₂ (attributs bruts) : {matrix.shape[0]} bâtiments.")
+        with timed("predict_co2_raw", "serialization"):
+            return {"ghg_emissions_total": co2_pred.astype(float).tolist(), "count": int(len(co2_pred)),
+                    "model_tag": str(version.tag)}
+    except Exception as e:
+        logger.error(f"❌ Erreur CO₂ (attributs bruts) : {str(e)}")
+        return {"error": str(e)}
+
+# 🔀 **Analyse « what-if » : scénarios de changements sur un lot de bâtiments**
+@co2_prediction_service.api(input=JSON(), output=JSON())
+async def what_if_co2(data):
+    """
+    🌿 **Endpoint :** `/what_if_co2`
+    - 🧮 Valide la matrice de base comme `/predict_co2_batch`.
+    - 🔀 Développe en mémoire la base et tous les scénarios (changements par feature
+      et/ou grille de valeurs) en une seule matrice, elle aussi validée.
+    - 🏃 Prédit en quelques appels `predict_bulk` (hors cache et hors micro-batching)
+      et retourne les écarts de `ghg_emissions_total` de chaque scénario à la base.
+    - 📉 `"details": false` : seulement les résumés par scénario (moyenne, min, max).
+    - 🪶 `"variant"` (optionnel) : variante allégée servie à la place du modèle complet.
+
+    💡 **Exemple JSON attendu :**
+    ```json
+    {
+        "features": [[...], [...]],
+        "scenarios": [{"name": "gaz -0.1", "changes": {"gas_ratio": -0.1}},
+                      {"changes": {"electricity_ratio": {"scale": 1.1}}}],
+        "grid": {"gas_ratio": [0.0, 0.25, 0.5]}
     }
     ```
     📝 **Réponse JSON exemple :**
     ```json
     {
-        "ghg_emissions_total": 250.75
+        "count": 2, "n_scenarios": 5, "rows_evaluated": 12, "baseline_mean": 250.75,
+        "baseline": [...],
+        "scenarios": [{"name": "gaz -0.1", "mean_delta": -3.2, "min_delta": -5.1, "max_delta": -1.3,
+                       "mean_prediction": ..., "deltas": [-5.1, -1.3]}, ...],
+        "model_tag": "ghg_emissions_model:3yq2nbq5ngkcqhqa"
     }
     ```
     """
     try:
-        logger.info("🔍 Prédiction CO₂ en cours...")
-        input_features = np.array(data.features).reshape(1, -1)
-        co2_pred = await co2_runner.predict.async_run(input_features)
-        logger.info(f"🌿 Résultat CO₂ : {co2_pred[0]:.2f} tonnes.")
-        return {"ghg_emissions_total": float(co2_pred[0])}
+        version = select_slot(co2_slots, variant_of(data)).acquire()  # ♻️ Une version pour toute la requête
+        with timed("what_if_co2", "validation"):
+            base = version.validator.validate_rows(data)
+            plan = WhatIfPlan.from_spec(data, version.features, n_rows=len(base))
+            matrix = plan.matrix(base, version.validator)
+        predictions = await predict_in_chunks(version.bulk_method, matrix, WHAT_IF_CHUNK_ROWS)
+        if sample_request_log():
+            logger.info(f"🔀 What-if CO₂ : {len(base)} bâtiments × {plan.n_scenarios} scénarios.")
+        with timed("what_if_co2", "serialization"):
+            return {**plan.summarize(predictions, len(base), details=data.get("details", True)),
+                    "model_tag": str(version.tag)}
     except Exception as e:
-        logger.error(f"❌ Erreur CO₂ : {str(e)}")
+        logger.error(f"❌ Erreur CO₂ (what-if) : {str(e)}")
+        return {"error": str(e)}
+
+# 🔍 **Attributions par feature (explications) des prédictions**
+@co2_prediction_service.api(input=JSON(), output=JSON())
+async def explain_co2(data):
+    """
+    🌿 **Endpoint :** `/explain_co2`
+    - 🧮 Valide la matrice comme `/predict_co2_batch` (une ligne ou plusieurs).
+    - 🔍 Attributions par algorithme d'arbres (TreeSHAP LightGBM / XGBoost, voir
+      `src/explain.py`), calculées par le runner en lots micro-batchés.
+    - 🗃️ Lignes déjà expliquées servies depuis un cache dédié (clé : tag + ligne).
+    - 🌟 Retourne, par ligne, la prédiction, la valeur de base et une contribution
+      par feature (leur somme redonne la prédiction).
+    - 🪶 `"variant"` (optionnel) : variante allégée servie à la place du modèle complet.
+
+    📝 **Réponse JSON exemple :**
+    ```json
+    {
+        "ghg_emissions_total": [0.27],
+        "base_value": [0.01],
+        "contributions": [{"site_eui": 0.42, "gas_ratio": -0.05, ...}],
+        "count": 1,
+        "model_tag": "ghg_emissions_model:3yq2nbq5ngkcqhqa"
+    }
+    ```
+    """
+    try:
+        version = select_slot(co2_slots, variant_of(data)).acquire()  # ♻️ Une version pour toute la requête
+        if version.explain_method is None:
+            raise ValueError(f"❌ Explications non disponibles pour {version.tag}.")
+        with timed("explain_co2", "validation"):
+            single = isinstance(data, dict) and isinstance(data.get("features"), list) \
+                and bool(data["features"]) and not isinstance(data["features"][0], list)
+            matrix = version.validator.validate_row(data) if single else version.validator.validate_rows(data)
+        attributions = await predict_with_cache(co2_explain_cache, version.explain_method, matrix, version.tag,
+                                                RUNNER_MAX_BATCH_SIZE, endpoint="explain_co2",
+                                                width=len(version.features) + 1)
+        if sample_request_log():
+            logger.info(f"🔍 Explications CO₂ : {matrix.shape[0]} bâtiments.")
+        with timed("explain_co2", "serialization"):
+            return {"ghg_emissions_total": attributions.sum(axis=1).tolist(), "base_value": attributions[:, -1].tolist(),
+                    "contributions": [dict(zip(version.features, row)) for row in attributions[:, :-1].tolist()],
+                    "count": int(len(attributions)), "model_tag": str(version.tag)}
+    except Exception as e:
+        logger.error(f"❌ Erreur CO₂ (explications) : {str(e)}")
         return {"error": str(e)}
 
+# 📊 **Compteurs du cache de prédictions**
+@co2_prediction_service.api(input=JSON(), output=JSON())
+async def co2_cache_stats(_):
+    """
+    📊 **Endpoint :** `/co2_cache_stats`
+    - Retourne hits, misses, taux de hit et occupation du cache de ce worker,
+      ainsi que la version servie (modèle complet et variantes) et le nombre de remplacements à chaud ;
+      `"explain"` : mêmes compteurs pour le cache des attributions.
+    - Le corps de la requête est ignoré (`{}`).
+    """
+    variants = {name: slot.status() for name, slot in co2_slots.items() if name != FULL_MODEL}
+    return {**co2_slot.status(), "variants": variants, **co2_cache.stats(), "explain": co2_explain_cache.stats()}
+
+# 📡 **Dérive des entrées servies par rapport à l'entraînement**
+@co2_prediction_service.api(input=JSON(), output=JSON())
+async def drift_co2(_):
+    """
+    📡 **Endpoint :** `/drift_co2`
+    - Compare les entrées servies par ce worker (depuis le chargement de la version)
+      aux statistiques d'entraînement enregistrées avec le modèle (src/drift.py).
+    - Par feature : PSI des histogrammes, écart de moyenne (en écarts-types de
+      référence), rapport des écarts-types et statut (stable / warning / drift).
+    - Modèle complet puis variantes (`"variants"`). PSI aussi exposés sur `/metrics`
+      (jauge `feature_drift_psi`).
+    - Le corps de la requête est ignoré (`{}`).
+    """
+    variants = {name: slot.current.drift_report() for name, slot in co2_slots.items() if name != FULL_MODEL}
+    return {**co2_slot.current.drift_report(), "variants": variants}
+
+# ♻️ **Remplacement à chaud du modèle (admin)**
+@co2_prediction_service.api(input=JSON(), output=JSON())
+async def reload_co2_model(data):
+    """
+    ♻️ **Endpoint :** `/reload_co2_model`
+    - Charge la version demandée (`{"tag": "<nom>:<version>"}`, défaut : `:latest`)
+      du modèle complet ou de la variante `"variant"`,
+      la chauffe sur le runner puis la sert sans redémarrage ; les requêtes en cours
+      terminent avec l'ancienne version.
+    - En cas d'échec, la version servie est conservée et l'erreur est retournée.
+    ⚠️ Endpoint d'administration : à ne pas exposer publiquement.
+    """
+    slot = co2_slot
+    try:
+        slot = select_slot(co2_slots, variant_of(data))
+        return await slot.reload((data or {}).get("tag"))
+    except Exception as e:
+        return {"error": str(e), **slot.status()}
+
+# 📡 **Interface gRPC (`Predict` / `PredictStream`, target "co2")**
+#    Même runner, même cache, même version servie que les endpoints JSON.
+co2_grpc_target = GrpcTarget(co2_slots, co2_cache)
+mount_prediction_servicer(co2_prediction_service, {"co2": co2_grpc_target})
+
 # ============================================================
 # 🏃 **Commandes d'exécution locale (port explicitement défini)**
 # ------------------------------------------------------------
 # 🌿 CO₂ :
 #    ➔ bentoml serve src.co2_service:co2_prediction_service --reload --port 3001
+#    ➔ gRPC : bentoml serve-grpc src.co2_service:co2_prediction_service --port 50052
+#    ➔ Endpoints : /predict_co2 (une ligne), /predict_co2_batch (matrice JSON)
+#                  /predict_co2_binary (NDF8 / Arrow IPC), /predict_co2_raw (attributs bruts)
+#                  /what_if_co2 (scénarios de changements sur un lot), /explain_co2 (attributions)
+#                  /drift_co2 (dérive des entrées servies)
+#                  /co2_cache_stats et /reload_co2_model (admin, remplacement à chaud)
 # 🌐 Swagger UI :
 #    ➔ CO₂ : http://127.0.0.1:3001
 # ============================================================
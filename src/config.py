@@ -16,6 +16,7 @@ RAW_DATA_PATH = DATA_DIR / "raw" / "2016_Building_Energy_Benchmarking.csv"
 PROCESSED_DIR = DATA_DIR / "processed"
 PROCESSED_ENERGY_PATH = PROCESSED_DIR / "dataset_processed_site_energy_use.csv"
 PROCESSED_CO2_PATH = PROCESSED_DIR / "dataset_processed_ghg_emissions_total.csv"
+CLEANED_DATA_PATH = PROCESSED_DIR / "dataset_cleaned.csv"  # Toutes les features des deux modèles + cibles
 
 # ============================================================
 # 📂 Chemins des modèles et features
@@ -27,6 +28,12 @@ ENERGY_FEATURES_PATH = MODELS_DIR / "site_energy_use_model" / "final_features_si
 CO2_MODEL_PATH = MODELS_DIR / "ghg_emissions_model" / "final_model_ghg_emissions_total.pkl"
 CO2_FEATURES_PATH = MODELS_DIR / "ghg_emissions_model" / "final_features_ghg_emissions_total.pkl"
 
+# 🔄 Paramètres ajustés du prétraitement (médianes, bornes, standardisation)
+PREPROCESSING_PARAMS_PATH = MODELS_DIR / "preprocessing" / "fitted_preprocessing.json"
+# 🎯 Espace des features des modèles servis (recette de dataset_cleaned.csv), embarqué avec les modèles
+MODEL_FEATURES_PARAMS_PATH = MODELS_DIR / "preprocessing" / "model_features.json"
+PREPROCESSING_CHUNKSIZE = int(os.getenv("PREPROCESSING_CHUNKSIZE", 100_000))
+
 # ============================================================
 # ⚡ Paramètres globaux et BentoML (2 ports pour services séparés)
 # ============================================================
@@ -37,6 +44,150 @@ BENTOML_SERVICE_NAME_CO2 = os.getenv("BENTOML_SERVICE_NAME_CO2", "co2_prediction
 # Ports confirmés pour cohérence avec service.py
 ENERGY_SERVICE_PORT = 3000  # ✅ Confirmé
 CO2_SERVICE_PORT = 3001     # ✅ Confirmé
+COMBINED_SERVICE_PORT = int(os.getenv("COMBINED_SERVICE_PORT", 3000))  # 🏢 Service combiné (src/service.py)
+
+# ============================================================
+# 📦 Micro-batching adaptatif des runners BentoML
+# ============================================================
+# - Les requêtes concurrentes d'une ligne sont regroupées en une seule
+#   matrice numpy avant l'appel à `predict`.
+# - RUNNER_MAX_BATCH_SIZE doit rester ≥ 2 (contrainte des histogrammes BentoML).
+# - Pour désactiver le regroupement (référence de benchmark) :
+#   BENTOML_CONFIG_OPTIONS="runners.batching.enabled=false"
+RUNNER_MAX_BATCH_SIZE = int(os.getenv("RUNNER_MAX_BATCH_SIZE", 256))
+RUNNER_MAX_LATENCY_MS = int(os.getenv("RUNNER_MAX_LATENCY_MS", 20))
+
+# ============================================================
+# 🌲 Backend d'inférence des runners
+# ============================================================
+# - "sklearn"    : modèle dépicklé, `predict` du wrapper (par défaut).
+# - "flat_trees" : tables de nœuds compilées à l'enregistrement
+#   (src/tree_compiler.py) ; ~5× plus rapide pour une ligne, plus lent
+#   que LightGBM au-delà de quelques centaines de lignes par lot.
+#   Repli automatique sur "sklearn" si le modèle n'a pas de tables.
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "sklearn")
+# - Tables "flat_trees" projetées en mémoire (mmap) : pages partagées entre workers.
+FLAT_TREES_MMAP = os.getenv("FLAT_TREES_MMAP", "1") == "1"
+
+# ============================================================
+# ⏱️ Budget de démarrage à froid (benchmarks/profile_cold_start.py)
+# ============================================================
+# - Import du service + initialisation des runners + première prédiction.
+STARTUP_BUDGET_S = float(os.getenv("STARTUP_BUDGET_S", 5.0))
+
+# ============================================================
+# 🔬 Profilage du prétraitement et de l'enregistrement (src/profiling.py)
+# ============================================================
+# - Opt-in : `--profile` des scripts ou `PIPELINE_PROFILE=1`.
+# - Pic mémoire par étape via `tracemalloc` (ralentit le code Python).
+PIPELINE_PROFILE = os.getenv("PIPELINE_PROFILE", "0") == "1"
+PROFILE_TRACE_MEMORY = os.getenv("PROFILE_TRACE_MEMORY", "1") == "1"
+PROFILE_TOP_FUNCTIONS = int(os.getenv("PROFILE_TOP_FUNCTIONS", 25))
+# - Régression (benchmarks/profile_pipeline.py --baseline) : étape plus lente de
+#   plus de `PROFILE_TOLERANCE` (relatif) et de plus de `PROFILE_MIN_SECONDS`.
+PROFILE_TOLERANCE = float(os.getenv("PROFILE_TOLERANCE", 0.25))
+PROFILE_MIN_SECONDS = float(os.getenv("PROFILE_MIN_SECONDS", 0.05))
+
+# ============================================================
+# 🛡️ Validation des requêtes (src/validation.py)
+# ============================================================
+# - Plages par feature = [min, max] du jeu d'entraînement (enregistrées avec
+#   le modèle), élargies de `FEATURE_RANGE_MARGIN` × étendue de chaque côté.
+# - Au plus `VALIDATION_MAX_ERRORS` erreurs détaillées par réponse.
+FEATURE_RANGE_MARGIN = float(os.getenv("FEATURE_RANGE_MARGIN", 0.1))
+VALIDATION_MAX_ERRORS = int(os.getenv("VALIDATION_MAX_ERRORS", 10))
+
+# ============================================================
+# 🗃️ Cache des prédictions (par worker API)
+# ============================================================
+# - Budget mémoire en octets ; 0 désactive le cache.
+# - Les clés incluent le tag du modèle : un nouveau `:latest` invalide tout.
+PREDICTION_CACHE_MAX_BYTES = int(os.getenv("PREDICTION_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+PREDICTION_CACHE_TTL_SECONDS = float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", 3600))
+# - Attributions `/explain_*` (src/explain.py) : cache séparé, un vecteur par ligne
+#   (même TTL) ; plus coûteuses à recalculer que les prédictions.
+EXPLAIN_CACHE_MAX_BYTES = int(os.getenv("EXPLAIN_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# ============================================================
+# 📡 Interface gRPC (src/grpc_service.py)
+# ============================================================
+# - Port de `bentoml serve-grpc` (le serveur HTTP/JSON garde 3000/3001).
+GRPC_PORT = int(os.getenv("GRPC_PORT", 50051))
+# - Messages d'un flux `PredictStream` en attente regroupés en un seul appel runner (au plus).
+GRPC_STREAM_WINDOW = int(os.getenv("GRPC_STREAM_WINDOW", 64))
+
+# ============================================================
+# ♻️ Remplacement à chaud des modèles (src/hot_swap.py)
+# ============================================================
+# - Vérification du store (`<modèle>:latest`) au plus toutes les N secondes,
+#   déclenchée par le trafic (0 : désactivée, seul `/reload_<cible>_model` bascule).
+HOT_SWAP_POLL_SECONDS = float(os.getenv("HOT_SWAP_POLL_SECONDS", 30))
+# - Runner : une version remplacée est libérée après N secondes sans requête.
+HOT_SWAP_DRAIN_SECONDS = float(os.getenv("HOT_SWAP_DRAIN_SECONDS", 60))
+
+# ============================================================
+# 🪶 Variantes allégées des modèles (src/variants.py)
+# ============================================================
+# - Construction : arbres conservés par "first_n", profondeur de l'arbre distillé,
+#   part des lignes réservée à la mesure RMSE / R², répétitions des mesures de latence.
+VARIANT_FIRST_N_TREES = int(os.getenv("VARIANT_FIRST_N_TREES", 25))
+VARIANT_DISTILLED_DEPTH = int(os.getenv("VARIANT_DISTILLED_DEPTH", 8))
+VARIANT_HOLDOUT = float(os.getenv("VARIANT_HOLDOUT", 0.2))
+VARIANT_LATENCY_REPEATS = int(os.getenv("VARIANT_LATENCY_REPEATS", 50))
+# - Services : variantes servies si enregistrées (un runner chacune ; vide : aucune).
+SERVED_VARIANTS = [v for v in os.getenv("SERVED_VARIANTS", "float32,first_n,distilled").split(",") if v]
+
+# ============================================================
+# 📡 Surveillance de la dérive des entrées (src/drift.py)
+# ============================================================
+# - Référence : bins de même effectif sur les données d'entraînement (enregistrement).
+# - Statut par feature selon le PSI : < WARNING stable, < ALERT warning, sinon drift ;
+#   "insufficient_data" tant que moins de DRIFT_MIN_COUNT lignes ont été servies.
+# - Jauges Prometheus `feature_drift_psi` rafraîchies au plus toutes les N secondes (0 : jamais).
+DRIFT_BINS = int(os.getenv("DRIFT_BINS", 10))
+DRIFT_MIN_COUNT = int(os.getenv("DRIFT_MIN_COUNT", 100))
+DRIFT_PSI_WARNING = float(os.getenv("DRIFT_PSI_WARNING", 0.1))
+DRIFT_PSI_ALERT = float(os.getenv("DRIFT_PSI_ALERT", 0.25))
+DRIFT_PUBLISH_SECONDS = float(os.getenv("DRIFT_PUBLISH_SECONDS", 15))
+
+# ============================================================
+# 🔀 Analyses « what-if » (src/what_if.py)
+# ============================================================
+# - Plafond de lignes d'une requête une fois développée (base + scénarios) :
+#   8 octets × k features par ligne (~90 Mo pour 1 M lignes × 11 features).
+# - Taille des appels `predict_bulk` au runner (hors micro-batching).
+WHAT_IF_MAX_ROWS = int(os.getenv("WHAT_IF_MAX_ROWS", 1_000_000))
+WHAT_IF_CHUNK_ROWS = int(os.getenv("WHAT_IF_CHUNK_ROWS", 65_536))
+
+# ============================================================
+# 📦 Scoring hors ligne (src/scoring.py)
+# ============================================================
+# - Taille des morceaux lus dans le fichier d'entrée (CSV / Parquet).
+SCORING_CHUNKSIZE = int(os.getenv("SCORING_CHUNKSIZE", 100_000))
+# - Mode parallèle : nombre de processus et threads OpenMP/BLAS par processus.
+#   Garder `workers × threads ≤ cœurs` pour ne pas sursouscrire le CPU.
+SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", 1))
+SCORING_THREADS_PER_WORKER = int(os.getenv("SCORING_THREADS_PER_WORKER", 1))
+
+# ============================================================
+# 🏋️ Recherche d'hyperparamètres et ré-entraînement (src/training.py)
+# ============================================================
+# - Validation croisée, jeu de test final, candidats tirés par famille de modèles.
+TRAINING_CV_FOLDS = int(os.getenv("TRAINING_CV_FOLDS", 5))
+TRAINING_TEST_SIZE = float(os.getenv("TRAINING_TEST_SIZE", 0.2))
+TRAINING_CANDIDATES = int(os.getenv("TRAINING_CANDIDATES", 27))
+# - Successive halving : à chaque palier, 1/facteur des candidats survit et
+#   dispose de facteur × plus de lignes d'entraînement.
+TRAINING_HALVING_FACTOR = int(os.getenv("TRAINING_HALVING_FACTOR", 3))
+# - Boosting : plafond d'arbres, arrêt anticipé sur le pli de validation.
+TRAINING_MAX_TREES = int(os.getenv("TRAINING_MAX_TREES", 2000))
+TRAINING_EARLY_STOPPING_ROUNDS = int(os.getenv("TRAINING_EARLY_STOPPING_ROUNDS", 50))
+# - Essais (candidat × pli) en parallèle, un thread par modèle.
+TRAINING_N_JOBS = int(os.getenv("TRAINING_N_JOBS", os.cpu_count() or 1))
+# - Ré-entraînement incrémental : arbres ajoutés sur les nouvelles lignes, part
+#   des nouvelles lignes réservée au contrôle « pas de régression » avant enregistrement.
+INCREMENTAL_EXTRA_TREES = int(os.getenv("INCREMENTAL_EXTRA_TREES", 50))
+INCREMENTAL_HOLDOUT = float(os.getenv("INCREMENTAL_HOLDOUT", 0.2))
 
 # ============================================================
 # 🌐 Configuration des logs
@@ -44,6 +195,12 @@ CO2_SERVICE_PORT = 3001     # ✅ Confirmé
 LOGS_DIR = BASE_DIR / "logs"
 LOGS_DIR.mkdir(exist_ok=True)
 LOG_FILE = LOGS_DIR / "project.log"
+# - Services : sink loguru asynchrone (file d'attente + thread d'écriture)
+#   et un log INFO par requête seulement toutes les `LOG_SAMPLE_EVERY` requêtes
+#   (1 = toutes). Les erreurs sont toujours journalisées.
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_ASYNC = os.getenv("LOG_ASYNC", "1") == "1"
+LOG_SAMPLE_EVERY = int(os.getenv("LOG_SAMPLE_EVERY", 100))
 
 # ============================================================
 # 📝 Informations complémentaires
@@ -55,4 +212,5 @@ LOG_FILE = LOGS_DIR / "project.log"
 # - Ports synchronisés avec service.py :
 #   ⚡ Service énergie : http://127.0.0.1:3000
 #   🌿 Service CO₂    : http://127.0.0.1:3001
+#   🏢 Service combiné (Énergie + CO₂, un seul processus) : http://127.0.0.1:3000
 # ============================================================
@@ -0,0 +1,196 @@
+# ============================================================
+# 🗄️ Datasets en colonnes typées : Parquet / Feather (src/datasets.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Ne plus reparser du texte à 17 chiffres à chaque
+#     chargement des datasets traités.
+# 📌 **Principe :**
+#     - `write_columnar(csv)` : deux lectures en flux du CSV ;
+#         1️⃣ choix des types compacts par colonne (`plan_dtypes`) ;
+#         2️⃣ écriture à côté du CSV d'un `.parquet` (compressé, échange)
+#            et d'un `.feather` (non compressé, projetable en mémoire).
+#     - `load_dataset(chemin)` : préfère le `.feather` (mmap, pages lues
+#       à la demande et partagées entre processus), puis le `.parquet`,
+#       puis le CSV d'origine.
+#     - `export_columnar(csv)` : même export, ignoré (avertissement) si
+#       pyarrow n'est pas installé ; les CSV restent la référence.
+# 🧮 **Types compacts :**
+#     - entiers (codes de catégories, indicateurs) → int8 / int16 ;
+#     - réels → float32 si la conversion ne fusionne aucune valeur
+#       distincte (l'ordre des valeurs, donc les splits d'arbres, est
+#       préservé) ; les cibles restent en float64.
+# ⚠️ `pyarrow` est une dépendance optionnelle (extra `columnar` :
+#     `poetry install -E columnar`), importée à l'usage.
+# ============================================================
+
+import importlib.util
+import sys
+from functools import lru_cache
+from pathlib import Path
+import numpy as np  # Choix des types compacts
+import pandas as pd  # Lecture du CSV par morceaux
+from loguru import logger  # Gestion avancée et lisible des logs
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))  # 🔗 Racine du projet (import `src.*`)
+
+from src.config import (
+    CLEANED_DATA_PATH, PROCESSED_ENERGY_PATH, PROCESSED_CO2_PATH, PREPROCESSING_CHUNKSIZE,
+)
+from src.profiling import stage  # Balises du profilage opt-in (src/profiling.py)
+
+COLUMNAR_SUFFIXES = [".feather", ".parquet"]  # Ordre de préférence au chargement
+TARGET_COLUMNS = ["site_energy_use", "ghg_emissions_total"]  # Cibles : jamais réduites en float32
+INTEGER_DTYPES = [np.int8, np.int16, np.int32]
+
+
+@lru_cache(maxsize=1)
+def columnar_available():
+    """🔌 `True` si pyarrow est installé (extra `columnar`)."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def columnar_path(csv_path, suffix):
+    """📎 Chemin du fichier colonnaire associé à un CSV (même nom, autre extension)."""
+    return Path(csv_path).with_suffix(suffix)
+
+
+# ============================================================
+# 1️⃣ Choix des types compacts (une lecture en flux)
+# ============================================================
+def plan_dtypes(csv_path, chunksize=PREPROCESSING_CHUNKSIZE, keep_float64=TARGET_COLUMNS):
+    """
+    📄 **Description :**
+    - Retourne `{colonne: dtype}` pour les colonnes numériques du CSV
+      (les colonnes texte sont laissées à pyarrow).
+    - Entier : toutes les valeurs sont finies et entières → plus petit
+      type entier qui contient `[min, max]`.
+    - float32 : aucune paire de valeurs distinctes ne devient égale après
+      conversion (contrôlé morceau par morceau) et pas de dépassement.
+    """
+    stats = {}
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+        for col in chunk.select_dtypes(include="number").columns:
+            values = chunk[col].to_numpy(dtype=np.float64)
+            state = stats.setdefault(col, {"integral": True, "float32": True, "min": np.inf, "max": -np.inf})
+            finite = np.isfinite(values)
+            state["integral"] &= bool(finite.all() and np.all(values == np.round(values)))
+            if finite.any():
+                state["min"] = min(state["min"], float(values[finite].min()))
+                state["max"] = max(state["max"], float(values[finite].max()))
+            if state["float32"] and col not in keep_float64:
+                distinct = np.unique(values[finite])
+                narrowed = distinct.astype(np.float32)
+                state["float32"] = bool(np.isfinite(narrowed).all() and np.unique(narrowed).size == distinct.size)
+
+    plan = {}
+    for col, state in stats.items():
+        if state["integral"] and col not in keep_float64:
+            plan[col] = next((np.dtype(t).name for t in INTEGER_DTYPES
+                              if np.iinfo(t).min <= state["min"] and state["max"] <= np.iinfo(t).max), "int64")
+        elif state["float32"] and col not in keep_float64:
+            plan[col] = "float32"
+        else:
+            plan[col] = "float64"
+    return plan
+
+
+# ============================================================
+# 2️⃣ Écriture Parquet + Feather (deuxième lecture en flux)
+# ============================================================
+def write_columnar(csv_path, chunksize=PREPROCESSING_CHUNKSIZE, keep_float64=TARGET_COLUMNS):
+    """💾 Écrit `.parquet` et `.feather` à côté de `csv_path` ; retourne `(plan, chemins)`."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with stage("columnar_dtypes"):
+        plan = plan_dtypes(csv_path, chunksize, keep_float64)
+    paths = {suffix: columnar_path(csv_path, suffix) for suffix in COLUMNAR_SUFFIXES}
+    schema = parquet_writer = feather_writer = None
+    try:
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+            with stage("export_columnar", rows=len(chunk)):
+                table = pa.Table.from_pandas(chunk.astype(plan), preserve_index=False)
+                if schema is None:
+                    schema = table.schema
+                    parquet_writer = pq.ParquetWriter(paths[".parquet"], schema, compression="zstd")
+                    feather_writer = pa.ipc.new_file(paths[".feather"], schema)  # Non compressé : mmap sans copie
+                table = table.cast(schema)
+                parquet_writer.write_table(table)
+                feather_writer.write_table(table)
+    finally:
+        for writer in (parquet_writer, feather_writer):
+            if writer is not None:
+                writer.close()
+
+    compact = {dtype: sum(1 for d in plan.values() if d == dtype) for dtype in sorted(set(plan.values()))}
+    logger.info(f"🗄️ {Path(csv_path).name} → .parquet / .feather (colonnes par type : {compact})")
+    return plan, paths
+
+
+def export_columnar(csv_path, chunksize=PREPROCESSING_CHUNKSIZE, keep_float64=TARGET_COLUMNS):
+    """🗄️ `write_columnar` si pyarrow est installé ; sinon avertissement et `None` (le CSV reste chargé)."""
+    if not columnar_available():
+        logger.warning(f"⚠️ pyarrow absent : export Parquet / Feather de {Path(csv_path).name} ignoré "
+                       "(poetry install -E columnar).")
+        return None
+    return write_columnar(csv_path, chunksize, keep_float64)
+
+
+# ============================================================
+# 📂 Chargement (mmap si possible)
+# ============================================================
+def resolve_dataset_path(path):
+    """🔎 Fichier à lire pour `path` : `.feather`, puis `.parquet`, puis le chemin tel quel (CSV sans pyarrow)."""
+    path = Path(path)
+    if path.suffix.lower() in COLUMNAR_SUFFIXES or not columnar_available():
+        return path
+    for suffix in COLUMNAR_SUFFIXES:
+        candidate = columnar_path(path, suffix)
+        if not candidate.exists():
+            continue
+        if path.exists() and candidate.stat().st_mtime < path.stat().st_mtime:
+            logger.warning(f"⚠️ {candidate.name} plus ancien que {path.name} : ignoré (relancer write_columnar).")
+            continue
+        return candidate
+    return path
+
+
+def load_dataset(path, columns=None, memory_map=True):
+    """
+    📄 **Description :**
+    - Charge un dataset traité en DataFrame (types compacts conservés).
+    - `.feather` : projeté en mémoire (`memory_map=True`) ; seules les
+      colonnes demandées sont lues, les colonnes numériques sans valeur
+      manquante sont exposées sans copie.
+    - Repli sur le `.parquet` puis sur le CSV si le format colonnaire est
+      absent ou plus ancien que le CSV.
+    """
+    resolved = resolve_dataset_path(path)
+    suffix = resolved.suffix.lower()
+    if suffix == ".feather":
+        import pyarrow.feather as feather
+        table = feather.read_table(resolved, columns=columns, memory_map=memory_map)
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+    if suffix == ".parquet":
+        import pyarrow.parquet as pq
+        return pq.read_table(resolved, columns=columns, memory_map=memory_map).to_pandas(split_blocks=True,
+                                                                                          self_destruct=True)
+    return pd.read_csv(resolved, usecols=columns)
+
+
+def main():
+    """🗄️ Convertit les datasets de `src/config.py` existants en Parquet / Feather."""
+    for csv_path in [CLEANED_DATA_PATH, PROCESSED_ENERGY_PATH, PROCESSED_CO2_PATH]:
+        if Path(csv_path).exists():
+            export_columnar(csv_path)
+        else:
+            logger.warning(f"⚠️ {csv_path} absent : ignoré.")
+
+
+if __name__ == "__main__":
+    main()
+
+# ============================================================
+# 🎉 Exemples :
+#     ➔ python src/datasets.py   (conversion des CSV existants)
+#     ➔ load_dataset(CLEANED_DATA_PATH, columns=features)
+# ============================================================
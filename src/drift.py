@@ -0,0 +1,219 @@
+# ============================================================
+# 📡 Surveillance de la dérive des entrées (src/drift.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Voir les distributions de features changer
+#     (nouvelle année de relevés, autre ville) avant que les
+#     prédictions ne se dégradent.
+# 📌 **Fonctionnement :**
+#     - `StreamingStats` : moyenne / variance glissantes (Welford) et
+#       histogrammes à bornes fixes, dans des tableaux préalloués ;
+#       une mise à jour = quelques opérations numpy (µs par requête).
+#     - Référence calculée à l'enregistrement sur les données
+#       d'entraînement (`custom_objects["drift_reference"]`) avec le même
+#       accumulateur : bornes = quantiles d'entraînement (`DRIFT_BINS`).
+#     - `DriftMonitor` : statistiques servies d'une version de modèle et
+#       scores par feature : PSI des histogrammes, écart de moyenne (en
+#       écarts-types de référence), rapport des écarts-types.
+#     - Scores exposés par `/drift_<cible>` et en jauges Prometheus
+#       (`feature_drift_psi`, `/metrics`) rafraîchies toutes les
+#       `DRIFT_PUBLISH_SECONDS` au plus.
+# ⚠️ Statistiques par worker API (comme le cache des prédictions).
+# ============================================================
+
+import time
+import numpy as np  # Tableaux préalloués et mises à jour vectorisées
+from src.config import DRIFT_BINS, DRIFT_MIN_COUNT, DRIFT_PSI_WARNING, DRIFT_PSI_ALERT, DRIFT_PUBLISH_SECONDS
+
+PSI_EPSILON = 1e-4  # Proportion plancher d'un bin vide (PSI fini)
+
+
+class StreamingStats:
+    """
+    📄 **Description :**
+    - Accumulateur par feature : effectif, moyenne, somme des carrés des
+      écarts (`m2`) et effectifs par bin.
+    - `edges[j]` : bornes intérieures de la feature j ; le bin b compte les
+      valeurs dépassant b bornes (bins extrêmes ouverts).
+    - Fusionnable : deux accumulateurs aux mêmes bornes s'additionnent (`merge`).
+    """
+
+    def __init__(self, edges):
+        n_features = len(edges)
+        width = max((len(e) for e in edges), default=0)
+        self.edges = np.full((n_features, width), np.inf)  # Bornes complétées par +inf (jamais dépassées)
+        for j, feature_edges in enumerate(edges):
+            self.edges[j, :len(feature_edges)] = feature_edges
+        self.widths = np.array([len(e) for e in edges], dtype=np.int64)
+        self.count = 0
+        self.mean = np.zeros(n_features)
+        self.m2 = np.zeros(n_features)
+        self.counts = np.zeros((n_features, width + 1), dtype=np.int64)
+        self._offsets = np.arange(n_features) * (width + 1)
+
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else np.zeros_like(self.m2)
+
+    def update(self, matrix):
+        """➕ Ajoute les lignes de `matrix` `(n, k)` (valeurs finies, déjà validées)."""
+        n_rows = matrix.shape[0]
+        if n_rows == 0:
+            return
+        if n_rows == 1:  # Chemin courant (`/predict_<cible>`) : Welford ligne à ligne
+            row = matrix[0]
+            self.count += 1
+            delta = row - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (row - self.mean)
+        else:  # Lot : fusion de Chan (moyenne et m2 du lot)
+            batch_mean = matrix.mean(axis=0)
+            batch_m2 = ((matrix - batch_mean) ** 2).sum(axis=0)
+            self._combine(n_rows, batch_mean, batch_m2)
+        bins = (matrix[:, :, None] > self.edges).sum(axis=2) + self._offsets
+        flat = self.counts.reshape(-1)
+        if n_rows == 1:
+            flat[bins[0]] += 1  # Un indice par feature : pas de doublon
+        else:
+            flat += np.bincount(bins.reshape(-1), minlength=flat.size)
+
+    def _combine(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * (count / total)
+        self.m2 += m2 + delta ** 2 * (self.count * count / total)
+        self.count = total
+
+    def merge(self, other):
+        """🔗 Ajoute un accumulateur aux mêmes bornes (ex. référence + nouvelles lignes)."""
+        if other.count:
+            self._combine(other.count, other.mean, other.m2)
+            self.counts += other.counts
+        return self
+
+    def proportions(self):
+        return self.counts / max(self.count, 1)
+
+    def to_dict(self):
+        """💾 Forme sérialisable (listes) enregistrée avec le modèle."""
+        return {"edges": [self.edges[j, :w].tolist() for j, w in enumerate(self.widths)],
+                "count": int(self.count), "mean": self.mean.tolist(), "m2": self.m2.tolist(),
+                "counts": self.counts.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(data["edges"])
+        stats.count = int(data["count"])
+        stats.mean[:] = data["mean"]
+        stats.m2[:] = data["m2"]
+        stats.counts[:] = data["counts"]
+        return stats
+
+
+# ============================================================
+# 📐 Référence d'entraînement (enregistrement)
+# ============================================================
+def _finite_rows(data, features):
+    values = np.asarray(data[list(features)], dtype=np.float64)
+    return values[np.isfinite(values).all(axis=1)]
+
+
+def reference_stats(data, features, bins=DRIFT_BINS):
+    """
+    📄 **Description :**
+    - Bornes = quantiles d'entraînement de chaque feature (`bins` bins de même
+      effectif ; moins pour une feature à peu de valeurs distinctes).
+    - Retourne l'accumulateur sérialisé des lignes complètes de `data`.
+    """
+    values = _finite_rows(data, features)
+    quantiles = np.linspace(0, 1, bins + 1)[1:-1]
+    edges = [np.unique(np.quantile(column, quantiles)).tolist() if len(column) else [] for column in values.T]
+    stats = StreamingStats(edges)
+    stats.update(values)
+    return stats.to_dict()
+
+
+def merge_reference(reference, data, features):
+    """🔗 Référence existante + nouvelles lignes, sur les bornes existantes (sinon : nouvelle référence)."""
+    if not reference:
+        return reference_stats(data, features)
+    merged = StreamingStats.from_dict(reference)
+    extra = StreamingStats(reference["edges"])
+    extra.update(_finite_rows(data, features))
+    return merged.merge(extra).to_dict()
+
+
+# ============================================================
+# 🚨 Scores de dérive d'une version servie
+# ============================================================
+def drift_status(psi, count, min_count=DRIFT_MIN_COUNT):
+    """🚦 "insufficient_data" sous `min_count` observations, puis stable / warning / drift selon le PSI."""
+    if count < min_count:
+        return "insufficient_data"
+    if psi >= DRIFT_PSI_ALERT:
+        return "drift"
+    return "warning" if psi >= DRIFT_PSI_WARNING else "stable"
+
+
+class DriftMonitor:
+    """
+    📄 **Description :**
+    - Statistiques des entrées servies par une version (`observe`) comparées
+      à sa référence d'entraînement (`report`).
+    - Publie les PSI en jauges Prometheus au plus toutes les `publish_seconds`.
+    """
+
+    def __init__(self, model_name, features, reference, publish_seconds=DRIFT_PUBLISH_SECONDS):
+        self.model_name = model_name
+        self.features = list(features)
+        self.reference = StreamingStats.from_dict(reference)
+        self.current = StreamingStats(reference["edges"])
+        self.publish_seconds = publish_seconds
+        self._published = time.monotonic()
+
+    def observe(self, matrix):
+        """📥 Ajoute les lignes validées d'une requête (quelques µs)."""
+        self.current.update(matrix)
+        if self.publish_seconds > 0 and time.monotonic() - self._published >= self.publish_seconds:
+            self.publish()
+
+    def scores(self):
+        """📐 PSI, écart de moyenne et rapport des écarts-types, par feature (neutres sans observation)."""
+        n_features = len(self.features)
+        if not self.current.count:
+            return np.zeros(n_features), np.zeros(n_features), np.ones(n_features)
+        observed = np.clip(self.current.proportions(), PSI_EPSILON, None)
+        expected = np.clip(self.reference.proportions(), PSI_EPSILON, None)
+        psi = ((observed - expected) * np.log(observed / expected)).sum(axis=1)
+        reference_std = np.sqrt(self.reference.variance)
+        defined = reference_std > 0
+        safe_std = np.where(defined, reference_std, 1.0)
+        mean_shift = np.where(defined, (self.current.mean - self.reference.mean) / safe_std, 0.0)
+        std_ratio = np.where(defined, np.sqrt(self.current.variance) / safe_std, 1.0)
+        return psi, mean_shift, std_ratio
+
+    def report(self):
+        """📊 Scores par feature et statut global (pire feature)."""
+        psi, mean_shift, std_ratio = self.scores()
+        count = self.current.count
+        features = {name: {"psi": float(psi[j]), "mean_shift": float(mean_shift[j]), "std_ratio": float(std_ratio[j]),
+                           "status": drift_status(psi[j], count)}
+                    for j, name in enumerate(self.features)}
+        worst = int(np.argmax(psi)) if len(psi) else None
+        return {"observations": int(count), "reference_count": int(self.reference.count),
+                "max_psi": float(psi[worst]) if worst is not None else 0.0,
+                "max_psi_feature": self.features[worst] if worst is not None else None,
+                "status": drift_status(psi[worst] if worst is not None else 0.0, count),
+                "features": features}
+
+    def publish(self):
+        """📈 Jauges `feature_drift_psi` / `feature_drift_observations` (labels modèle, feature)."""
+        from src.observability import drift_psi, drift_observations, metrics_enabled  # Import paresseux : référence calculable sans BentoML
+
+        self._published = time.monotonic()
+        if not metrics_enabled():
+            return
+        psi, _, _ = self.scores()
+        for name, value in zip(self.features, psi):
+            drift_psi.labels(model=self.model_name, feature=name).set(float(value))
+        drift_observations.labels(model=self.model_name).set(self.current.count)
+
@@ -14,33 +14,78 @@
 
 # 📦 **Imports nécessaires et leur rôle**
 import bentoml  # Framework pour le déploiement rapide de modèles ML
-from bentoml.io import JSON  # Gestion des entrées/sorties au format JSON
+from bentoml.io import JSON, File  # Entrées/sorties JSON et binaires
+from typing import Optional  # Valeurs manquantes dans les colonnes brutes
 from pydantic import BaseModel, Field, validator  # Validation robuste des données
 import numpy as np  # Manipulation numérique efficace
 from loguru import logger  # Gestion avancée et lisible des logs
-from src.config import ENERGY_SERVICE_PORT  # Port d'écoute configuré
+from src.validation import to_column_arrays  # Conversion des colonnes brutes
+from src.prediction_cache import PredictionCache, predict_with_cache  # Cache LRU/TTL des prédictions
+from src.binary_io import decode_feature_matrix  # Entrées binaires NDF8 / Arrow
+from src.runners import make_runner, make_variant_runners  # Backend d'inférence choisi par configuration
+from src.observability import timed, sample_request_log, configure_service_logging  # Métriques et logs échantillonnés
+from src.grpc_service import GrpcTarget, mount_prediction_servicer  # Interface gRPC (mêmes runners)
+from src.batching import predict_in_chunks  # Appels `predict_bulk` par tranches
+from src.what_if import WhatIfPlan  # Scénarios « what-if » développés en une matrice
+from src.hot_swap import ModelSlot, FULL_MODEL, select_slot, variant_of  # Modèle servi (à chaud) et variantes
+from src.config import (  # Port, micro-batching et cache
+    ENERGY_SERVICE_PORT, RUNNER_MAX_BATCH_SIZE, RUNNER_MAX_LATENCY_MS, INFERENCE_BACKEND,
+    PREDICTION_CACHE_MAX_BYTES, PREDICTION_CACHE_TTL_SECONDS, HOT_SWAP_POLL_SECONDS, WHAT_IF_CHUNK_ROWS,
+    EXPLAIN_CACHE_MAX_BYTES,
+)
+
+configure_service_logging()  # 📝 Sink loguru asynchrone (hors du chemin critique)
 
 # 🔗 **Chargement du modèle Énergie depuis BentoML**
 logger.info(f"🔄 Chargement du modèle Énergie sur le port {ENERGY_SERVICE_PORT}...")
 model_energy_ref = bentoml.sklearn.get("site_energy_use_model:latest")  # Dernier modèle Énergie enregistré
 features_energy = model_energy_ref.custom_objects.get("features", [])  # Features utilisées lors de l'entraînement
 logger.info(f"📋 Features Énergie : {features_energy}")
-energy_runner = model_energy_ref.to_runner()  # Création du runner pour exécution asynchrone
-logger.info("⚡ Runner Énergie configuré.")
+# 📦 Runner avec micro-batching adaptatif : les requêtes concurrentes sont regroupées
+#    en une seule matrice (signature `predict` déclarée batchable à l'enregistrement)
+#    Backend (`INFERENCE_BACKEND`) : "sklearn" ou tables de nœuds compilées "flat_trees"
+energy_runner = make_runner(model_energy_ref)
+logger.info(f"⚡ Runner Énergie configuré (backend : {INFERENCE_BACKEND}, lot max : {RUNNER_MAX_BATCH_SIZE}, latence max : {RUNNER_MAX_LATENCY_MS} ms).")
+# ♻️ Version servie : validateur, transformation brute et runner liés au tag ; remplacée à chaud
+#    (store surveillé toutes les HOT_SWAP_POLL_SECONDS ou `/reload_energy_model`, voir src/hot_swap.py)
+energy_slot = ModelSlot(model_energy_ref.tag.name, energy_runner.predict, model_energy_ref,
+                        bulk_method=energy_runner.predict_bulk, explain_method=energy_runner.explain)
+logger.info(f"♻️ Remplacement à chaud Énergie : store vérifié toutes les {HOT_SWAP_POLL_SECONDS} s (0 : admin seulement).")
+# 🪶 Variantes allégées enregistrées (src/variants.py) : un runner et un emplacement chacune,
+#    choisies par requête avec `"variant": "float32" | "first_n" | "distilled"` (défaut : modèle complet)
+energy_variant_runners = make_variant_runners(model_energy_ref.tag.name)
+energy_slots = {FULL_MODEL: energy_slot, **{
+    variant: ModelSlot(ref.tag.name, runner.predict, ref, bulk_method=runner.predict_bulk,
+                       explain_method=runner.explain)
+    for variant, (runner, ref) in energy_variant_runners.items()}}
+energy_cache = PredictionCache(PREDICTION_CACHE_MAX_BYTES, PREDICTION_CACHE_TTL_SECONDS)  # 🗃️ Clés liées au tag servi
+logger.info(f"🗃️ Cache Énergie : {energy_cache.max_entries} entrées max, TTL {PREDICTION_CACHE_TTL_SECONDS} s.")
+# 🔍 Cache des attributions (`/explain_energy`) : un vecteur de k + 1 valeurs par ligne
+energy_explain_cache = PredictionCache(EXPLAIN_CACHE_MAX_BYTES, PREDICTION_CACHE_TTL_SECONDS, width=len(features_energy) + 1)
 logger.info(f"🚀 ✅ Service Énergie disponible sur http://127.0.0.1:{ENERGY_SERVICE_PORT}")
 
 # 🌐 **Définition du service BentoML (port explicitement configuré)**
 energy_prediction_service = bentoml.Service(
     name="energy_prediction_service",
-    runners=[energy_runner]
+    runners=[energy_runner, *(runner for runner, _ in energy_variant_runners.values())]
 )
 
 # 📜 **Validation des données entrantes pour l'Énergie**
-class EnergyInputData(BaseModel):
+#    Le corps JSON est converti directement en float64 puis contrôlé en une passe numpy :
+#    forme, valeurs finies et plages observées à l'entraînement (voir `src/validation.py`).
+#    Validateur propre à la version servie : `energy_slot.acquire().validator`.
+
+# ✨ **Endpoint principal pour la prédiction énergétique**
+@energy_prediction_service.api(input=JSON(), output=JSON())
+async def predict_energy(data):
     """
-    📄 **Description :**
-    - Reçoit une liste de valeurs numériques correspondant aux features du modèle Énergie.
-    - Valide la longueur de la liste pour correspondre aux features attendues.
+    ⚡ **Endpoint :** `/predict_energy`
+    - 🛡️ Convertit `features` en float64 et rejette NaN / inf / valeurs hors plage
+      avec des erreurs indexées (ligne, feature).
+    - 🗃️ Sert la prédiction depuis le cache si la ligne est déjà connue.
+    - 🏃 Sinon exécute la prédiction via le runner.
+    - 🌟 Retourne la prédiction sous forme JSON, avec le tag du modèle ayant répondu.
+    - 🪶 `"variant"` (optionnel) : variante allégée servie à la place du modèle complet.
 
     💡 **Exemple JSON attendu :**
     ```json
@@ -59,52 +104,331 @@ class EnergyInputData(BaseModel):
     8. `property_use_list_office` : Indicateur pour usage de type bureau.
     9. `building_density` : Densité du bâtiment (surface/volume).
     10. `property_type_office` : Indicateur pour propriété de type bureau.
+    📝 **Réponse JSON exemple :**
+    ```json
+    {
+        "site_energy_use": 135000.50,
+        "model_tag": "site_energy_use_model:3yq2nbq5ngkcqhqa"
+    }
+    ```
     """
-    features: list[float] = Field(..., description=f"{len(features_energy)} valeurs attendues.")
+    try:
+        version = select_slot(energy_slots, variant_of(data)).acquire()  # ♻️ Une version pour toute la requête
+        with timed("predict_energy", "validation"):
+            input_features = version.validator.validate_row(data)
+        with timed("predict_energy", "drift_stats"):
+            version.observe(input_features)  # 📡 Statistiques des entrées servies
+        energy_pred = await predict_with_cache(energy_cache, version.runner_method, input_features, version.tag,
+                                               RUNNER_MAX_BATCH_SIZE, endpoint="predict_energy")
+        if sample_request_log():
+            logger.info(f"⚡ Résultat : {energy_pred[0]:.2f} kBtu")
+        with timed("predict_energy", "serialization"):
+            return {"site_energy_use": float(energy_pred[0]), "model_tag": str(version.tag)}
+    except Exception as e:
+        logger.error(f"❌ Erreur Énergie : {str(e)}")
+        return {"error": str(e)}
 
-    @validator('features')
-    def check_length(cls, v):
-        if len(v) != len(features_energy):
-            raise ValueError(f"❌ {len(features_energy)} attendues, {len(v)} reçues.")
-        return v
+# 📦 **Endpoint de prédiction énergétique par lot**
+@energy_prediction_service.api(input=JSON(), output=JSON())
+async def predict_energy_batch(data):
+    """
+    ⚡ **Endpoint :** `/predict_energy_batch`
+    - 🧮 Convertit la matrice en float64 et la valide en une passe (forme, finitude, plages).
+    - 🏃 Envoie au runner les seules lignes absentes du cache, par tranches de `RUNNER_MAX_BATCH_SIZE`.
+    - 🌟 Retourne les prédictions sous forme de tableau colonne.
+    - 🪶 `"variant"` (optionnel) : variante allégée servie à la place du modèle complet.
 
-# ✨ **Endpoint principal pour la prédiction énergétique**
-@energy_prediction_service.api(input=JSON(pydantic_model=EnergyInputData), output=JSON())
-async def predict_energy(data: EnergyInputData):
+    💡 **Exemple JSON attendu :**
+    ```json
+    {
+        "features": [
+            [0.1, 0.5, 2, 1995, 1, 65.0, 0, 120.0, 1, 0],
+            [0.3, 0.2, 1, 1960, 0, 48.0, 1, 95.0, 0, 0]
+        ]
+    }
+    ```
+    📝 **Réponse JSON exemple :**
+    ```json
+    {
+        "site_energy_use": [135000.50, 98000.25],
+        "count": 2,
+        "model_tag": "site_energy_use_model:3yq2nbq5ngkcqhqa"
+    }
+    ```
     """
-    ⚡ **Endpoint :** `/predict_energy`
-    - 🔄 Transforme les données entrantes en tableau numpy.
-    - 🏃 Exécute la prédiction via le runner.
-    - 🌟 Retourne la prédiction sous forme JSON.
+    try:
+        version = select_slot(energy_slots, variant_of(data)).acquire()  # ♻️ Une version pour toute la requête
+        with timed("predict_energy_batch", "validation"):
+            matrix = version.validator.validate_rows(data)
+        with timed("predict_energy_batch", "drift_stats"):
+            version.observe(matrix)
+        energy_pred = await predict_with_cache(energy_cache, version.runner_method, matrix, version.tag,
+                                               RUNNER_MAX_BATCH_SIZE, endpoint="predict_energy_batch")
+        if sample_request_log():
+            logger.info(f"⚡ Lot Énergie terminé : {len(energy_pred)} prédictions.")
+        with timed("predict_energy_batch", "serialization"):
+            return {"site_energy_use": energy_pred.astype(float).tolist(), "count": int(len(energy_pred)),
+                    "model_tag": str(version.tag)}
+    except Exception as e:
+        logger.error(f"❌ Erreur Énergie (lot) : {str(e)}")
+        return {"error": str(e)}
+
+# 🧱 **Endpoint de prédiction par lot au format binaire (NDF8 / Arrow IPC)**
+@energy_prediction_service.api(input=File(), output=JSON())
+async def predict_energy_binary(data, ctx: bentoml.Context):
+    """
+    ⚡ **Endpoint :** `/predict_energy_binary`
+    - 🧱 Reçoit le corps brut : NDF8 (float64 LE + en-tête) ou Arrow IPC.
+    - 🔢 Mappe le buffer en matrice numpy sans parsing JSON (voir `src/binary_io.py`).
+    - 🏃 Envoie au runner les seules lignes absentes du cache, par tranches de `RUNNER_MAX_BATCH_SIZE`.
+
+    💡 **Exemple client :**
+    ```python
+    from src.binary_io import encode_feature_matrix
+    requests.post(url, data=encode_feature_matrix(matrix),
+                  headers={"Content-Type": "application/octet-stream"})
+    ```
+    - 🪶 Variante allégée : paramètre d'URL `?variant=distilled` (défaut : modèle complet).
+    """
+    try:
+        variant = ctx.request.query_params.get("variant")  # 🪶 `?variant=...` (corps binaire)
+        version = select_slot(energy_slots, variant).acquire()  # ♻️ Une version pour toute la requête
+        with timed("predict_energy_binary", "validation"):
+            matrix = version.validator.check(decode_feature_matrix(data.read(), version.features))
+        with timed("predict_energy_binary", "drift_stats"):
+            version.observe(matrix)
+        energy_pred = await predict_with_cache(energy_cache, version.runner_method, matrix, version.tag,
+                                               RUNNER_MAX_BATCH_SIZE, endpoint="predict_energy_binary")
+        if sample_request_log():
+            logger.info(f"🔍 Prédiction Énergie binaire : {matrix.shape[0]} bâtiments.")
+        with timed("predict_energy_binary", "serialization"):
+            return {"site_energy_use": energy_pred.astype(float).tolist(), "count": int(len(energy_pred)),
+                    "model_tag": str(version.tag)}
+    except Exception as e:
+        logger.error(f"❌ Erreur Énergie (binaire) : {str(e)}")
+        return {"error": str(e)}
+
+# 📜 **Validation des attributs bruts (format colonnaire) pour l'Énergie**
+class EnergyRawInputData(BaseModel):
+    """
+    📄 **Description :**
+    - Reçoit les attributs bruts des bâtiments, une liste par colonne.
+    - `null` est accepté : la valeur est imputée comme lors du prétraitement.
+    - Colonnes attendues : voir `required_columns(features_energy)` (`src/feature_transform.py`).
 
     💡 **Exemple JSON attendu :**
     ```json
     {
-        "features": [0.1, 0.5, 2, 1995, 1, 65.0, 0, 120.0, 1, 0]
+        "columns": {
+            "site_energy_use": [7226362.5, null],
+            "electricity_kbtu": [3946027.0, 1811213.0],
+            "natural_gas_kbtu": [1276453.0, 0.0],
+            "site_eui": [81.7, 94.8],
+            "gfa_total": [88434, 103566],
+            "num_floors": [12, 11],
+            "year_built": [1927, 1996],
+            "property_type_office": [0, 1]
+        }
+    }
+    ```
+    """
+    columns: dict[str, list[Optional[float]]] = Field(..., description="Attributs bruts : une liste de valeurs par colonne.")
+    variant: Optional[str] = Field(None, description="Variante allégée (défaut : modèle complet).")
+
+    @validator('columns')
+    def check_columns(cls, v):
+        with timed("predict_energy_raw", "validation"):
+            return to_column_arrays(v)
+
+# 🏗️ **Endpoint de prédiction à partir des attributs bruts**
+@energy_prediction_service.api(input=JSON(pydantic_model=EnergyRawInputData), output=JSON())
+async def predict_energy_raw(data: EnergyRawInputData):
+    """
+    ⚡ **Endpoint :** `/predict_energy_raw`
+    - 🏗️ Calcule les features (imputation, bornes IQR, ratios, catégories,
+      standardisation) en numpy, sur tout le lot, avec les paramètres du modèle.
+    - 🛡️ Matrice contrôlée comme `/predict_energy_batch` (finitude + plages) avant dérive et prédiction.
+    - 🏃 Prédit comme `/predict_energy_batch` (cache + runner).
+    """
+    try:
+        version = select_slot(energy_slots, data.variant).acquire()  # ♻️ Une version pour toute la requête
+        if version.transform is None:
+            raise ValueError("❌ Modèle enregistré sans paramètres de l'espace des features (fit_model_features).")
+        with timed("predict_energy_raw", "array_conversion"):
+            matrix = version.transform.to_matrix(data.columns, version.features)
+        with timed("predict_energy_raw", "validation"):
+            version.validator.check(matrix)  # 🛡️ Indicateurs repris de l'entrée : `null` → NaN refusé
+        with timed("predict_energy_raw", "drift_stats"):
+            version.observe(matrix)
+        energy_pred = await predict_with_cache(energy_cache, version.runner_method, matrix, version.tag,
+                                               RUNNER_MAX_BATCH_SIZE, endpoint="predict_energy_raw")
+        if sample_request_log():
+            logger.info(f"🔍 Prédiction Énergie (attributs bruts) : {matrix.shape[0]} bâtiments.")
+        with timed("predict_energy_raw", "serialization"):
+            return {"site_energy_use": energy_pred.astype(float).tolist(), "count": int(len(energy_pred)),
+                    "model_tag": str(version.tag)}
+    except Exception as e:
+        logger.error(f"❌ Erreur Énergie (attributs bruts) : {str(e)}")
+        return {"error": str(e)}
+
+# 🔀 **Analyse « what-if » : scénarios de changements sur un lot de bâtiments**
+@energy_prediction_service.api(input=JSON(), output=JSON())
+async def what_if_energy(data):
+    """
+    ⚡ **Endpoint :** `/what_if_energy`
+    - 🧮 Valide la matrice de base comme `/predict_energy_batch`.
+    - 🔀 Développe en mémoire la base et tous les scénarios (changements par feature
+      et/ou grille de valeurs) en une seule matrice, elle aussi validée.
+    - 🏃 Prédit en quelques appels `predict_bulk` (hors cache et hors micro-batching)
+      et retourne les écarts de `site_energy_use` de chaque scénario à la base.
+    - 📉 `"details": false` : seulement les résumés par scénario (moyenne, min, max).
+    - 🪶 `"variant"` (optionnel) : variante allégée servie à la place du modèle complet.
+
+    💡 **Exemple JSON attendu :**
+    ```json
+    {
+        "features": [[...], [...]],
+        "scenarios": [{"name": "gaz -0.1", "changes": {"gas_ratio": -0.1}},
+                      {"changes": {"electricity_ratio": {"scale": 1.1}}}],
+        "grid": {"gas_ratio": [0.0, 0.25, 0.5]}
     }
     ```
     📝 **Réponse JSON exemple :**
     ```json
     {
-        "site_energy_use": 135000.50
+        "count": 2, "n_scenarios": 5, "rows_evaluated": 12, "baseline_mean": 135000.5,
+        "baseline": [...],
+        "scenarios": [{"name": "gaz -0.1", "mean_delta": -3.2, "min_delta": -5.1, "max_delta": -1.3,
+                       "mean_prediction": ..., "deltas": [-5.1, -1.3]}, ...],
+        "model_tag": "site_energy_use_model:3yq2nbq5ngkcqhqa"
     }
     ```
     """
     try:
-        logger.info("🔍 Prédiction Énergie en cours...")
-        input_features = np.array(data.features).reshape(1, -1)
-        energy_pred = await energy_runner.predict.async_run(input_features)
-        logger.info(f"⚡ Résultat : {energy_pred[0]:.2f} kBtu")
-        return {"site_energy_use": float(energy_pred[0])}
+        version = select_slot(energy_slots, variant_of(data)).acquire()  # ♻️ Une version pour toute la requête
+        with timed("what_if_energy", "validation"):
+            base = version.validator.validate_rows(data)
+            plan = WhatIfPlan.from_spec(data, version.features, n_rows=len(base))
+            matrix = plan.matrix(base, version.validator)
+        predictions = await predict_in_chunks(version.bulk_method, matrix, WHAT_IF_CHUNK_ROWS)
+        if sample_request_log():
+            logger.info(f"🔀 What-if Énergie : {len(base)} bâtiments × {plan.n_scenarios} scénarios.")
+        with timed("what_if_energy", "serialization"):
+            return {**plan.summarize(predictions, len(base), details=data.get("details", True)),
+                    "model_tag": str(version.tag)}
     except Exception as e:
-        logger.error(f"❌ Erreur Énergie : {str(e)}")
+        logger.error(f"❌ Erreur Énergie (what-if) : {str(e)}")
+        return {"error": str(e)}
+
+# 🔍 **Attributions par feature (explications) des prédictions**
+@energy_prediction_service.api(input=JSON(), output=JSON())
+async def explain_energy(data):
+    """
+    ⚡ **Endpoint :** `/explain_energy`
+    - 🧮 Valide la matrice comme `/predict_energy_batch` (une ligne ou plusieurs).
+    - 🔍 Attributions par algorithme d'arbres (TreeSHAP LightGBM / XGBoost, voir
+      `src/explain.py`), calculées par le runner en lots micro-batchés.
+    - 🗃️ Lignes déjà expliquées servies depuis un cache dédié (clé : tag + ligne).
+    - 🌟 Retourne, par ligne, la prédiction, la valeur de base et une contribution
+      par feature (leur somme redonne la prédiction).
+    - 🪶 `"variant"` (optionnel) : variante allégée servie à la place du modèle complet.
+
+    📝 **Réponse JSON exemple :**
+    ```json
+    {
+        "site_energy_use": [0.31],
+        "base_value": [-0.02],
+        "contributions": [{"site_eui": 0.42, "gas_ratio": -0.05, ...}],
+        "count": 1,
+        "model_tag": "site_energy_use_model:3yq2nbq5ngkcqhqa"
+    }
+    ```
+    """
+    try:
+        version = select_slot(energy_slots, variant_of(data)).acquire()  # ♻️ Une version pour toute la requête
+        if version.explain_method is None:
+            raise ValueError(f"❌ Explications non disponibles pour {version.tag}.")
+        with timed("explain_energy", "validation"):
+            single = isinstance(data, dict) and isinstance(data.get("features"), list) \
+                and bool(data["features"]) and not isinstance(data["features"][0], list)
+            matrix = version.validator.validate_row(data) if single else version.validator.validate_rows(data)
+        attributions = await predict_with_cache(energy_explain_cache, version.explain_method, matrix, version.tag,
+                                                RUNNER_MAX_BATCH_SIZE, endpoint="explain_energy",
+                                                width=len(version.features) + 1)
+        if sample_request_log():
+            logger.info(f"🔍 Explications Énergie : {matrix.shape[0]} bâtiments.")
+        with timed("explain_energy", "serialization"):
+            return {"site_energy_use": attributions.sum(axis=1).tolist(), "base_value": attributions[:, -1].tolist(),
+                    "contributions": [dict(zip(version.features, row)) for row in attributions[:, :-1].tolist()],
+                    "count": int(len(attributions)), "model_tag": str(version.tag)}
+    except Exception as e:
+        logger.error(f"❌ Erreur Énergie (explications) : {str(e)}")
         return {"error": str(e)}
 
+# 📊 **Compteurs du cache de prédictions**
+@energy_prediction_service.api(input=JSON(), output=JSON())
+async def energy_cache_stats(_):
+    """
+    📊 **Endpoint :** `/energy_cache_stats`
+    - Retourne hits, misses, taux de hit et occupation du cache de ce worker,
+      ainsi que la version servie (modèle complet et variantes) et le nombre de remplacements à chaud ;
+      `"explain"` : mêmes compteurs pour le cache des attributions.
+    - Le corps de la requête est ignoré (`{}`).
+    """
+    variants = {name: slot.status() for name, slot in energy_slots.items() if name != FULL_MODEL}
+    return {**energy_slot.status(), "variants": variants, **energy_cache.stats(), "explain": energy_explain_cache.stats()}
+
+# 📡 **Dérive des entrées servies par rapport à l'entraînement**
+@energy_prediction_service.api(input=JSON(), output=JSON())
+async def drift_energy(_):
+    """
+    📡 **Endpoint :** `/drift_energy`
+    - Compare les entrées servies par ce worker (depuis le chargement de la version)
+      aux statistiques d'entraînement enregistrées avec le modèle (src/drift.py).
+    - Par feature : PSI des histogrammes, écart de moyenne (en écarts-types de
+      référence), rapport des écarts-types et statut (stable / warning / drift).
+    - Modèle complet puis variantes (`"variants"`). PSI aussi exposés sur `/metrics`
+      (jauge `feature_drift_psi`).
+    - Le corps de la requête est ignoré (`{}`).
+    """
+    variants = {name: slot.current.drift_report() for name, slot in energy_slots.items() if name != FULL_MODEL}
+    return {**energy_slot.current.drift_report(), "variants": variants}
+
+# ♻️ **Remplacement à chaud du modèle (admin)**
+@energy_prediction_service.api(input=JSON(), output=JSON())
+async def reload_energy_model(data):
+    """
+    ♻️ **Endpoint :** `/reload_energy_model`
+    - Charge la version demandée (`{"tag": "<nom>:<version>"}`, défaut : `:latest`)
+      du modèle complet ou de la variante `"variant"`,
+      la chauffe sur le runner puis la sert sans redémarrage ; les requêtes en cours
+      terminent avec l'ancienne version.
+    - En cas d'échec, la version servie est conservée et l'erreur est retournée.
+    ⚠️ Endpoint d'administration : à ne pas exposer publiquement.
+    """
+    slot = energy_slot
+    try:
+        slot = select_slot(energy_slots, variant_of(data))
+        return await slot.reload((data or {}).get("tag"))
+    except Exception as e:
+        return {"error": str(e), **slot.status()}
+
+# 📡 **Interface gRPC (`Predict` / `PredictStream`, target "energy")**
+#    Même runner, même cache, même version servie que les endpoints JSON.
+energy_grpc_target = GrpcTarget(energy_slots, energy_cache)
+mount_prediction_servicer(energy_prediction_service, {"energy": energy_grpc_target})
+
 # ============================================================
 # 🏃 **Commandes d'exécution locale (port explicitement défini)**
 # ------------------------------------------------------------
 # ⚡ Énergie :
 #    ➔ bentoml serve src.energy_service:energy_prediction_service --reload --port 3000
+#    ➔ gRPC : bentoml serve-grpc src.energy_service:energy_prediction_service --port 50051
+#    ➔ Endpoints : /predict_energy (une ligne), /predict_energy_batch (matrice JSON)
+#                  /predict_energy_binary (NDF8 / Arrow IPC), /predict_energy_raw (attributs bruts)
+#                  /what_if_energy (scénarios de changements sur un lot), /explain_energy (attributions)
+#                  /drift_energy (dérive des entrées servies)
+#                  /energy_cache_stats et /reload_energy_model (admin, remplacement à chaud)
 # 🌐 Swagger UI :
 #    ➔ Énergie : http://127.0.0.1:3000
 # ============================================================
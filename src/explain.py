@@ -0,0 +1,115 @@
+# ============================================================
+# 🔍 Attributions par feature des modèles d'arbres (src/explain.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Expliquer chaque prédiction (audits, affichage à
+#     côté de la prédiction) à un coût proche de celui de `predict`.
+# 📌 **Algorithmes spécifiques aux arbres, vectorisés par lot :**
+#     - LightGBM : TreeSHAP natif (`predict(pred_contrib=True)`),
+#       multi-thread sur tous les cœurs (OpenMP).
+#     - XGBoost : TreeSHAP natif (`pred_contribs=True`), multi-thread.
+#     - Arbres / forêts scikit-learn (Random Forest, variante distillée) :
+#       TreeSHAP de la librairie `shap` si elle est installée, sinon
+#       attributions par chemin de décision (Saabas) : un produit creux
+#       `chemins × écarts de valeur par nœud`, parallélisé par la forêt.
+# 📐 Sortie `(n, k + 1)` : une colonne par feature puis la valeur de
+#     base ; chaque ligne somme exactement à la prédiction.
+# ============================================================
+
+import numpy as np  # Manipulation numérique efficace
+
+# 🧩 Famille d'attribution par classe de modèle
+EXPLAIN_FAMILIES = {
+    "LGBMRegressor": "lightgbm", "XGBRegressor": "xgboost",
+    "RandomForestRegressor": "sklearn_trees", "ExtraTreesRegressor": "sklearn_trees",
+    "DecisionTreeRegressor": "sklearn_trees", "ExtraTreeRegressor": "sklearn_trees",
+}
+
+
+def explain_family(model):
+    """🧩 Famille d'attribution du modèle (ValueError si non pris en charge)."""
+    family = EXPLAIN_FAMILIES.get(type(model).__name__)
+    if family is None:
+        raise ValueError(f"❌ Explications non disponibles pour {type(model).__name__} "
+                         f"(pris en charge : {sorted(EXPLAIN_FAMILIES)}).")
+    return family
+
+
+def _shap_module():
+    try:
+        import shap  # Dépendance optionnelle : TreeSHAP exact pour scikit-learn
+    except ImportError:
+        return None
+    return shap
+
+
+def attribution_method(model):
+    """🏷️ Nom de l'algorithme utilisé pour `model` ("tree_shap" ou "saabas")."""
+    if explain_family(model) == "sklearn_trees" and _shap_module() is None:
+        return "saabas"
+    return "tree_shap"
+
+
+def tree_contributions(model, X):
+    """
+    📄 **Description :**
+    - Attributions `(n, k + 1)` de toutes les lignes de `X` en un appel :
+      k contributions puis la valeur de base (dernière colonne).
+    """
+    X = np.asarray(X, dtype=np.float64)
+    family = explain_family(model)
+    if family == "lightgbm":
+        return np.asarray(model.predict(X, pred_contrib=True), dtype=np.float64)
+    if family == "xgboost":
+        import xgboost as xgb  # Import paresseux : seulement pour les modèles XGBoost
+        booster = model.get_booster()
+        matrix = xgb.DMatrix(X, feature_names=booster.feature_names)  # Noms imposés si enregistrés à l'entraînement
+        return np.asarray(booster.predict(matrix, pred_contribs=True), dtype=np.float64)
+    shap = _shap_module()
+    if shap is not None:
+        explainer = shap.TreeExplainer(model)
+        values = np.asarray(explainer.shap_values(X), dtype=np.float64)
+        return np.column_stack([values, np.full(len(X), float(np.ravel(explainer.expected_value)[0]))])
+    return path_contributions(model, X)
+
+
+# ============================================================
+# 🌳 Attributions par chemin de décision (Saabas), scikit-learn
+# ============================================================
+def _node_contributions(tree, n_features, weight):
+    """
+    📄 **Description :**
+    - Matrice creuse `(nœuds, k + 1)` : chaque nœud non racine porte l'écart de
+      valeur à son parent sur la feature de la séparation du parent ; la racine
+      porte sa valeur dans la colonne de base.
+    """
+    from scipy import sparse  # Import paresseux : démarrage à froid des runners inchangé
+
+    left, right = tree.children_left, tree.children_right
+    values = tree.value[:, 0, 0]
+    internal = np.flatnonzero(left >= 0)
+    children = np.concatenate([left[internal], right[internal]])
+    parents = np.concatenate([internal, internal])
+    rows = np.concatenate([[0], children])
+    columns = np.concatenate([[n_features], tree.feature[parents]])
+    data = np.concatenate([[values[0]], values[children] - values[parents]]) * weight
+    return sparse.csr_matrix((data, (rows, columns)), shape=(tree.node_count, n_features + 1))
+
+
+def path_contributions(model, X):
+    """
+    📄 **Description :**
+    - Arbre ou forêt scikit-learn : indicateur des nœuds traversés
+      (`decision_path`) × contributions par nœud, moyennées sur les arbres,
+      en un seul produit creux.
+    """
+    from scipy import sparse  # Import paresseux : chemins de décision (matrice creuse lignes × nœuds)
+
+    n_features = model.n_features_in_
+    if hasattr(model, "estimators_"):
+        paths, _ = model.decision_path(X)
+        weight = 1.0 / len(model.estimators_)
+        nodes = sparse.vstack([_node_contributions(tree.tree_, n_features, weight) for tree in model.estimators_])
+    else:
+        paths = model.decision_path(X)
+        nodes = _node_contributions(model.tree_, n_features, 1.0)
+    return np.asarray((paths @ nodes).todense())
@@ -0,0 +1,107 @@
+# ============================================================
+# 🏗️ Transformation brute → features côté service (src/feature_transform.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Accepter les attributs bruts d'un bâtiment
+#     (kBtu, surfaces, étages, année) et produire les features
+#     du modèle sans pandas ni sklearn par requête.
+# 📌 **Étapes (recette de `dataset_cleaned.csv`, sur laquelle les
+#     modèles servis sont entraînés) :**
+#     🩹 imputation → 📉 bornes IQR → 🧮 ratios et indicateurs →
+#     🏢 catégories (bornes numériques) → 📏 standardisation de
+#     `site_energy_use` / `site_eui`
+# 💾 Les paramètres viennent de `fit_model_features` (src/preprocessing.py),
+#     embarqués dans les `custom_objects` du modèle BentoML.
+# ============================================================
+
+import numpy as np  # Seule dépendance de calcul
+from src.binning import add_bins  # Catégories par bornes numériques (partagées)
+
+# 🎯 Recette attendue dans les paramètres (`FittedPreprocessing.recipe`)
+MODEL_RECIPE = "dataset_cleaned"
+# 📋 Colonnes brutes nécessaires au calcul des features dérivées
+RAW_INPUT_COLUMNS = ["site_energy_use", "electricity_kbtu", "natural_gas_kbtu", "site_eui", "gfa_total", "num_floors", "year_built"]
+# 🎯 Cibles transformées avec les features quand elles sont fournies (données d'entraînement)
+TARGET_COLUMNS = ["ghg_emissions_total"]
+# 🧮 Features calculées par la transformation (les autres sont reprises de l'entrée)
+DERIVED_FEATURES = ["site_energy_use", "site_eui", "electricity_ratio", "gas_ratio", "f_is_large_building",
+                    "building_density", "f_has_natural_gas", "floors_cat", "year_built_cat"]
+EPSILON = 1e-6  # Dénominateurs des ratios (comme `dataset_cleaned.csv`)
+
+
+class RawFeatureTransform:
+    """
+    📄 **Description :**
+    - Transforme des colonnes brutes (dict nom → tableau) en features du modèle.
+    - Tout est vectorisé sur le lot : une opération numpy par étape et par colonne.
+    - Les features non dérivées (indicateurs `property_type_*`, …) sont reprises
+      telles quelles depuis l'entrée.
+    ⚠️ Lève `ValueError` si les paramètres ne suivent pas `MODEL_RECIPE`
+    (ex. paramètres du script historique, autre espace de features).
+    """
+
+    def __init__(self, params):
+        if params.get("recipe") != MODEL_RECIPE:
+            raise ValueError(f"❌ Paramètres de prétraitement de recette {params.get('recipe')!r} "
+                             f"(attendu : {MODEL_RECIPE!r}, voir `fit_model_features`).")
+        self.medians = params["medians"]
+        self.bounds = params["bounds"]
+        self.continuous_cols = params["continuous_cols"]
+        self.scaler_mean = np.asarray(params["scaler_mean"], dtype=np.float64)
+        self.scaler_scale = np.asarray(params["scaler_scale"], dtype=np.float64)
+
+    def derive(self, columns):
+        """🧮 Retourne le dict des features dérivées (et des cibles fournies) à partir des colonnes brutes."""
+        raw, imputed = {}, {}
+        for col in RAW_INPUT_COLUMNS + [col for col in TARGET_COLUMNS if col in columns]:
+            values = np.asarray(columns[col], dtype=np.float64)
+            if col in self.medians:
+                values = np.where(np.isnan(values), self.medians[col], values)
+            imputed[col] = values
+            raw[col] = np.clip(values, *self.bounds[col]) if col in self.bounds else values
+
+        derived = {
+            "site_energy_use": raw["site_energy_use"],
+            "site_eui": raw["site_eui"],
+            "electricity_ratio": raw["electricity_kbtu"] / (raw["site_energy_use"] + EPSILON),
+            "gas_ratio": raw["natural_gas_kbtu"] / (raw["site_energy_use"] + EPSILON),
+            "f_is_large_building": (raw["gfa_total"] > 100000).astype(np.float64),
+            "building_density": raw["gfa_total"] / (raw["num_floors"] + EPSILON),
+            "f_has_natural_gas": (imputed["natural_gas_kbtu"] > 0).astype(np.float64),  # Avant bornage
+            **add_bins(raw),
+            **{col: raw[col] for col in TARGET_COLUMNS if col in raw},
+        }
+        for position, col in enumerate(self.continuous_cols):
+            if col in derived:
+                derived[col] = (derived[col] - self.scaler_mean[position]) / self.scaler_scale[position]
+        return derived
+
+    def to_matrix(self, columns, features):
+        """
+        📐 Assemble la matrice `(n, len(features))` consommée par le runner.
+        ⚠️ Lève `ValueError` si une colonne brute ou une feature non dérivée manque.
+        """
+        missing = [col for col in RAW_INPUT_COLUMNS if col not in columns]
+        if missing:
+            raise ValueError(f"❌ Colonnes brutes manquantes : {missing}")
+        derived = self.derive(columns)
+        passthrough = [f for f in features if f not in DERIVED_FEATURES and f not in columns]
+        if passthrough:
+            raise ValueError(f"❌ Features non dérivées à fournir : {passthrough}")
+
+        n_rows = len(derived["site_energy_use"])
+        matrix = np.empty((n_rows, len(features)), dtype=np.float64)
+        for position, feature in enumerate(features):
+            matrix[:, position] = derived[feature] if feature in derived else np.asarray(columns[feature], dtype=np.float64)
+        return matrix
+
+
+def transform_for(params):
+    """🏗️ Transformation d'un modèle enregistré, ou None (paramètres absents ou d'une autre recette)."""
+    if not params or params.get("recipe") != MODEL_RECIPE:
+        return None
+    return RawFeatureTransform(params)
+
+
+def required_columns(features):
+    """📋 Colonnes à envoyer pour un modèle : colonnes brutes + features non dérivées."""
+    return RAW_INPUT_COLUMNS + [f for f in features if f not in DERIVED_FEATURES and f not in RAW_INPUT_COLUMNS]
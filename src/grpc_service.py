@@ -0,0 +1,144 @@
+# ============================================================
+# 📡 Interface gRPC des prédictions (src/grpc_service.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Servir les appelants internes à fort débit
+#     en protobuf (doubles packés) sur HTTP/2, à côté des API JSON.
+# 📌 **Principe :**
+#     - Un servicer `Prediction` (src/protos/prediction.proto) est
+#       monté sur le service BentoML : il partage ses runners, son
+#       cache et sa validation avec les endpoints JSON.
+#     - `Predict` : unaire ; `PredictStream` : flux bidirectionnel, les
+#       messages en attente (≤ `GRPC_STREAM_WINDOW`) sont prédits ensemble,
+#       réponses dans l'ordre d'arrivée.
+# 🚀 **Lancement :**
+#     ➔ bentoml serve-grpc src.service:EnergyCO2PredictionService --port 50051
+# ============================================================
+
+import asyncio  # Fenêtre de messages en vol sur un flux
+from functools import partial  # BentoML instancie le servicer sans argument
+import numpy as np  # Décodage des doubles packés
+from loguru import logger  # Gestion avancée et lisible des logs
+from src.protos import prediction_pb2, prediction_pb2_grpc  # Stubs générés (voir prediction.proto)
+from src.prediction_cache import predict_with_cache  # Cache LRU/TTL partagé avec les endpoints JSON
+from src.hot_swap import select_slot  # Modèle complet ou variante (`variant`)
+from src.observability import timed, sample_request_log  # Métriques et logs échantillonnés
+from src.config import RUNNER_MAX_BATCH_SIZE, GRPC_STREAM_WINDOW
+
+SERVICE_NAME = prediction_pb2.DESCRIPTOR.services_by_name["Prediction"].full_name
+
+
+class GrpcTarget:
+    """
+    📄 **Description :**
+    - Ce qu'un `target` gRPC ("energy", "co2") réutilise du service JSON :
+      emplacements du modèle complet et des variantes (`ModelSlot` : version
+      servie, validateur, runner) et cache.
+    """
+
+    def __init__(self, slots, cache):
+        self.slots = slots
+        self.cache = cache
+
+
+class PredictionServicer(prediction_pb2_grpc.PredictionServicer):
+    """
+    📄 **Description :**
+    - Décode les features packées en matrice float64, valide, puis passe par
+      `predict_with_cache` : gRPC et JSON partagent le micro-batching du runner.
+    - Sur un flux, les messages déjà arrivés (jusqu'à `stream_window`) sont
+      regroupés en une seule matrice par cible : un appel runner par groupe.
+    - Les erreurs sont renvoyées dans le champ `error` (le flux continue).
+    """
+
+    def __init__(self, targets, stream_window=GRPC_STREAM_WINDOW):
+        self.targets = targets
+        self.stream_window = stream_window
+
+    async def Predict(self, request, context):
+        return (await self._predict_many([request], "grpc_predict"))[0]
+
+    async def PredictStream(self, request_iterator, context):
+        # 🔄 La lecture continue pendant la prédiction ; la file bornée applique la contre-pression
+        pending = asyncio.Queue(maxsize=self.stream_window)
+
+        async def read():
+            try:
+                async for request in request_iterator:
+                    await pending.put(request)
+            except asyncio.CancelledError:
+                raise  # 🛑 Flux quitté par le consommateur : personne ne viderait la file, pas de sentinelle
+            except Exception as e:
+                logger.error(f"❌ Erreur de lecture du flux gRPC : {str(e)}")
+            await pending.put(None)  # 🏁 Fin d'entrée : le consommateur vide la file jusqu'à la sentinelle
+
+        reader = asyncio.ensure_future(read())
+        try:
+            finished = False
+            while not finished:
+                request = await pending.get()
+                if request is None:
+                    break
+                group = [request]
+                while not pending.empty() and len(group) < self.stream_window:
+                    request = pending.get_nowait()
+                    if request is None:
+                        finished = True
+                        break
+                    group.append(request)
+                for response in await self._predict_many(group, "grpc_predict_stream"):
+                    yield response
+        finally:
+            reader.cancel()
+
+    async def _predict_many(self, requests, endpoint):
+        """🧮 Valide chaque message, empile les matrices par cible, un appel runner par cible."""
+        responses = [None] * len(requests)
+        grouped = {}  # (cible, variante) → [(position, matrice)]
+        versions = {}  # (cible, variante) → version servie, lue une fois pour tout le groupe
+        for position, request in enumerate(requests):
+            try:
+                target = self.targets.get(request.target)
+                if target is None:
+                    raise ValueError(f"❌ Cible inconnue '{request.target}' (attendu : {sorted(self.targets)}).")
+                group = (request.target, request.variant)
+                version = versions.get(group) or versions.setdefault(
+                    group, select_slot(target.slots, request.variant).acquire())
+                with timed(endpoint, "validation"):
+                    values = np.fromiter(request.features, dtype=np.float64, count=len(request.features))
+                    grouped.setdefault(group, []).append(
+                        (position, version.validator.validate_flat(values, request.n_rows)))
+            except Exception as e:
+                responses[position] = self._error(request, e)
+
+        for group, items in grouped.items():
+            target, version = self.targets[group[0]], versions[group]
+            try:
+                matrix = np.vstack([m for _, m in items]) if len(items) > 1 else items[0][1]
+                with timed(endpoint, "drift_stats"):
+                    version.observe(matrix)  # 📡 Statistiques des entrées servies
+                predictions = await predict_with_cache(target.cache, version.runner_method, matrix, version.tag,
+                                                       RUNNER_MAX_BATCH_SIZE, endpoint=endpoint)
+                with timed(endpoint, "serialization"):
+                    offsets = np.cumsum([len(m) for _, m in items])[:-1]
+                    for (position, _), chunk in zip(items, np.split(predictions.astype(float), offsets)):
+                        responses[position] = prediction_pb2.PredictResponse(
+                            predictions=chunk, model_tag=str(version.tag), request_id=requests[position].request_id)
+            except Exception as e:
+                for position, _ in items:
+                    responses[position] = self._error(requests[position], e)
+
+        if sample_request_log():
+            logger.info(f"📡 gRPC : {len(requests)} message(s), cibles {sorted(grouped)}.")
+        return responses
+
+    @staticmethod
+    def _error(request, error):
+        logger.error(f"❌ Erreur gRPC : {str(error)}")
+        return prediction_pb2.PredictResponse(error=str(error), request_id=request.request_id)
+
+
+def mount_prediction_servicer(service, targets):
+    """🔌 Monte le servicer `Prediction` sur un `bentoml.Service` (utilisé par `serve-grpc`)."""
+    service.mount_grpc_servicer(partial(PredictionServicer, targets),
+                                add_servicer_fn=prediction_pb2_grpc.add_PredictionServicer_to_server,
+                                service_names=[SERVICE_NAME])
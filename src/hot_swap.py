@@ -0,0 +1,197 @@
+# ============================================================
+# ♻️ Remplacement à chaud des modèles (src/hot_swap.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Servir un modèle ré-entraîné sans redémarrer le
+#     service (ni perdre les requêtes en vol, ni rejouer le démarrage).
+# 📌 **Principe :**
+#     - Côté API, `ModelSlot.current` est un instantané immuable
+#       (`ModelVersion` : tag, features, validateur, transformation,
+#       méthode du runner liée à la version). Un endpoint le lit UNE
+#       fois et l'utilise jusqu'à la réponse : le remplacement est une
+#       simple réaffectation d'attribut, donc atomique.
+#     - Chaque ligne envoyée au runner porte la clé de sa version
+#       (`version_key(tag)`) : le runnable garde l'ancien et le nouveau
+#       modèle, prédit chaque ligne avec le sien, puis libère l'ancien
+#       une fois inutilisé pendant `HOT_SWAP_DRAIN_SECONDS` (src/runners.py).
+#     - Nouvelle version détectée en surveillant le store (`<nom>:latest`,
+#       au plus toutes les `HOT_SWAP_POLL_SECONDS`, en tâche de fond
+#       déclenchée par le trafic) ou forcée par l'endpoint d'admin
+#       `/reload_<cible>_model`.
+#     - Bascule seulement après chauffe : une ligne sonde passe par le
+#       runner avec la nouvelle clé (chargement + première prédiction).
+# 🪶 Un service tient un emplacement par modèle servi : le modèle complet
+#     (`FULL_MODEL`) et ses variantes allégées (src/variants.py) ;
+#     `select_slot` choisit celui demandé par la requête.
+# ============================================================
+
+import asyncio  # Chargement et chauffe en tâche de fond
+import hashlib  # Clé numérique stable d'un tag
+import time
+import bentoml  # Store de modèles
+import numpy as np  # Lignes sonde et clés par ligne
+from loguru import logger  # Gestion avancée et lisible des logs
+from src.validation import FeatureValidator  # Validation propre à chaque version
+from src.feature_transform import transform_for  # Attributs bruts → features
+from src.drift import DriftMonitor  # Statistiques des entrées servies par version
+from src.config import FEATURE_RANGE_MARGIN, VALIDATION_MAX_ERRORS, HOT_SWAP_POLL_SECONDS
+
+
+FULL_MODEL = "full"  # Nom de l'emplacement du modèle complet
+
+
+def version_key(tag):
+    """🔑 Entier 64 bits stable dérivé du tag (transmis au runner à côté de chaque ligne)."""
+    return int(np.frombuffer(hashlib.blake2b(str(tag).encode(), digest_size=8).digest(), dtype="<i8")[0])
+
+
+class VersionedRunnerMethod:
+    """🏃 `runner.predict` lié à une version : même interface `async_run(matrix)` que la méthode brute."""
+
+    def __init__(self, runner_method, tag):
+        self.runner_method = runner_method
+        self.key = version_key(tag)
+
+    async def async_run(self, matrix):
+        keys = np.full(len(matrix), self.key, dtype=np.int64)
+        return await self.runner_method.async_run(matrix, keys)
+
+
+class ModelVersion:
+    """
+    📄 **Description :**
+    - Tout ce qu'un endpoint utilise d'un modèle, figé à la construction.
+    - `drift` : statistiques des entrées servies par cette version (src/drift.py) ;
+      une nouvelle version repart de zéro.
+    - `runner_method` envoie les lignes au runner avec la clé de cette version ;
+      `bulk_method` de même, pour une grande matrice hors micro-batching
+      (défaut : `runner_method`) ; `explain_method` pour les attributions (None : indisponibles,
+      ou modèle enregistré avec `metadata["explainable"] = False`).
+    """
+
+    def __init__(self, model_ref, runner_method, margin=FEATURE_RANGE_MARGIN, max_errors=VALIDATION_MAX_ERRORS,
+                 bulk_method=None, explain_method=None):
+        custom_objects = model_ref.custom_objects
+        self.tag = model_ref.tag
+        self.features = list(custom_objects.get("features", []))
+        self.validator = FeatureValidator(self.features, custom_objects.get("feature_ranges"),
+                                          margin=margin, max_errors=max_errors)
+        self.transform = transform_for(custom_objects.get("preprocessing"))  # None : `*_raw` indisponible
+        self.runner_method = VersionedRunnerMethod(runner_method, self.tag)
+        reference = custom_objects.get("drift_reference")
+        self.drift = DriftMonitor(self.tag.name, self.features, reference) if reference else None
+        self.bulk_method = VersionedRunnerMethod(bulk_method or runner_method, self.tag)
+        metadata = getattr(getattr(model_ref, "info", None), "metadata", None) or {}
+        explainable = explain_method is not None and metadata.get("explainable", True)
+        self.explain_method = VersionedRunnerMethod(explain_method, self.tag) if explainable else None
+
+    def observe(self, matrix):
+        """📡 Ajoute les lignes validées d'une requête aux statistiques de dérive (modèle enregistré sans référence : rien)."""
+        if self.drift is not None:
+            self.drift.observe(matrix)
+
+    def drift_report(self):
+        """📊 Scores de dérive de cette version ("no_reference" si enregistrée sans référence)."""
+        if self.drift is None:
+            return {"model_tag": str(self.tag), "status": "no_reference"}
+        return {"model_tag": str(self.tag), **self.drift.report()}
+
+    def probe(self):
+        """🧪 Ligne sonde valide : milieu des plages (0 borné si une plage est infinie)."""
+        lower, upper = self.validator.lower, self.validator.upper
+        with np.errstate(invalid="ignore"):
+            middle = (lower + upper) / 2
+        return np.where(np.isfinite(middle), middle, np.clip(0.0, lower, upper)).reshape(1, -1)
+
+
+class ModelSlot:
+    """
+    📄 **Description :**
+    - Emplacement d'un modèle servi (`name` : nom dans le store BentoML).
+    - `acquire()` : instantané à utiliser pour une requête ; planifie au
+      passage une vérification du store si la dernière date de plus de
+      `poll_seconds` (0 : surveillance désactivée, admin seulement).
+    - `reload(tag)` : charge, chauffe puis bascule ; une seule à la fois.
+    """
+
+    def __init__(self, name, runner_method, model_ref, poll_seconds=HOT_SWAP_POLL_SECONDS, bulk_method=None,
+                 explain_method=None):
+        self.name = name
+        self.runner_method = runner_method
+        self.methods = {"bulk_method": bulk_method, "explain_method": explain_method}
+        self.current = ModelVersion(model_ref, runner_method, **self.methods)
+        self.poll_seconds = poll_seconds
+        self.swaps = 0
+        self.last_error = None
+        self._last_poll = time.monotonic()
+        self._lock = None  # asyncio.Lock créé dans la boucle du service
+        self._task = None
+
+    def acquire(self):
+        """🔒 Instantané courant (à lire une seule fois par requête)."""
+        if self.poll_seconds > 0 and time.monotonic() - self._last_poll >= self.poll_seconds:
+            self._last_poll = time.monotonic()
+            if self._task is None or self._task.done():
+                self._task = asyncio.get_running_loop().create_task(self._poll())
+        return self.current
+
+    async def _poll(self):
+        """🔁 Vérification de fond : l'échec est journalisé par `reload`, la version servie reste."""
+        try:
+            await self.reload()
+        except Exception:
+            pass
+
+    async def reload(self, tag=None):
+        """
+        📄 **Description :**
+        - Résout `tag` (défaut : `<name>:latest`) ; rien à faire si c'est la version servie.
+        - Construit la nouvelle version hors de la boucle, la chauffe par une ligne
+          sonde envoyée au runner, puis remplace `current` (réaffectation atomique).
+        - L'ancienne version reste utilisée par les requêtes déjà en cours ; le runner
+          la libère une fois drainée. En cas d'échec, la version servie est conservée.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            try:
+                model_ref = await asyncio.to_thread(bentoml.models.get, tag or f"{self.name}:latest")
+                if model_ref.tag == self.current.tag:
+                    return {"swapped": False, "model_tag": str(self.current.tag)}
+                start = time.perf_counter()
+                candidate = await asyncio.to_thread(ModelVersion, model_ref, self.runner_method, **self.methods)
+                warm = np.asarray(await candidate.runner_method.async_run(candidate.probe()))
+                if warm.shape != (1,) or not np.isfinite(warm).all():
+                    raise ValueError(f"❌ Prédiction de chauffe invalide : {warm!r}")
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"❌ Remplacement de {self.name} refusé ({tag or 'latest'}) : {e}")
+                raise
+
+            previous, self.current = self.current, candidate
+            self.swaps += 1
+            self.last_error = None
+            elapsed = time.perf_counter() - start
+            logger.info(f"♻️ {self.name} : {previous.tag} → {candidate.tag} (chargé et chauffé en {elapsed:.2f} s)")
+            return {"swapped": True, "model_tag": str(candidate.tag), "previous_tag": str(previous.tag),
+                    "warmup_s": elapsed}
+
+    def status(self):
+        """📊 Version servie et compteurs de remplacement."""
+        return {"model_tag": str(self.current.tag), "swaps": self.swaps, "last_error": self.last_error,
+                "poll_seconds": self.poll_seconds}
+
+
+# ============================================================
+# 🪶 Choix du modèle complet ou d'une variante par requête
+# ============================================================
+def variant_of(payload):
+    """🔎 Variante demandée dans un corps JSON (`"variant"`), None sinon."""
+    return payload.get("variant") if isinstance(payload, dict) else None
+
+
+def select_slot(slots, variant=None):
+    """🪶 Emplacement du modèle complet (`variant` vide) ou de la variante demandée ; ValueError si non servie."""
+    slot = slots.get(variant or FULL_MODEL)
+    if slot is None:
+        raise ValueError(f"❌ Variante non servie : {variant} (disponibles : {sorted(slots)}).")
+    return slot
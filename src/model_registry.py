@@ -0,0 +1,97 @@
+# ============================================================
+# 💾 Enregistrement des modèles dans le Model Store BentoML (src/model_registry.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Un seul chemin d'enregistrement pour les pickles
+#     existants (register_models_bentoml.py) et les modèles ré-entraînés
+#     (src/training.py).
+# 📌 **Contenu enregistré avec le modèle :**
+#     - `custom_objects` : features, paramètres de prétraitement,
+#       plages des features (validation des requêtes), statistiques de
+#       référence pour la surveillance de dérive (src/drift.py)
+#     - `metadata` : métriques, hyperparamètres, lignée…
+#     - tables de nœuds `.npy` (backend "flat_trees") si la compilation
+#       reproduit `predict` à 1e-9 près
+# ============================================================
+
+import json  # Paramètres de prétraitement persistés
+import numpy as np  # Contrôle de parité
+from loguru import logger  # Gestion avancée et lisible des logs
+from src.tree_compiler import compile_tree_ensemble, FLAT_TREES_DIR  # Tables de nœuds
+from src.validation import feature_ranges  # Plages observées à l'entraînement
+from src.drift import reference_stats  # Référence de la surveillance de dérive
+from src.profiling import stage  # Balises du profilage opt-in (src/profiling.py)
+from src.config import MODEL_FEATURES_PARAMS_PATH
+
+# 📦 Signature batchable : autorise le micro-batching adaptatif
+#    des runners (requêtes concurrentes regroupées sur l'axe 0)
+BATCHABLE_SIGNATURES = {"predict": {"batchable": True, "batch_dim": 0}}
+
+
+def load_preprocessing_params():
+    """🏗️ Paramètres de l'espace des features des modèles (`fit_model_features`, None si absents)."""
+    if not MODEL_FEATURES_PARAMS_PATH.exists():
+        logger.warning("⚠️ Paramètres de l'espace des features absents : lancer preprocess_data_for_models.py "
+                       "pour activer les endpoints `*_raw` des services.")
+        return None
+    return json.loads(MODEL_FEATURES_PARAMS_PATH.read_text())
+
+
+def compile_with_parity_check(model, features, name, data=None):
+    """
+    🌲 Compile le modèle en tables de nœuds et vérifie la parité avec `predict`
+    sur `data` ; retourne None (repli sklearn) si non pris en charge.
+    """
+    try:
+        ensemble = compile_tree_ensemble(model)
+        if data is not None:
+            X = data[list(features)].to_numpy(dtype=np.float64)
+            gap = np.max(np.abs(ensemble.predict(X) - model.predict(X)))
+            if gap > 1e-9:
+                raise ValueError(f"écart de parité {gap:.3g} sur {len(X)} lignes")
+            logger.info(f"🌲 {name} : {ensemble.n_trees} arbres, {ensemble.n_nodes} nœuds, écart max {gap:.1e}")
+        return ensemble
+    except ValueError as e:
+        logger.warning(f"⚠️ {name} non compilé ({e}) : seul le backend sklearn sera disponible.")
+        return None
+
+
+def register_model(name, model, features, data=None, preprocessing=None, metadata=None, labels=None, ranges=None,
+                   drift_reference=None):
+    """
+    📄 **Description :**
+    - Enregistre `model` sous `name` (nouvelle version, `:latest` mis à jour).
+    - `data` : DataFrame d'entraînement (plages des features + parité des tables).
+    - `ranges` : plages déjà calculées (ex. fusion historique + nouvelles lignes).
+    - `drift_reference` : référence de dérive déjà calculée (défaut : depuis `data`).
+    - Retourne le `bentoml.Model` enregistré.
+    """
+    import bentoml  # Import paresseux : module utilisable sans le store (tests)
+
+    n_rows = len(data) if data is not None else None
+    if ranges is None and data is not None:
+        with stage("feature_ranges", rows=n_rows):
+            ranges = feature_ranges(data, features)
+    if ranges is None:
+        logger.warning(f"⚠️ {name} : données d'entraînement absentes, les services ne contrôleront que la finitude.")
+    if drift_reference is None and data is not None:
+        with stage("drift_reference", rows=n_rows):
+            drift_reference = reference_stats(data, features)
+    with stage("tree_compilation", rows=n_rows):
+        ensemble = compile_with_parity_check(model, features, name, data)
+
+    with stage("model_save"):
+        saved = bentoml.sklearn.save_model(
+            name,
+            model,
+            signatures=BATCHABLE_SIGNATURES,
+            custom_objects={"features": list(features), "preprocessing": preprocessing, "feature_ranges": ranges,
+                            "drift_reference": drift_reference},
+            metadata=metadata or {},
+            labels=labels or {},
+        )
+        # 🌲 Tables de nœuds écrites en `.npy` dans le répertoire du modèle :
+        #    chargées par mmap par les runners "flat_trees" (aucun dépicklage)
+        if ensemble is not None:
+            ensemble.save(saved.path_of(FLAT_TREES_DIR))
+            logger.info(f"🌲 Tables de nœuds enregistrées pour {saved.tag}")
+    return saved
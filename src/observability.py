@@ -0,0 +1,114 @@
+# ============================================================
+# 📈 Instrumentation du chemin critique (src/observability.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Savoir où passe le temps d'une requête sans
+#     ralentir le service avec des logs texte.
+# 📌 **Contenu :**
+#     - ⏱️ Histogramme Prometheus `prediction_stage_duration_seconds`
+#       (labels `endpoint`, `stage`), exposé sur `/metrics` :
+#         validation        → contrôle et conversion de l'entrée (validateurs)
+#         array_conversion  → construction de la matrice dans l'endpoint
+#         drift_stats       → statistiques de dérive des entrées (src/drift.py)
+#         cache_lookup      → hachage des lignes et lecture du cache
+#         runner_round_trip → attente dans la file du runner + transfert + calcul
+#         model_compute     → calcul du modèle seul (mesuré dans le runner)
+#         serialization     → conversion des prédictions en réponse JSON
+#       ➔ attente file du runner ≈ runner_round_trip − model_compute
+#     - 📡 Jauges `feature_drift_psi` / `feature_drift_observations`
+#       (surveillance de dérive, src/drift.py).
+#     - 🔌 Hors `bentoml serve` (scoring, gRPC, tests), pas de répertoire
+#       multiprocess Prometheus : les métriques deviennent des no-op.
+#     - 📝 Logs : sink loguru asynchrone + échantillonnage des logs INFO
+#       par requête (`LOG_SAMPLE_EVERY`).
+# ============================================================
+
+import itertools  # Compteur atomique (GIL) pour l'échantillonnage
+import os
+import sys
+import time
+from contextlib import contextmanager
+import bentoml  # Métriques Prometheus partagées entre workers (multiprocess)
+from bentoml._internal.configuration.containers import BentoMLContainer  # Répertoire multiprocess du worker
+from loguru import logger  # Gestion avancée et lisible des logs
+from src.config import LOG_LEVEL, LOG_ASYNC, LOG_SAMPLE_EVERY
+
+# ⏱️ Bornes adaptées à des étapes de quelques µs à quelques secondes
+STAGE_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+stage_duration = bentoml.metrics.Histogram(
+    name="prediction_stage_duration_seconds",
+    documentation="Durée de chaque étape d'une prédiction (secondes).",
+    labelnames=["endpoint", "stage"],
+    buckets=STAGE_BUCKETS,
+)
+
+# 📡 Dérive des entrées servies (src/drift.py), publiée périodiquement par worker
+drift_psi = bentoml.metrics.Gauge(
+    name="feature_drift_psi",
+    documentation="PSI entre les entrées servies et la référence d'entraînement, par feature.",
+    labelnames=["model", "feature"],
+)
+drift_observations = bentoml.metrics.Gauge(
+    name="feature_drift_observations",
+    documentation="Nombre de lignes observées pour la surveillance de dérive.",
+    labelnames=["model"],
+)
+
+
+_metrics_enabled = None
+
+
+def metrics_enabled():
+    """
+    📡 Vrai si le répertoire multiprocess Prometheus existe.
+    `bentoml serve` le crée et le transmet à chaque worker (`--prometheus-dir`) ;
+    ailleurs, `bentoml.metrics` lèverait une AssertionError à la première mesure.
+    Résolu à la première mesure (après la configuration du worker), puis mémorisé.
+    """
+    global _metrics_enabled
+    if _metrics_enabled is None:
+        _metrics_enabled = os.path.isdir(BentoMLContainer.prometheus_multiproc_dir.get())
+    return _metrics_enabled
+
+
+@contextmanager
+def timed(endpoint, stage):
+    """⏱️ Observe la durée du bloc dans `prediction_stage_duration_seconds` (no-op hors service)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics_enabled():
+            stage_duration.labels(endpoint=endpoint, stage=stage).observe(time.perf_counter() - start)
+
+
+# ============================================================
+# 📝 Logs hors du chemin critique
+# ============================================================
+class LogSampler:
+    """🎲 Vrai une fois toutes les `every` requêtes (déterministe, sans aléa)."""
+
+    def __init__(self, every):
+        self.every = max(1, int(every))
+        self.counter = itertools.count()
+
+    def __call__(self):
+        return next(self.counter) % self.every == 0
+
+
+sample_request_log = LogSampler(LOG_SAMPLE_EVERY)
+_logging_configured = False
+
+
+def configure_service_logging():
+    """
+    📝 Remplace le sink stderr synchrone de loguru par un sink asynchrone
+    (`enqueue=True` : l'écriture se fait dans un thread dédié).
+    Idempotent : les services Énergie, CO₂ et combiné peuvent tous l'appeler.
+    """
+    global _logging_configured
+    if _logging_configured:
+        return
+    logger.remove()
+    logger.add(sys.stderr, level=LOG_LEVEL, enqueue=LOG_ASYNC, backtrace=False, diagnose=False)
+    _logging_configured = True
@@ -0,0 +1,128 @@
+# ============================================================
+# 🗃️ Cache des prédictions par vecteur de features (src/prediction_cache.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Ne pas solliciter le runner pour des lignes
+#     déjà prédites (tableaux de bord qui rejouent les mêmes bâtiments).
+# 📌 **Fonctionnement :**
+#     - 🔑 Clé = hash blake2b(tag du modèle + octets float64 de la ligne) :
+#       un nouveau `:latest` change le tag, donc toutes les clés.
+#     - ♻️ Éviction LRU dans un budget mémoire borné + expiration TTL.
+#     - 📊 Compteurs de hits / misses exposés par les services.
+#     - 🔍 `width` : une valeur vectorielle par ligne (attributions
+#       par feature des endpoints `/explain_*`, src/explain.py).
+# ⚠️ Un cache par worker API (pas de partage entre processus).
+# ============================================================
+
+import hashlib  # Hash rapide des lignes
+import time  # Horodatage pour l'expiration TTL
+from collections import OrderedDict  # Ordre LRU
+import numpy as np  # Manipulation numérique efficace
+from src.batching import predict_in_chunks  # Prédiction des lignes absentes du cache
+from src.observability import timed  # Durées cache_lookup / runner_round_trip
+
+# 📏 Estimation prudente de la mémoire d'une entrée :
+#    clé bytes(16) + tuple(expiration, prédiction) + nœud d'OrderedDict
+ENTRY_BYTES = 256
+ARRAY_BYTES = 112  # En-tête d'un ndarray (entrées vectorielles, + 8 octets par valeur)
+
+
+class PredictionCache:
+    """
+    📄 **Description :**
+    - Cache LRU + TTL de prédictions, une entrée par ligne de features :
+      un scalaire, ou un vecteur (`width` : taille prévue pour le budget mémoire).
+    - `max_bytes` borne la mémoire (≈ `max_bytes // ENTRY_BYTES` entrées scalaires).
+    - `max_bytes = 0` désactive le cache (toutes les lignes sont des misses).
+    """
+
+    def __init__(self, max_bytes, ttl_seconds, width=None):
+        self.width = width
+        self.entry_bytes = ENTRY_BYTES if width is None else ENTRY_BYTES + ARRAY_BYTES + 8 * width
+        self.max_entries = max_bytes // self.entry_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    # 🔑 Une clé par ligne : le hash démarre sur le tag du modèle puis absorbe la ligne
+    def keys_for(self, matrix, model_tag):
+        rows = np.ascontiguousarray(matrix, dtype="<f8")
+        seeded = hashlib.blake2b(str(model_tag).encode(), digest_size=16)
+        keys = []
+        for row in rows:
+            hasher = seeded.copy()
+            hasher.update(row)
+            keys.append(hasher.digest())
+        return keys
+
+    def get_many(self, keys, width=None):
+        """🔍 Retourne (valeurs, masque des misses) ; NaN pour les lignes absentes (vecteurs de `width`)."""
+        width = width or self.width
+        values = np.full(len(keys) if width is None else (len(keys), width), np.nan)
+        missing = np.ones(len(keys), dtype=bool)
+        now = time.monotonic()
+        for position, key in enumerate(keys):
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            expires_at, value = entry
+            if expires_at < now:
+                del self._entries[key]
+                continue
+            self._entries.move_to_end(key)
+            values[position] = value
+            missing[position] = False
+
+        n_hits = int(len(keys) - missing.sum())
+        self.hits += n_hits
+        self.misses += len(keys) - n_hits
+        return values, missing
+
+    def put_many(self, keys, values):
+        """💾 Insère les prédictions puis évince les plus anciennes au-delà du budget."""
+        if self.max_entries == 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        for key, value in zip(keys, values):
+            self._entries[key] = (expires_at, float(value) if np.ndim(value) == 0 else np.array(value, dtype=np.float64))
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        """📊 Compteurs exposés par les endpoints `*_cache_stats`."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "approx_bytes": len(self._entries) * self.entry_bytes,
+        }
+
+
+# ============================================================
+# 🏃 Prédiction d'une matrice en passant par le cache
+# ============================================================
+async def predict_with_cache(cache, runner_method, matrix, model_tag, max_batch_size, endpoint="predict", width=None):
+    """
+    📄 **Description :**
+    - Sert depuis le cache les lignes déjà connues pour ce tag de modèle.
+    - N'envoie au runner que les lignes manquantes (découpées par `predict_in_chunks`).
+    - Retourne toutes les prédictions dans l'ordre des lignes (`width` : vecteur par ligne).
+    - ⏱️ Étapes `cache_lookup` et `runner_round_trip` mesurées sous le label `endpoint`.
+    """
+    if cache.max_entries == 0:
+        with timed(endpoint, "runner_round_trip"):
+            return await predict_in_chunks(runner_method, matrix, max_batch_size)
+
+    with timed(endpoint, "cache_lookup"):
+        keys = cache.keys_for(matrix, model_tag)
+        values, missing = cache.get_many(keys, width)
+    if missing.any():
+        with timed(endpoint, "runner_round_trip"):
+            predicted = await predict_in_chunks(runner_method, matrix[missing], max_batch_size)
+        values[missing] = predicted
+        cache.put_many([key for key, miss in zip(keys, missing) if miss], predicted)
+    return values
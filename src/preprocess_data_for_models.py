@@ -9,153 +9,134 @@
 #     - Étapes commentées par sections numérotées
 #     - 🔍 **Astuce** : `RAW_DATA_PATH` correspond au chemin du fichier CSV brut
 #       initial, contenant toutes les données sources à transformer.
+#     - 🌊 Traitement en flux par morceaux (`PREPROCESSING_CHUNKSIZE`) :
+#       la logique des étapes vit dans `src/preprocessing.py`.
+#     - 🎯 Ajuste aussi l'espace des features des modèles servis
+#       (recette de `dataset_cleaned.csv`) : paramètres embarqués avec les
+#       modèles par register_models_bentoml.py (endpoints `*_raw`).
+#     - ♻️ `--append NOUVEAU.csv` : seules les nouvelles lignes sont
+#       transformées, avec les paramètres persistés, puis ajoutées aux
+#       datasets existants (aucun réajustement sur l'historique) ; leurs
+#       features des modèles + cibles sont aussi écrites dans
+#       `data/processed/NOUVEAU_model_features.csv` (entrée de
+#       `training.py --incremental`).
+#     - 🔬 `--profile` (ou `PIPELINE_PROFILE=1`) : temps, pic mémoire et
+#       débit par étape + profil cProfile dans `logs/profile_preprocessing*`
+#       (src/profiling.py).
 # ============================================================
 
-import pandas as pd
-import numpy as np
-from sklearn.preprocessing import StandardScaler, OrdinalEncoder
+import argparse
+import atexit
+import sys
+import joblib  # Features finales des modèles (mode --append)
+from contextlib import ExitStack
+from pathlib import Path
 from loguru import logger
-from config import (
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))  # 🔗 Racine du projet (import `src.*`)
+
+from src.config import (
     RAW_DATA_PATH,  # 🔍 Fichier CSV brut initial importé pour transformation
+    PROCESSED_DIR,
     PROCESSED_ENERGY_PATH,
     PROCESSED_CO2_PATH,
-    RANDOM_STATE
+    PREPROCESSING_PARAMS_PATH,
+    MODEL_FEATURES_PARAMS_PATH,
+    ENERGY_FEATURES_PATH,
+    CO2_FEATURES_PATH,
+    PREPROCESSING_CHUNKSIZE,
+    PIPELINE_PROFILE
 )
+from src.preprocessing import (fit_preprocessing, fit_model_features, transform_to_files, transform_model_features,
+                               FittedPreprocessing)
+from src.datasets import export_columnar
+from src.profiling import profiling
 
-# ============================================================
-# 2️⃣ Chargement des données initiales
-# ============================================================
-logger.info(f"📂 Chargement des données depuis : {RAW_DATA_PATH} (fichier brut initial)")
-try:
-    df = pd.read_csv(RAW_DATA_PATH)
-    logger.info("✅ Données initiales chargées avec succès.")
-except FileNotFoundError:
-    logger.error("❌ Fichier introuvable. Vérifiez le chemin dans config.py.")
-    raise
+parser = argparse.ArgumentParser(description="Prétraitement des données pour les modèles Énergie et CO₂.")
+parser.add_argument("--append", type=Path, default=None,
+                    help="Nouveau fichier brut à transformer avec les paramètres persistés et à ajouter aux datasets.")
+parser.add_argument("--profile", action="store_true", default=PIPELINE_PROFILE,
+                    help="Profile chaque étape (temps, mémoire, débit) et écrit logs/profile_preprocessing*.")
+args = parser.parse_args()
 
-# ============================================================
-# 3️⃣ Renommage des colonnes principales
-# ============================================================
-logger.info("🔄 Renommage des colonnes nécessaires...")
-columns_mapping = {
-    "SiteEnergyUse(kBtu)": "site_energy_use",
-    "Electricity(kWh)": "electricity_kwh",
-    "Electricity(kBtu)": "electricity_kbtu",
-    "NaturalGas(kBtu)": "natural_gas_kbtu",
-    "SiteEUI(kBtu/sf)": "site_eui",
-    "PropertyGFATotal": "gfa_total",
-    "NumberofFloors": "num_floors",
-    "YearBuilt": "year_built"
-}
-df.rename(columns=columns_mapping, inplace=True)
-logger.info("✏️ Colonnes renommées avec succès.")
+# 🔬 Profilage opt-in : session fermée (profil écrit) à la sortie du script, même en cas d'erreur
+session = ExitStack()
+atexit.register(session.close)
+if args.profile:
+    session.enter_context(profiling("preprocessing_append" if args.append is not None else "preprocessing"))
 
 # ============================================================
-# 4️⃣ Imputation des valeurs manquantes
-# ============================================================
-logger.info("🩹 Imputation des valeurs manquantes...")
-medians = {
-    'site_energy_use': 2554947.25,
-    'electricity_kwh': 472415.34,
-    'electricity_kbtu': 1611881.0,
-    'natural_gas_kbtu': 498263.0,
-    'num_floors': 3,
-    'year_built': 1977,
-    'site_eui': 51.90,
-    'gfa_total': df["gfa_total"].median()
-}
-for col, median_val in medians.items():
-    df[col] = df[col].fillna(median_val)
-    logger.info(f"🩹 '{col}' imputée avec médiane : {median_val}.")
+# ♻️ Mode incrémental : nouvelles lignes seulement, paramètres figés
+# ============================================================
+if args.append is not None:
+    for params_path in (PREPROCESSING_PARAMS_PATH, MODEL_FEATURES_PARAMS_PATH):
+        if not params_path.exists():
+            logger.error(f"❌ Paramètres persistés introuvables ({params_path}) : lancer d'abord le mode complet.")
+            raise FileNotFoundError(params_path)
+    params = FittedPreprocessing.load(PREPROCESSING_PARAMS_PATH)
+    logger.info(f"♻️ Ajout de {args.append} avec les paramètres ajustés sur {params.n_rows} lignes...")
+    n_new = transform_to_files(args.append, params, co2_path=PROCESSED_CO2_PATH, energy_path=PROCESSED_ENERGY_PATH,
+                               chunksize=PREPROCESSING_CHUNKSIZE, append=True)
+    for path in (PROCESSED_CO2_PATH, PROCESSED_ENERGY_PATH):
+        export_columnar(path)  # 🗄️ Parquet / Feather régénérés à partir des CSV complétés (si pyarrow)
+
+    # 🎯 Espace des features des modèles servis : features des deux modèles + cibles, paramètres figés
+    model_features = list(dict.fromkeys(joblib.load(ENERGY_FEATURES_PATH) + joblib.load(CO2_FEATURES_PATH)))
+    increment_path = PROCESSED_DIR / f"{args.append.stem}_model_features.csv"
+    n_model = transform_model_features(args.append, FittedPreprocessing.load(MODEL_FEATURES_PARAMS_PATH),
+                                       increment_path, model_features, chunksize=PREPROCESSING_CHUNKSIZE)
+    logger.info(f"🚀 {n_new} nouvelles lignes ajoutées ({n_model} dans le périmètre des modèles). "
+                f"Ré-entraînement : python src/training.py --incremental {increment_path}")
+    sys.exit(0)
 
 # ============================================================
-# 5️⃣ Traitement des valeurs aberrantes (Winsorizing)
+# 2️⃣ Vérification des données initiales
 # ============================================================
-logger.info("📉 Traitement des valeurs aberrantes (Winsorizing)...")
-def winsorize(series, lower=0.01, upper=0.99):
-    lower_bound = series.quantile(lower)
-    upper_bound = series.quantile(upper)
-    logger.info(f"📊 '{series.name}' : bornes [{lower_bound}, {upper_bound}]")
-    return series.clip(lower=lower_bound, upper=upper_bound)
-
-cols_to_winsorize = ["site_energy_use", "electricity_kwh", "electricity_kbtu", "natural_gas_kbtu", "num_floors", "site_eui", "gfa_total"]
-for col in cols_to_winsorize:
-    df[col] = winsorize(df[col])
-    logger.info(f"✅ '{col}' : valeurs aberrantes traitées.")
+logger.info(f"📂 Lecture en flux depuis : {RAW_DATA_PATH} (fichier brut initial, morceaux de {PREPROCESSING_CHUNKSIZE} lignes)")
+if not Path(RAW_DATA_PATH).exists():
+    logger.error("❌ Fichier introuvable. Vérifiez le chemin dans config.py.")
+    raise FileNotFoundError(RAW_DATA_PATH)
 
 # ============================================================
-# 6️⃣ Création des variables dérivées (features clés)
-# ============================================================
-logger.info("🧮 Création des variables dérivées...")
-df['electricity_ratio'] = df['electricity_kbtu'] / (df['site_energy_use'] + 1e-9)
-logger.info("⚡ 'electricity_ratio' (électricité/énergie) créée.")
-df['gas_ratio'] = df['natural_gas_kbtu'] / (df['site_energy_use'] + 1e-9)
-logger.info("🔥 'gas_ratio' (gaz/énergie) créée.")
-df["f_is_large_building"] = np.where(df["gfa_total"] > 100000, 1, 0)
-logger.info("🏢 'f_is_large_building' (>100000 sq ft) créée.")
-df["building_density"] = df["gfa_total"] / (df["site_energy_use"] + 1e-9)
-logger.info("🏗️ 'building_density' (surface/énergie) créée.")
-
+# 3️⃣ Ajustement : imputation, bornes de winsorisation, standardisation
+#     - Renommage des colonnes, médianes et quantiles calculés en flux
+#     - Moyenne / variance des variables continues calculées en flux
 # ============================================================
-# 7️⃣ Transformation catégorielle : num_floors
-# ============================================================
-logger.info("🏗️ Transformation catégorielle de 'num_floors'...")
-conditions_floors = [
-    (df["num_floors"] <= 4),
-    (df["num_floors"] > 4) & (df["num_floors"] <= 8),
-    (df["num_floors"] > 8)
-]
-values_floors = ["0-4 étages", "5-8 étages", "8+ étages"]
-df["floors_cat"] = np.select(conditions_floors, values_floors)
-encoder_floors = OrdinalEncoder(categories=[["0-4 étages", "5-8 étages", "8+ étages"]])
-df["floors_cat"] = encoder_floors.fit_transform(df[["floors_cat"]]).astype(int) + 1
-logger.info("🔢 'floors_cat' encodée : 1='0-4', 2='5-8', 3='8+'.")
+logger.info("📐 Ajustement des paramètres de prétraitement...")
+params = fit_preprocessing(RAW_DATA_PATH, chunksize=PREPROCESSING_CHUNKSIZE)
 
 # ============================================================
-# 8️⃣ Transformation catégorielle : year_built
-# ============================================================
-logger.info("🏡 Transformation catégorielle de 'year_built'...")
-def year_built_category(year):
-    if year <= 1960:
-        return '1900-1960'
-    elif year <= 1976:
-        return '1961-1976'
-    elif year <= 1980:
-        return '1977-1980'
-    elif year <= 1994:
-        return '1981-1994'
-    else:
-        return '1995-2015'
+# 4️⃣ Persistance des paramètres ajustés
+# ============================================================
+params.save(PREPROCESSING_PARAMS_PATH)
 
-df['year_built_cat'] = df['year_built'].apply(year_built_category)
-encoder_year = OrdinalEncoder(categories=[["1900-1960", "1961-1976", "1977-1980", "1981-1994", "1995-2015"]])
-df['year_built_cat'] = encoder_year.fit_transform(df[['year_built_cat']]).astype(int) + 1
-logger.info("🔢 'year_built_cat' encodée : 1='1900-1960', ..., 5='1995-2015'.")
+# 🎯 Espace des features des modèles servis (non résidentiel, bornes IQR, ratios bruts) :
+#     la transformation `*_raw` doit reproduire les features d'entraînement, pas celles ci-dessous
+fit_model_features(RAW_DATA_PATH, chunksize=PREPROCESSING_CHUNKSIZE).save(MODEL_FEATURES_PARAMS_PATH)
 
 # ============================================================
-# 9️⃣ Standardisation des variables continues
+# 5️⃣ Transformation et export des datasets finaux pour les modèles
+#     - Imputation, winsorizing, variables dérivées, catégories, standardisation
 # ============================================================
-logger.info("📏 Standardisation des variables continues...")
-scaler = StandardScaler()
-continuous_cols = ["site_energy_use", "electricity_ratio", "gas_ratio", "site_eui", "building_density"]
-df[continuous_cols] = scaler.fit_transform(df[continuous_cols])
-for col in continuous_cols:
-    logger.info(f"✅ '{col}' standardisée.")
+logger.info("💾 Transformation et sauvegarde des datasets finaux...")
+transform_to_files(
+    RAW_DATA_PATH, params,
+    co2_path=PROCESSED_CO2_PATH,
+    energy_path=PROCESSED_ENERGY_PATH,
+    chunksize=PREPROCESSING_CHUNKSIZE
+)
+logger.info(f"✅ Dataset GHG exporté : {PROCESSED_CO2_PATH}")
+logger.info(f"✅ Dataset Site Energy Use exporté : {PROCESSED_ENERGY_PATH}")
 
 # ============================================================
-# 🔟 Export des datasets finaux pour les modèles
+# 🗄️ Copies colonnaires typées (int8 / float32) : Parquet + Feather
+#     - Rechargées par `src.datasets.load_dataset` (mmap) sans reparser le texte
+#     - Ignorées (avertissement) sans pyarrow : extra `columnar`
 # ============================================================
-logger.info("💾 Sauvegarde des datasets finaux...")
-final_columns_ghg = ["site_energy_use", "electricity_ratio", "gas_ratio", "floors_cat", "year_built_cat"]
-final_columns_energy = ["site_eui", "f_is_large_building", "floors_cat", "building_density", "gas_ratio"]
-
-df[final_columns_ghg].to_csv(PROCESSED_CO2_PATH, index=False)
-logger.info(f"✅ Dataset GHG exporté : {PROCESSED_CO2_PATH}")
-
-df[final_columns_energy].to_csv(PROCESSED_ENERGY_PATH, index=False)
-logger.info(f"✅ Dataset Site Energy Use exporté : {PROCESSED_ENERGY_PATH}")
+for path in (PROCESSED_CO2_PATH, PROCESSED_ENERGY_PATH):
+    export_columnar(path, chunksize=PREPROCESSING_CHUNKSIZE)
 
 # ============================================================
-# 🎉 1️⃣1️⃣ Fin du prétraitement : Données prêtes pour modélisation
+# 🎉 6️⃣ Fin du prétraitement : Données prêtes pour modélisation
 # ============================================================
 logger.info("🚀 Prétraitement terminé avec succès. Les datasets sont prêts pour l'entraînement des modèles.")
@@ -0,0 +1,444 @@
+# ============================================================
+# 🔄 Pipeline de prétraitement en flux (src/preprocessing.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Reproduire `preprocess_data_for_models.py`
+#     en mémoire bornée, sur des fichiers plus gros que la RAM.
+# 📌 **Deux temps :**
+#     1️⃣ `fit_preprocessing` : lit le CSV brut par morceaux
+#        - passe A : médiane de `gfa_total` + quantiles de
+#          winsorisation via un sketch de quantiles en flux ;
+#        - passe B : moyenne / variance des variables continues
+#          (fusion de Chan, identique à `StandardScaler`).
+#     2️⃣ `transform_to_files` : relit par morceaux, applique les
+#        paramètres et écrit les deux datasets au fil de l'eau.
+# 💾 Les paramètres ajustés sont persistés en JSON pour être
+#     réutilisés (nouvelles années, service, réentraînement).
+# 🎯 `fit_model_features` : même lecture en flux, mais recette de
+#     `dataset_cleaned.csv` (espace d'entraînement des modèles servis) :
+#     non résidentiel, bornes IQR, ratios bruts ; paramètres embarqués
+#     avec les modèles (transformation `*_raw`, src/feature_transform.py).
+#     `transform_model_features` : nouvelles lignes brutes → features des
+#     modèles + cibles (entrée de `training.py --incremental`).
+# 🔬 Étapes balisées pour le profilage opt-in (src/profiling.py) :
+#     loading, imputation, winsorizing, feature_derivation, binning,
+#     scaling, quantile_sketch, moments, export.
+# ============================================================
+
+import json  # Persistance des paramètres ajustés
+from pathlib import Path  # Chemins de sortie
+import numpy as np  # Manipulation numérique efficace
+import pandas as pd  # Lecture / écriture par morceaux
+from loguru import logger  # Gestion avancée et lisible des logs
+from src.binning import add_bins  # Catégories par bornes numériques (partagées avec le service)
+from src.feature_transform import MODEL_RECIPE, RawFeatureTransform, required_columns  # Transformation `*_raw`
+from src.profiling import stage, profiled  # Balises des étapes (mesurées seulement en mode profilage)
+
+# ============================================================
+# 📋 Définition des étapes (identique au script historique)
+# ============================================================
+COLUMNS_MAPPING = {
+    "SiteEnergyUse(kBtu)": "site_energy_use",
+    "Electricity(kWh)": "electricity_kwh",
+    "Electricity(kBtu)": "electricity_kbtu",
+    "NaturalGas(kBtu)": "natural_gas_kbtu",
+    "SiteEUI(kBtu/sf)": "site_eui",
+    "PropertyGFATotal": "gfa_total",
+    "NumberofFloors": "num_floors",
+    "YearBuilt": "year_built",
+    "TotalGHGEmissions": "ghg_emissions_total",
+    "BuildingType": "building_type_label",
+}
+FIXED_MEDIANS = {
+    'site_energy_use': 2554947.25,
+    'electricity_kwh': 472415.34,
+    'electricity_kbtu': 1611881.0,
+    'natural_gas_kbtu': 498263.0,
+    'num_floors': 3,
+    'year_built': 1977,
+    'site_eui': 51.90,
+}
+FITTED_MEDIAN_COLS = ["gfa_total"]  # Médiane calculée sur les données
+WINSORIZE_COLS = ["site_energy_use", "electricity_kwh", "electricity_kbtu", "natural_gas_kbtu", "num_floors", "site_eui", "gfa_total"]
+WINSORIZE_QUANTILES = (0.01, 0.99)
+CONTINUOUS_COLS = ["site_energy_use", "electricity_ratio", "gas_ratio", "site_eui", "building_density"]
+FINAL_COLUMNS_GHG = ["site_energy_use", "electricity_ratio", "gas_ratio", "floors_cat", "year_built_cat"]
+FINAL_COLUMNS_ENERGY = ["site_eui", "f_is_large_building", "floors_cat", "building_density", "gas_ratio"]
+
+# 🎯 Recette de `dataset_cleaned.csv` (features sur lesquelles les modèles servis sont entraînés)
+MODEL_EXCLUDED_BUILDING_TYPES = "Multifamily"  # Préfixe de `BuildingType` hors périmètre (résidentiel)
+MODEL_CLIP_COLS = ["site_energy_use", "electricity_kbtu", "natural_gas_kbtu", "site_eui", "gfa_total", "num_floors",
+                   "year_built", "ghg_emissions_total"]
+MODEL_SCALED_COLS = ["site_energy_use", "site_eui", "ghg_emissions_total"]  # Cibles incluses
+MODEL_TARGET_COLS = ["site_energy_use", "ghg_emissions_total"]  # Cibles des modèles Énergie et CO₂
+IQR_FACTOR = 1.5  # Bornes de Tukey : [Q1 − 1,5 × IQR, Q3 + 1,5 × IQR]
+
+
+# ============================================================
+# 📐 Sketch de quantiles en flux (mémoire bornée)
+# ============================================================
+class QuantileSketch:
+    """
+    📄 **Description :**
+    - Conserve au plus `capacity` valeurs pondérées (centroïdes).
+    - Exact tant que le nombre de valeurs reste ≤ `capacity` ; au-delà,
+      les valeurs voisines sont fusionnées façon t-digest : les centroïdes
+      restent très petits dans les queues (quantiles 1 % / 99 %) et plus
+      gros au centre, pour ~`capacity / 8` centroïdes après compaction.
+    - `quantile` reproduit l'interpolation linéaire de `pandas.Series.quantile`.
+    """
+
+    def __init__(self, capacity=8192):
+        self.capacity = capacity
+        self.compression = max(capacity // 4, 16)
+        self.values = np.empty(0)
+        self.weights = np.empty(0)
+        self.compacted = False
+        self.minimum, self.maximum = np.inf, -np.inf
+
+    def update(self, values, weight=1.0):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.minimum = min(self.minimum, values.min())
+            self.maximum = max(self.maximum, values.max())
+        self.values = np.concatenate([self.values, values])
+        self.weights = np.concatenate([self.weights, np.full(len(values), float(weight))])
+        if len(self.values) > self.capacity:
+            self._compact()
+
+    def _compact(self):
+        order = np.argsort(self.values, kind="stable")
+        values, weights = self.values[order], self.weights[order]
+        cumulative = np.cumsum(weights)
+        # 📐 Échelle k1 du t-digest : un centroïde couvre au plus une unité de k.
+        #     Chaque valeur (triée) tombe dans le seau `floor(k(q) - k(0))` de son rang
+        #     central q ; moyenne pondérée par seau, sans boucle Python.
+        scale = self.compression / (2 * np.pi)
+        q = np.clip((cumulative - weights / 2) / cumulative[-1], 0.0, 1.0)
+        buckets = np.floor(scale * (np.arcsin(2 * q - 1) + np.pi / 2)).astype(np.intp)
+        merged_w = np.bincount(buckets, weights=weights)
+        merged_v = np.bincount(buckets, weights=values * weights)
+        used = merged_w > 0
+        self.values = merged_v[used] / merged_w[used]
+        self.weights = merged_w[used]
+        self.compacted = True
+
+    def quantile(self, q):
+        order = np.argsort(self.values, kind="stable")
+        values, weights = self.values[order], self.weights[order]
+        cumulative = np.cumsum(weights)
+        position = (cumulative[-1] - 1) * q
+        if self.compacted:
+            # 📐 Interpolation entre centres de centroïdes, bornée par le min / max exacts
+            centers = np.concatenate([[0.0], cumulative - (weights + 1) / 2, [cumulative[-1] - 1]])
+            return float(np.interp(position, centers, np.concatenate([[self.minimum], values, [self.maximum]])))
+        lower = np.floor(position)
+        index_low = np.searchsorted(cumulative, lower, side="right")
+        index_high = np.searchsorted(cumulative, min(lower + 1, cumulative[-1] - 1), side="right")
+        return float(values[index_low] + (position - lower) * (values[index_high] - values[index_low]))
+
+
+# ============================================================
+# 📊 Moyenne / variance incrémentales (fusion de Chan)
+# ============================================================
+class RunningMoments:
+    """📊 Moyenne et variance (ddof=0, comme `StandardScaler`) fusionnées morceau par morceau."""
+
+    def __init__(self, n_columns):
+        self.count = 0
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+
+    def update(self, matrix):
+        n = matrix.shape[0]
+        if n == 0:
+            return
+        chunk_mean = matrix.mean(axis=0)
+        chunk_m2 = ((matrix - chunk_mean) ** 2).sum(axis=0)
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean = self.mean + delta * n / total
+        self.m2 = self.m2 + chunk_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / self.count)
+
+
+# ============================================================
+# 💾 Paramètres ajustés et persistance
+# ============================================================
+class FittedPreprocessing:
+    """
+    📄 **Description :**
+    - `medians` : valeurs d'imputation (fixes + médianes calculées).
+    - `bounds` : bornes de winsorisation `[bas, haut]` par colonne.
+    - `scaler_mean` / `scaler_scale` : standardisation des `continuous_cols`.
+    - `recipe` : `MODEL_RECIPE` pour l'espace des features des modèles servis
+      (seul accepté par la transformation `*_raw`), None pour le script historique.
+    """
+
+    def __init__(self, medians, bounds, scaler_mean, scaler_scale, n_rows=0, continuous_cols=CONTINUOUS_COLS,
+                 recipe=None):
+        self.medians = medians
+        self.bounds = bounds
+        self.scaler_mean = scaler_mean
+        self.scaler_scale = scaler_scale
+        self.n_rows = n_rows
+        self.continuous_cols = list(continuous_cols)
+        self.recipe = recipe
+
+    def to_dict(self):
+        params = {
+            "medians": self.medians,
+            "bounds": self.bounds,
+            "continuous_cols": self.continuous_cols,
+            "scaler_mean": list(map(float, self.scaler_mean)),
+            "scaler_scale": list(map(float, self.scaler_scale)),
+            "n_rows": self.n_rows,
+        }
+        if self.recipe is not None:
+            params["recipe"] = self.recipe
+        return params
+
+    @classmethod
+    def from_dict(cls, params):
+        return cls(
+            medians=params["medians"],
+            bounds={col: tuple(bound) for col, bound in params["bounds"].items()},
+            scaler_mean=np.asarray(params["scaler_mean"]),
+            scaler_scale=np.asarray(params["scaler_scale"]),
+            n_rows=params.get("n_rows", 0),
+            continuous_cols=params.get("continuous_cols", CONTINUOUS_COLS),
+            recipe=params.get("recipe"),
+        )
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2))
+        logger.info(f"💾 Paramètres de prétraitement sauvegardés : {path}")
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_dict(json.loads(Path(path).read_text()))
+
+
+# ============================================================
+# 🧩 Étapes unitaires (appliquées à chaque morceau)
+# ============================================================
+def read_raw_chunks(path, chunksize):
+    """📂 Lit le CSV brut par morceaux et renomme les colonnes utiles."""
+    reader = pd.read_csv(path, chunksize=chunksize)
+    while True:
+        with stage("loading") as timer:  # Lecture + parsing d'un morceau (hors traitement en aval)
+            chunk = next(reader, None)
+            if chunk is None:
+                return
+            chunk = chunk.rename(columns=COLUMNS_MAPPING)
+            timer.rows = len(chunk)
+        yield chunk
+
+
+@profiled("imputation")
+def impute(df, medians):
+    for col, median_val in medians.items():
+        df[col] = df[col].fillna(median_val)
+    return df
+
+
+@profiled("winsorizing")
+def winsorize(df, bounds):
+    for col, (lower_bound, upper_bound) in bounds.items():
+        df[col] = df[col].clip(lower=lower_bound, upper=upper_bound)
+    return df
+
+
+@profiled("feature_derivation")
+def add_derived_features(df):
+    df['electricity_ratio'] = df['electricity_kbtu'] / (df['site_energy_use'] + 1e-9)
+    df['gas_ratio'] = df['natural_gas_kbtu'] / (df['site_energy_use'] + 1e-9)
+    df["f_is_large_building"] = np.where(df["gfa_total"] > 100000, 1, 0)
+    df["building_density"] = df["gfa_total"] / (df["site_energy_use"] + 1e-9)
+    return df
+
+
+@profiled("binning")
+def add_categories(df):
+    """🏢 Codes d'étages et d'année de construction (bornes dans `src/binning.py`)."""
+    for feature, codes in add_bins(df).items():
+        df[feature] = codes
+    return df
+
+
+@profiled("scaling")
+def standardize(df, params):
+    df[CONTINUOUS_COLS] = (df[CONTINUOUS_COLS].to_numpy() - params.scaler_mean) / params.scaler_scale
+    return df
+
+
+def transform_chunk(df, params):
+    """🔁 Applique toutes les étapes à un morceau avec des paramètres déjà ajustés."""
+    df = impute(df, params.medians)
+    df = winsorize(df, params.bounds)
+    df = add_derived_features(df)
+    df = add_categories(df)
+    return standardize(df, params)
+
+
+# ============================================================
+# 1️⃣ Ajustement en flux (deux lectures du CSV brut)
+# ============================================================
+def fit_preprocessing(raw_path, chunksize=100_000, sketch_capacity=8192):
+    """
+    📄 **Description :**
+    - Passe A : sketches de quantiles des colonnes à winsoriser (après imputation)
+      et médiane de `gfa_total` (valeurs non manquantes).
+    - Passe B : moyenne / écart-type des variables continues après winsorisation.
+    - Retourne un `FittedPreprocessing` ; la mémoire dépend de `chunksize`
+      et `sketch_capacity`, jamais de la taille du fichier.
+    """
+    logger.info(f"📐 Ajustement (passe A : médianes et quantiles) sur {raw_path}...")
+    sketches = {col: QuantileSketch(sketch_capacity) for col in WINSORIZE_COLS}
+    missing_counts = dict.fromkeys(FITTED_MEDIAN_COLS, 0)
+    n_rows = 0
+    for chunk in read_raw_chunks(raw_path, chunksize):
+        n_rows += len(chunk)
+        chunk = impute(chunk, FIXED_MEDIANS)
+        with stage("quantile_sketch", rows=len(chunk)):
+            for col in WINSORIZE_COLS:
+                sketches[col].update(chunk[col].to_numpy())
+        for col in FITTED_MEDIAN_COLS:
+            missing_counts[col] += int(chunk[col].isna().sum())
+
+    medians = dict(FIXED_MEDIANS)
+    for col in FITTED_MEDIAN_COLS:
+        medians[col] = sketches[col].quantile(0.5)
+        # 🩹 Les valeurs imputées entrent dans les quantiles avec leur poids réel
+        if missing_counts[col]:
+            sketches[col].update([medians[col]], weight=missing_counts[col])
+        logger.info(f"🩹 '{col}' : médiane {medians[col]} ({missing_counts[col]} valeurs imputées).")
+
+    lower, upper = WINSORIZE_QUANTILES
+    bounds = {col: (sketches[col].quantile(lower), sketches[col].quantile(upper)) for col in WINSORIZE_COLS}
+    for col, (lower_bound, upper_bound) in bounds.items():
+        logger.info(f"📊 '{col}' : bornes [{lower_bound}, {upper_bound}]")
+
+    logger.info("📏 Ajustement (passe B : moyenne et variance des variables continues)...")
+    moments = RunningMoments(len(CONTINUOUS_COLS))
+    for chunk in read_raw_chunks(raw_path, chunksize):
+        chunk = add_derived_features(winsorize(impute(chunk, medians), bounds))
+        with stage("moments", rows=len(chunk)):
+            moments.update(chunk[CONTINUOUS_COLS].to_numpy(dtype=np.float64))
+
+    logger.info(f"✅ Ajustement terminé sur {n_rows} lignes.")
+    return FittedPreprocessing(medians, bounds, moments.mean, moments.std, n_rows)
+
+
+# ============================================================
+# 🎯 Ajustement de l'espace des features des modèles (dataset_cleaned.csv)
+# ============================================================
+def model_scope(chunk):
+    """🏢 Lignes du périmètre d'entraînement des modèles (bâtiments non résidentiels)."""
+    if "building_type_label" not in chunk:
+        return chunk
+    return chunk[~chunk["building_type_label"].astype(str).str.startswith(MODEL_EXCLUDED_BUILDING_TYPES)].copy()
+
+
+def fit_model_features(raw_path, chunksize=100_000, sketch_capacity=8192):
+    """
+    📄 **Description :**
+    - Reproduit l'ajustement de `dataset_cleaned.csv` sur le périmètre non résidentiel :
+      médianes d'imputation, bornes IQR (sur les colonnes imputées), puis moyenne /
+      écart-type des colonnes bornées de `MODEL_SCALED_COLS`.
+    - Deux lectures en flux comme `fit_preprocessing` ; exact tant que le périmètre
+      tient dans `sketch_capacity` valeurs par colonne.
+    - Retourne un `FittedPreprocessing` de recette `MODEL_RECIPE`.
+    """
+    logger.info(f"🎯 Espace des features des modèles (passe A : médianes et bornes IQR) sur {raw_path}...")
+    sketches = {col: QuantileSketch(sketch_capacity) for col in MODEL_CLIP_COLS}
+    missing_counts = dict.fromkeys(MODEL_CLIP_COLS, 0)
+    n_rows = 0
+    for chunk in read_raw_chunks(raw_path, chunksize):
+        chunk = model_scope(chunk)
+        n_rows += len(chunk)
+        with stage("quantile_sketch", rows=len(chunk)):
+            for col in MODEL_CLIP_COLS:
+                sketches[col].update(chunk[col].to_numpy())
+                missing_counts[col] += int(chunk[col].isna().sum())
+
+    medians, bounds = {}, {}
+    for col in MODEL_CLIP_COLS:
+        medians[col] = sketches[col].quantile(0.5)
+        if missing_counts[col]:  # 🩹 Les bornes sont calculées après imputation
+            sketches[col].update([medians[col]], weight=missing_counts[col])
+        q1, q3 = sketches[col].quantile(0.25), sketches[col].quantile(0.75)
+        bounds[col] = (q1 - IQR_FACTOR * (q3 - q1), q3 + IQR_FACTOR * (q3 - q1))
+        logger.info(f"📊 '{col}' : médiane {medians[col]} ({missing_counts[col]} imputées), "
+                    f"bornes [{bounds[col][0]}, {bounds[col][1]}]")
+
+    logger.info("📏 Espace des features des modèles (passe B : moyenne et variance)...")
+    moments = RunningMoments(len(MODEL_SCALED_COLS))
+    for chunk in read_raw_chunks(raw_path, chunksize):
+        chunk = winsorize(impute(model_scope(chunk), medians), bounds)
+        with stage("moments", rows=len(chunk)):
+            moments.update(chunk[MODEL_SCALED_COLS].to_numpy(dtype=np.float64))
+
+    logger.info(f"✅ Espace des features des modèles ajusté sur {n_rows} lignes.")
+    return FittedPreprocessing(medians, bounds, moments.mean, moments.std, n_rows,
+                               continuous_cols=MODEL_SCALED_COLS, recipe=MODEL_RECIPE)
+
+
+def transform_model_features(raw_path, params, out_path, features, chunksize=100_000):
+    """
+    📄 **Description :**
+    - Transforme les lignes brutes du périmètre avec `params` (recette `MODEL_RECIPE`,
+      aucun réajustement) et écrit `features` + `MODEL_TARGET_COLS` dans `out_path` :
+      fichier chargeable par `training.load_training_data` (`--incremental`).
+    - Indicateurs non dérivés (`property_type_*`, …) repris tels quels du CSV brut ;
+      lignes sans cible brute ignorées.
+    ⚠️ Lève `ValueError` si une colonne brute, une cible ou un indicateur manque.
+    - Retourne le nombre de lignes écrites.
+    """
+    transform = RawFeatureTransform(params.to_dict())
+    needed = list(dict.fromkeys(required_columns(features) + MODEL_TARGET_COLS))
+    columns = list(dict.fromkeys(list(features) + MODEL_TARGET_COLS))
+    n_rows = n_unlabelled = 0
+    for index, chunk in enumerate(read_raw_chunks(raw_path, chunksize)):
+        missing = [col for col in needed if col not in chunk.columns]
+        if missing:
+            raise ValueError(f"❌ Colonnes absentes de {raw_path} : {missing}")
+        chunk = model_scope(chunk)
+        labelled = chunk[MODEL_TARGET_COLS].notna().all(axis=1).to_numpy()
+        n_unlabelled += int((~labelled).sum())
+        chunk = chunk[labelled]
+        with stage("feature_derivation", rows=len(chunk)):
+            matrix = transform.to_matrix({col: chunk[col].to_numpy() for col in needed}, columns)
+        with stage("export", rows=len(chunk)):
+            pd.DataFrame(matrix, columns=columns).to_csv(out_path, index=False, mode="w" if index == 0 else "a",
+                                                         header=index == 0)
+        n_rows += len(chunk)
+    logger.info(f"✅ {n_rows} lignes exportées vers {out_path} ({n_unlabelled} sans cible ignorées)")
+    return n_rows
+
+
+# ============================================================
+# 2️⃣ Transformation en flux vers les datasets finaux
+# ============================================================
+def transform_to_files(raw_path, params, co2_path, energy_path, chunksize=100_000, append=False):
+    """
+    💾 Transforme le CSV brut morceau par morceau et ajoute chaque morceau aux sorties.
+    ♻️ `append=True` : les sorties existantes sont conservées (nouvelle année
+    transformée avec des paramètres déjà ajustés, sans réajustement).
+    """
+    n_rows = 0
+    for index, chunk in enumerate(read_raw_chunks(raw_path, chunksize)):
+        chunk = transform_chunk(chunk, params)
+        mode, header = ("w", True) if index == 0 and not append else ("a", False)
+        with stage("export", rows=len(chunk)):
+            chunk[FINAL_COLUMNS_GHG].to_csv(co2_path, index=False, mode=mode, header=header)
+            chunk[FINAL_COLUMNS_ENERGY].to_csv(energy_path, index=False, mode=mode, header=header)
+        n_rows += len(chunk)
+    logger.info(f"✅ {n_rows} lignes exportées vers {co2_path} et {energy_path}")
+    return n_rows
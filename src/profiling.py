@@ -0,0 +1,219 @@
+# ============================================================
+# 🔬 Profilage du pipeline de prétraitement et d'enregistrement (src/profiling.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Savoir où passe le temps (et la mémoire) du
+#     prétraitement quand les datasets grossissent, et détecter les
+#     régressions dans les benchmarks de CI.
+# 📌 **Fonctionnement (opt-in) :**
+#     - Les étapes du pipeline sont balisées par `stage("<nom>")` ou
+#       `@profiled("<nom>")` : sans session active, un simple test
+#       (`_active is None`), aucune mesure.
+#     - `profiling(label)` ouvre une session : par étape, temps mural
+#       cumulé, nombre d'appels, lignes traitées (débit en lignes/s) et pic
+#       de mémoire allouée (`tracemalloc`, numpy et pandas inclus).
+#     - Sur toute la session : `cProfile` écrit `logs/profile_<label>.prof`
+#       (format pstats : `snakeviz`, `flameprof`, `gprof2dot`…) et un
+#       résumé `logs/profile_<label>.json` (étapes + fonctions les plus
+#       coûteuses + RSS max du processus).
+# ⚠️ `tracemalloc` et `cProfile` ralentissent le code Python : comparer
+#     des profils obtenus avec les mêmes options.
+# ============================================================
+
+import cProfile  # Profil par fonction de toute la session
+import functools
+import json
+import pstats
+import resource  # RSS max du processus
+import sys
+import time
+import tracemalloc  # Pic de mémoire allouée par étape
+from contextlib import contextmanager
+from loguru import logger  # Gestion avancée et lisible des logs
+from src.config import LOGS_DIR, PROFILE_TRACE_MEMORY, PROFILE_TOP_FUNCTIONS, PROFILE_TOLERANCE, PROFILE_MIN_SECONDS
+
+_active = None  # Session en cours (None : balises inactives)
+
+
+class StageTimer:
+    """⏱️ Mesure d'un passage dans une étape ; `rows` peut être renseigné dans le bloc."""
+
+    __slots__ = ("rows",)
+
+    def __init__(self, rows=None):
+        self.rows = rows
+
+
+class PipelineProfiler:
+    """
+    📄 **Description :**
+    - Agrège les passages dans chaque étape : `calls`, `seconds`, `rows`,
+      `peak_mb` (pic de mémoire Python allouée pendant l'étape).
+    - Étapes imbriquées : le temps d'une étape inclut celui de ses sous-étapes,
+      son pic mémoire aussi.
+    """
+
+    def __init__(self, label, trace_memory=PROFILE_TRACE_MEMORY):
+        self.label = label
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self._peaks = []  # Pic courant de chaque étape ouverte (pile)
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        timer = StageTimer(rows)
+        if self.trace_memory:
+            if self._peaks:  # Le pic atteint jusqu'ici appartient à l'étape parente
+                self._peaks[-1] = max(self._peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self._peaks.append(0)
+        start = time.perf_counter()
+        try:
+            yield timer
+        finally:
+            elapsed = time.perf_counter() - start
+            entry = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0, "rows": 0, "peak_mb": 0.0})
+            entry["calls"] += 1
+            entry["seconds"] += elapsed
+            entry["rows"] += int(timer.rows or 0)
+            if self.trace_memory:
+                peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+                tracemalloc.reset_peak()
+                entry["peak_mb"] = max(entry["peak_mb"], peak / 2 ** 20)
+
+    def summary(self, total_seconds):
+        """📊 Étapes avec débit (lignes/s) et part du temps total."""
+        stages = {}
+        for name, entry in self.stages.items():
+            seconds = entry["seconds"]
+            stages[name] = {**entry, "rows_per_s": entry["rows"] / seconds if entry["rows"] and seconds else None,
+                            "share": seconds / total_seconds if total_seconds else 0.0}
+        if not self.trace_memory:
+            for entry in stages.values():
+                entry["peak_mb"] = None
+        return stages
+
+
+# ============================================================
+# 🏷️ Balises des étapes (inactives hors session)
+# ============================================================
+@contextmanager
+def stage(name, rows=None):
+    """⏱️ Balise un bloc : mesuré seulement pendant une session `profiling`."""
+    if _active is None:
+        yield StageTimer(rows)
+        return
+    with _active.stage(name, rows) as timer:
+        yield timer
+
+
+def profiled(name):
+    """🏷️ Décorateur : balise une étape appliquée à un DataFrame (lignes = `len` du premier argument)."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(df, *args, **kwargs):
+            if _active is None:
+                return function(df, *args, **kwargs)
+            with _active.stage(name, rows=len(df)):
+                return function(df, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ============================================================
+# 🔬 Session de profilage
+# ============================================================
+def _top_functions(profile, top):
+    """🔥 Fonctions les plus coûteuses (temps cumulé) d'après cProfile."""
+    stats = pstats.Stats(profile)
+    rows = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+        rows.append({"function": f"{filename}:{line}({function})", "calls": calls,
+                     "own_s": own, "cumulative_s": cumulative})
+    return sorted(rows, key=lambda row: row["cumulative_s"], reverse=True)[:top]
+
+
+def max_rss_mb():
+    """🧠 RSS max du processus (Mo ; Linux : Ko, macOS : octets)."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 2 ** 20 if sys.platform == "darwin" else rss / 2 ** 10
+
+
+@contextmanager
+def profiling(label, output_dir=LOGS_DIR, trace_memory=PROFILE_TRACE_MEMORY, use_cprofile=True,
+              top=PROFILE_TOP_FUNCTIONS):
+    """
+    📄 **Description :**
+    - Active les balises pendant le bloc, puis écrit `profile_<label>.json`
+      (et `profile_<label>.prof` si `use_cprofile`) dans `output_dir`.
+    - Le résumé est placé dans `report` (dict renvoyé par le `with`),
+      rempli à la sortie du bloc.
+    """
+    global _active
+    if _active is not None:
+        raise RuntimeError("❌ Une session de profilage est déjà active.")
+    report = {}
+    profiler = PipelineProfiler(label, trace_memory)
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    profile = cProfile.Profile() if use_cprofile else None
+    _active = profiler
+    start = time.perf_counter()
+    if profile is not None:
+        profile.enable()
+    try:
+        yield report
+    finally:
+        if profile is not None:
+            profile.disable()
+        total = time.perf_counter() - start
+        _active = None
+        if started_tracing:
+            tracemalloc.stop()
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        report.update({"label": label, "total_s": total, "max_rss_mb": max_rss_mb(),
+                       "trace_memory": trace_memory, "stages": profiler.summary(total)})
+        if profile is not None:
+            prof_path = output_dir / f"profile_{label}.prof"
+            profile.dump_stats(prof_path)
+            report["cprofile"] = str(prof_path)
+            report["top_functions"] = _top_functions(profile, top)
+        output = output_dir / f"profile_{label}.json"
+        output.write_text(json.dumps(report, indent=2))
+        log_summary(report)
+        logger.info(f"💾 Profil écrit dans : {output}")
+
+
+def log_summary(report):
+    """📝 Tableau des étapes (temps, part, débit, pic mémoire) dans les logs."""
+    for name, entry in report["stages"].items():
+        throughput = f"{entry['rows_per_s']:>12,.0f} lignes/s" if entry["rows_per_s"] else " " * 20
+        memory = f"{entry['peak_mb']:8.1f} Mo" if entry["peak_mb"] is not None else ""
+        logger.info(f"⏱️ {name:<22} {entry['seconds'] * 1000:9.1f} ms {entry['share']:6.1%} "
+                    f"{throughput} {memory}")
+    logger.info(f"🔬 {report['label']} : {report['total_s']:.2f} s au total, RSS max {report['max_rss_mb']:.0f} Mo")
+
+
+# ============================================================
+# 🚨 Comparaison à un profil de référence (CI)
+# ============================================================
+def compare_to_baseline(report, baseline, tolerance=PROFILE_TOLERANCE, min_seconds=PROFILE_MIN_SECONDS):
+    """
+    📄 **Description :**
+    - Étapes plus lentes que dans `baseline` de plus de `tolerance` (relatif)
+      ET de plus de `min_seconds` (bruit des étapes courtes ignoré).
+    - Retourne la liste des régressions (vide : aucune).
+    """
+    regressions = []
+    for name, entry in report["stages"].items():
+        reference = baseline.get("stages", {}).get(name)
+        if reference is None:
+            continue
+        slower = entry["seconds"] - reference["seconds"]
+        if slower > min_seconds and entry["seconds"] > reference["seconds"] * (1 + tolerance):
+            regressions.append({"stage": name, "seconds": entry["seconds"], "baseline_s": reference["seconds"],
+                                "ratio": entry["seconds"] / reference["seconds"] if reference["seconds"] else None})
+    return regressions
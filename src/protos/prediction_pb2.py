@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: src/protos/prediction.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1bsrc/protos/prediction.proto\x12\x18\x65nergy_co2.prediction.v1\"g\n\x0ePredictRequest\x12\x0e\n\x06target\x18\x01 \x01(\t\x12\x10\n\x08\x66\x65\x61tures\x18\x02 \x03(\x01\x12\x0e\n\x06n_rows\x18\x03 \x01(\r\x12\x12\n\nrequest_id\x18\x04 \x01(\t\x12\x0f\n\x07variant\x18\x05 \x01(\t\"\\\n\x0fPredictResponse\x12\x13\n\x0bpredictions\x18\x01 \x03(\x01\x12\x11\n\tmodel_tag\x18\x02 \x01(\t\x12\x12\n\nrequest_id\x18\x03 \x01(\t\x12\r\n\x05\x65rror\x18\x04 \x01(\t2\xd6\x01\n\nPrediction\x12^\n\x07Predict\x12(.energy_co2.prediction.v1.PredictRequest\x1a).energy_co2.prediction.v1.PredictResponse\x12h\n\rPredictStream\x12(.energy_co2.prediction.v1.PredictRequest\x1a).energy_co2.prediction.v1.PredictResponse(\x01\x30\x01\x62\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'src.protos.prediction_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _PREDICTREQUEST._serialized_start=57
+  _PREDICTREQUEST._serialized_end=160
+  _PREDICTRESPONSE._serialized_start=162
+  _PREDICTRESPONSE._serialized_end=254
+  _PREDICTION._serialized_start=257
+  _PREDICTION._serialized_end=471
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,99 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+
+from src.protos import prediction_pb2 as src_dot_protos_dot_prediction__pb2
+
+
+class PredictionStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.Predict = channel.unary_unary(
+                '/energy_co2.prediction.v1.Prediction/Predict',
+                request_serializer=src_dot_protos_dot_prediction__pb2.PredictRequest.SerializeToString,
+                response_deserializer=src_dot_protos_dot_prediction__pb2.PredictResponse.FromString,
+                )
+        self.PredictStream = channel.stream_stream(
+                '/energy_co2.prediction.v1.Prediction/PredictStream',
+                request_serializer=src_dot_protos_dot_prediction__pb2.PredictRequest.SerializeToString,
+                response_deserializer=src_dot_protos_dot_prediction__pb2.PredictResponse.FromString,
+                )
+
+
+class PredictionServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def Predict(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PredictStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_PredictionServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'Predict': grpc.unary_unary_rpc_method_handler(
+                    servicer.Predict,
+                    request_deserializer=src_dot_protos_dot_prediction__pb2.PredictRequest.FromString,
+                    response_serializer=src_dot_protos_dot_prediction__pb2.PredictResponse.SerializeToString,
+            ),
+            'PredictStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.PredictStream,
+                    request_deserializer=src_dot_protos_dot_prediction__pb2.PredictRequest.FromString,
+                    response_serializer=src_dot_protos_dot_prediction__pb2.PredictResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'energy_co2.prediction.v1.Prediction', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+ # This class is part of an EXPERIMENTAL API.
+class Prediction(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def Predict(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/energy_co2.prediction.v1.Prediction/Predict',
+            src_dot_protos_dot_prediction__pb2.PredictRequest.SerializeToString,
+            src_dot_protos_dot_prediction__pb2.PredictResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def PredictStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/energy_co2.prediction.v1.Prediction/PredictStream',
+            src_dot_protos_dot_prediction__pb2.PredictRequest.SerializeToString,
+            src_dot_protos_dot_prediction__pb2.PredictResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
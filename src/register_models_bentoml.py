@@ -2,18 +2,50 @@
 # 🚀 Script pour charger et sauvegarder les modèles existants avec BentoML
 #     - Consommation d'énergie (site_energy_use)
 #     - Émissions de CO₂ (ghg_emissions_total)
+#     - La logique d'enregistrement (plages, tables de nœuds, signatures)
+#       vit dans `src/model_registry.py`, partagée avec `src/training.py`.
+#     - `--variants float32 first_n distilled` : enregistre aussi des
+#       variantes allégées mesurées (précision / latence, src/variants.py).
+#     - `--profile` (ou `PIPELINE_PROFILE=1`) : profil des étapes
+#       d'enregistrement dans `logs/profile_registration*` (src/profiling.py).
 # ============================================================
 
-import bentoml
+import argparse
+import atexit
+import sys
+from contextlib import ExitStack
+from pathlib import Path
 import joblib
 from loguru import logger
-from config import (
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))  # 🔗 Racine du projet (import `src.*`)
+
+from src.model_registry import register_model, load_preprocessing_params
+from src.datasets import load_dataset
+from src.variants import VARIANTS, register_variants
+from src.profiling import profiling, stage
+from src.config import (
     ENERGY_MODEL_PATH, 
     ENERGY_FEATURES_PATH, 
     CO2_MODEL_PATH, 
-    CO2_FEATURES_PATH
+    CO2_FEATURES_PATH,
+    CLEANED_DATA_PATH,
+    PIPELINE_PROFILE
 )
 
+parser = argparse.ArgumentParser(description="Enregistre les modèles existants dans le Model Store BentoML.")
+parser.add_argument("--variants", nargs="*", choices=VARIANTS, default=[],
+                    help="Variantes allégées à construire, mesurer et enregistrer en plus des modèles.")
+parser.add_argument("--profile", action="store_true", default=PIPELINE_PROFILE,
+                    help="Profile les étapes d'enregistrement et écrit logs/profile_registration*.")
+args = parser.parse_args()
+
+# 🔬 Profilage opt-in : session fermée (profil écrit) à la sortie du script
+session = ExitStack()
+atexit.register(session.close)
+if args.profile:
+    session.enter_context(profiling("registration"))
+
 # ============================================================
 # 📂 Chargement des modèles et des features existants
 # ============================================================
@@ -21,39 +53,58 @@ logger.info("📂 Chargement des modèles et features existants depuis les chemi
 
 try:
     # ✅ Chargement des modèles
-    energy_model = joblib.load(ENERGY_MODEL_PATH)
-    energy_features = joblib.load(ENERGY_FEATURES_PATH)
+    with stage("model_loading"):
+        energy_model = joblib.load(ENERGY_MODEL_PATH)
+        energy_features = joblib.load(ENERGY_FEATURES_PATH)
+        co2_model = joblib.load(CO2_MODEL_PATH)
+        co2_features = joblib.load(CO2_FEATURES_PATH)
     logger.info(f"⚡ Modèle énergie chargé depuis : {ENERGY_MODEL_PATH}")
     logger.info(f"📝 Features énergie chargées depuis : {ENERGY_FEATURES_PATH}")
-
-    co2_model = joblib.load(CO2_MODEL_PATH)
-    co2_features = joblib.load(CO2_FEATURES_PATH)
     logger.info(f"🌿 Modèle CO₂ chargé depuis : {CO2_MODEL_PATH}")
     logger.info(f"📝 Features CO₂ chargées depuis : {CO2_FEATURES_PATH}")
 except Exception as e:
     logger.error(f"❌ Erreur lors du chargement des modèles ou des features : {e}")
     raise e
 
+# ============================================================
+# 🏗️ Paramètres de prétraitement embarqués avec les modèles
+#     (transformation brute → features appliquée par les services)
+# ============================================================
+preprocessing_params = load_preprocessing_params()
+
+# ============================================================
+# 📐 Données d'entraînement : plages des features (validation des
+#     requêtes) et contrôle de parité des tables de nœuds
+# ============================================================
+with stage("dataset_loading") as timer:
+    training_data = load_dataset(CLEANED_DATA_PATH) if CLEANED_DATA_PATH.exists() else None
+    timer.rows = len(training_data) if training_data is not None else None
+
 # ============================================================
 # 💾 Sauvegarde dans le Model Store BentoML avec custom_objects
 # ============================================================
 try:
     logger.info("💾 Sauvegarde des modèles dans le Model Store BentoML avec custom_objects...")
 
-    bentoml.sklearn.save_model(
-        "site_energy_use_model",
-        energy_model,
-        custom_objects={"features": energy_features}
-    )
+    energy_saved = register_model("site_energy_use_model", energy_model, energy_features, training_data,
+                                  preprocessing_params, metadata={"source": str(ENERGY_MODEL_PATH.name)})
     logger.success("✅ Modèle de consommation d'énergie sauvegardé dans BentoML.")
 
-    bentoml.sklearn.save_model(
-        "ghg_emissions_model",
-        co2_model,
-        custom_objects={"features": co2_features}
-    )
+    co2_saved = register_model("ghg_emissions_model", co2_model, co2_features, training_data, preprocessing_params,
+                               metadata={"source": str(CO2_MODEL_PATH.name)})
     logger.success("✅ Modèle des émissions de CO₂ sauvegardé dans BentoML.")
 
+    # 🪶 Variantes allégées : mesurées sur une réserve des données nettoyées (cibles incluses)
+    if args.variants and training_data is None:
+        logger.warning(f"⚠️ {CLEANED_DATA_PATH} absent : variantes non construites.")
+    elif args.variants:
+        with stage("variants"):
+            register_variants("site_energy_use_model", energy_model, energy_features, training_data,
+                              "site_energy_use", args.variants, preprocessing_params, parent_tag=str(energy_saved.tag))
+            register_variants("ghg_emissions_model", co2_model, co2_features, training_data, "ghg_emissions_total",
+                              args.variants, preprocessing_params, parent_tag=str(co2_saved.tag))
+        logger.success(f"✅ Variantes enregistrées : {', '.join(args.variants)}.")
+
 except Exception as e:
     logger.error(f"❌ Échec lors de la sauvegarde des modèles BentoML : {e}")
     raise e
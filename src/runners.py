@@ -0,0 +1,210 @@
+# ============================================================
+# 🏃 Construction des runners BentoML (src/runners.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Choisir le backend d'inférence par configuration
+#     (`INFERENCE_BACKEND`) sans modifier les services.
+# 📌 **Backends :**
+#     - "sklearn"    : modèle dépicklé, `predict` du wrapper (comme `to_runner`).
+#     - "flat_trees" : runner personnalisé évaluant les tables de
+#       nœuds compilées à l'enregistrement (`<modèle>/flat_trees/*.npy`).
+# ⏱️ Les deux runnables mesurent `model_compute` (src/observability.py).
+# ⏱️ Démarrage à froid : le runner "flat_trees" n'importe ni LightGBM
+#     ni scikit-learn et ne dépickle rien ; les tables sont projetées
+#     en mémoire (mmap) et partagées entre les workers d'un même hôte.
+# ♻️ Les deux runnables servent plusieurs versions d'un modèle pendant
+#     un remplacement à chaud (clé de version par ligne, src/hot_swap.py).
+# ============================================================
+
+import os
+import threading  # Chargement d'une nouvelle version pendant les prédictions
+import time
+import numpy as np  # Lignes groupées par version
+import bentoml  # Framework pour le déploiement rapide de modèles ML
+from loguru import logger  # Gestion avancée et lisible des logs
+from src.tree_compiler import FlatTreeEnsemble, FLAT_TREES_DIR  # Évaluation numpy des arbres aplatis
+from src.observability import timed  # Durée du calcul seul, côté runner
+from src.hot_swap import version_key  # Version de chaque ligne (remplacement à chaud)
+from src.explain import tree_contributions  # Attributions par feature (endpoints `/explain_*`)
+from src.config import (
+    INFERENCE_BACKEND, RUNNER_MAX_BATCH_SIZE, RUNNER_MAX_LATENCY_MS, FLAT_TREES_MMAP, HOT_SWAP_DRAIN_SECONDS,
+    SERVED_VARIANTS,
+)
+
+INFERENCE_BACKENDS = ("sklearn", "flat_trees")
+
+
+class VersionedRunnable(bentoml.Runnable):
+    """
+    📄 **Description :**
+    - Garde un ou plusieurs modèles d'un même nom, indexés par `version_key(tag)`
+      (remplacement à chaud, voir src/hot_swap.py).
+    - `predict(matrix, keys)` : chaque ligne est prédite par la version de sa clé ;
+      sans `keys`, par la dernière version utilisée.
+    - `predict_bulk(matrix, keys)` : même calcul hors micro-batching, pour une grande
+      matrice en un appel (scénarios « what-if », src/what_if.py).
+    - `explain(matrix, keys)` : attributions par feature `(n, k + 1)` de chaque ligne,
+      micro-batchées comme `predict` (src/explain.py).
+    - Une clé inconnue est résolue dans le store puis chargée à la demande.
+    - Toute version autre que la dernière utilisée est libérée après
+      `HOT_SWAP_DRAIN_SECONDS` sans requête (requêtes en vol drainées).
+    """
+
+    SUPPORTED_RESOURCES = ("cpu",)
+
+    def __init__(self, model_tag):
+        model_ref = bentoml.models.get(model_tag)
+        self.model_name = model_ref.tag.name
+        self.endpoint = f"runner:{self.model_name}"
+        self._lock = threading.Lock()  # Un seul chargement à la fois
+        self._versions = {}  # clé → [tag, modèle, dernier usage]
+        self._explained = {}  # clé → modèle d'arbres expliqué (chargé à la première explication)
+        self._latest = self._load(model_ref)  # Dernière version utilisée (jamais libérée)
+
+    def load_model(self, model_ref):
+        raise NotImplementedError
+
+    def load_explained_model(self, tag, model):
+        """🔍 Modèle dont on calcule les attributions (défaut : le modèle servi)."""
+        return model
+
+    def _load(self, model_ref):
+        key = version_key(model_ref.tag)
+        with self._lock:
+            if key not in self._versions:
+                self._versions[key] = [model_ref.tag, self.load_model(model_ref), time.monotonic()]
+                logger.info(f"📥 {self.endpoint} : version {model_ref.tag} chargée.")
+        return key
+
+    def _entry(self, key):
+        """📌 `[tag, modèle, dernier usage]` de la version `key`, chargée si besoin."""
+        entry = self._versions.get(key)
+        while entry is None:  # Une éviction concurrente peut retirer la version entre chargement et lecture
+            model_ref = next((ref for ref in bentoml.models.list(self.model_name) if version_key(ref.tag) == key), None)
+            if model_ref is None:
+                raise ValueError(f"❌ Version inconnue pour {self.model_name} (clé {key}).")
+            self._load(model_ref)
+            entry = self._versions.get(key)
+        entry[2] = time.monotonic()
+        self._latest = key
+        return entry
+
+    def _model(self, key):
+        return self._entry(key)[1]
+
+    def _explained_model(self, key):
+        tag, model, _ = self._entry(key)
+        explained = self._explained.get(key)
+        if explained is None:
+            explained = self._explained[key] = self.load_explained_model(tag, model)
+        return explained
+
+    def _evict_drained(self):
+        evicted = []
+        with self._lock:  # Mêmes dictionnaires que `_load`, lots concurrents (SUPPORTS_CPU_MULTI_THREADING)
+            now = time.monotonic()
+            for key, (tag, _, last_used) in list(self._versions.items()):
+                if key != self._latest and now - last_used > HOT_SWAP_DRAIN_SECONDS:
+                    del self._versions[key]
+                    self._explained.pop(key, None)
+                    evicted.append(tag)
+        for tag in evicted:
+            logger.info(f"🧹 {self.endpoint} : version {tag} drainée et libérée.")
+
+    @bentoml.Runnable.method(batchable=True, batch_dim=0)
+    def predict(self, matrix, keys=None):
+        return self._by_version(matrix, keys, lambda key, rows: self._model(key).predict(rows), "model_compute")
+
+    @bentoml.Runnable.method(batchable=False)
+    def predict_bulk(self, matrix, keys=None):
+        return self._by_version(matrix, keys, lambda key, rows: self._model(key).predict(rows), "model_compute")
+
+    @bentoml.Runnable.method(batchable=True, batch_dim=0)
+    def explain(self, matrix, keys=None):
+        return self._by_version(matrix, keys, lambda key, rows: tree_contributions(self._explained_model(key), rows),
+                                "explain_compute")
+
+    def _by_version(self, matrix, keys, compute, stage):
+        """🔀 `compute(clé, lignes)` appliqué aux lignes de chaque version (une seule en général)."""
+        with timed(self.endpoint, stage):
+            if keys is None or len(keys) == 0:
+                return compute(self._latest, matrix)
+            keys = np.asarray(keys)
+            if (keys == keys[0]).all():  # Cas courant : une seule version dans le lot
+                results = compute(int(keys[0]), matrix)
+            else:
+                parts = {int(key): keys == key for key in np.unique(keys)}
+                computed = {key: compute(key, matrix[rows]) for key, rows in parts.items()}
+                first = next(iter(computed.values()))
+                results = np.empty((len(matrix),) + np.shape(first)[1:])
+                for key, rows in parts.items():
+                    results[rows] = computed[key]
+        if len(self._versions) > 1:
+            self._evict_drained()
+        return results
+
+
+class SklearnRunnable(VersionedRunnable):
+    """🤖 Runnable exposant `predict` du modèle dépicklé (équivalent de `to_runner`)."""
+
+    SUPPORTS_CPU_MULTI_THREADING = True
+
+    def load_model(self, model_ref):
+        return bentoml.sklearn.load_model(model_ref)
+
+
+class FlatTreeRunnable(VersionedRunnable):
+    """🌲 Runnable exposant `predict` sur les tables de nœuds d'un modèle du store."""
+
+    SUPPORTS_CPU_MULTI_THREADING = False
+
+    def load_model(self, model_ref):
+        return FlatTreeEnsemble.load(model_ref.path_of(FLAT_TREES_DIR), mmap=FLAT_TREES_MMAP)
+
+    def load_explained_model(self, tag, model):
+        # Tables de nœuds sans valeurs internes : le modèle d'origine est dépicklé à la première explication
+        return bentoml.sklearn.load_model(tag)
+
+
+def make_runner(model_ref, backend=INFERENCE_BACKEND, max_batch_size=RUNNER_MAX_BATCH_SIZE,
+                max_latency_ms=RUNNER_MAX_LATENCY_MS):
+    """
+    📄 **Description :**
+    - Retourne un runner dont la méthode `predict` accepte une matrice `(n, k)`.
+    - Micro-batching adaptatif identique quel que soit le backend.
+    """
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(f"❌ Backend d'inférence inconnu : {backend} (attendu : {INFERENCE_BACKENDS})")
+    runnable, name = SklearnRunnable, model_ref.tag.name
+    if backend == "flat_trees":
+        if os.path.isdir(model_ref.path_of(FLAT_TREES_DIR)):
+            logger.info(f"🌲 Backend flat_trees pour {model_ref.tag}")
+            runnable, name = FlatTreeRunnable, f"{model_ref.tag.name}_flat_trees"
+        else:
+            logger.warning(f"⚠️ {model_ref.tag} enregistré sans tables de nœuds : repli sur le backend sklearn.")
+    return bentoml.Runner(
+        runnable,
+        name=name,
+        runnable_init_params={"model_tag": str(model_ref.tag)},
+        models=[model_ref],
+        max_batch_size=max_batch_size,
+        max_latency_ms=max_latency_ms,
+    )
+
+
+def make_variant_runners(model_name, variants=SERVED_VARIANTS):
+    """
+    📄 **Description :**
+    - Un runner par variante allégée enregistrée (`<model_name>_<variante>:latest`,
+      src/variants.py) ; les variantes absentes du store sont ignorées.
+    - Retourne `{variante: (runner, model_ref)}`.
+    """
+    runners = {}
+    for variant in variants:
+        try:
+            model_ref = bentoml.models.get(f"{model_name}_{variant}:latest")
+        except bentoml.exceptions.NotFound:
+            continue
+        runners[variant] = (make_runner(model_ref), model_ref)
+    if runners:
+        logger.info(f"🪶 Variantes servies pour {model_name} : {sorted(runners)}")
+    return runners
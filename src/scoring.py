@@ -0,0 +1,269 @@
+# ============================================================
+# 📦 Scoring hors ligne de fichiers complets (src/scoring.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Re-scorer tout le parc de bâtiments sans
+#     passer par les services HTTP.
+# 📌 **Fonctionnement :**
+#     - Charge `site_energy_use_model:latest` et/ou
+#       `ghg_emissions_model:latest` depuis le store BentoML.
+#     - Lit le fichier d'entrée (CSV ou Parquet) par morceaux.
+#     - Une seule prédiction vectorisée par morceau et par modèle.
+#     - Écrit les résultats au fil de l'eau (CSV ou Parquet).
+# 🔗 Si `site_energy_use` manque en entrée, la prédiction Énergie
+#     alimente le modèle CO₂ (comme `/predict_building`).
+# 🧵 Mode parallèle (`--workers N`) : chaque morceau est découpé en
+#     tranches scorées par un pool de processus ; chaque processus
+#     charge les modèles une seule fois et plafonne ses threads.
+# ============================================================
+
+import argparse  # Ligne de commande `score`
+import multiprocessing  # Pool de processus du mode parallèle
+import os
+import sys
+import time
+from pathlib import Path
+import numpy as np  # Manipulation numérique efficace
+import pandas as pd  # Lecture / écriture par morceaux
+from loguru import logger  # Gestion avancée et lisible des logs
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))  # 🔗 Racine du projet (import `src.*`)
+
+from src.config import SCORING_CHUNKSIZE, SCORING_WORKERS, SCORING_THREADS_PER_WORKER
+
+# 🎯 Modèles disponibles : cible → (modèle BentoML, colonne de sortie)
+SCORING_TARGETS = {
+    "energy": ("site_energy_use_model:latest", "site_energy_use"),
+    "co2": ("ghg_emissions_model:latest", "ghg_emissions_total"),
+}
+PARQUET_SUFFIXES = {".parquet", ".pq"}
+THREAD_ENV_VARS = ["OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"]
+
+
+# ============================================================
+# 🤖 Modèle prêt à scorer
+# ============================================================
+class ScoringModel:
+    """
+    📄 **Description :**
+    - Regroupe un estimateur, ses features (dans l'ordre d'entraînement)
+      et le nom de la colonne de prédiction produite.
+    """
+
+    def __init__(self, model, features, output, tag="local"):
+        self.model = model
+        self.features = list(features)
+        self.output = output
+        self.tag = str(tag)
+
+    def predict(self, frame):
+        """🔮 Prédiction vectorisée sur toutes les lignes de `frame`."""
+        return self.model.predict(frame[self.features].to_numpy(dtype=np.float64))
+
+
+def load_scoring_model(target):
+    """📥 Charge le modèle `:latest` d'une cible depuis le store BentoML."""
+    import bentoml  # Import local : inutile pour les tests et les autres commandes
+
+    model_tag, output = SCORING_TARGETS[target]
+    model_ref = bentoml.sklearn.get(model_tag)
+    logger.info(f"📥 Modèle chargé : {model_ref.tag}")
+    return ScoringModel(bentoml.sklearn.load_model(model_ref), model_ref.custom_objects["features"], output, model_ref.tag)
+
+
+# ============================================================
+# 📂 Lecture par morceaux
+# ============================================================
+def iter_chunks(path, chunksize):
+    """📂 Itère sur un CSV, un Parquet ou un Feather par morceaux de `chunksize` lignes."""
+    path = Path(path)
+    if path.suffix.lower() in PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq  # Dépendance optionnelle, chargée uniquement pour ce format
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    elif path.suffix.lower() == ".feather":
+        import pyarrow as pa  # Feather non compressé : lu par projection mémoire, sans copie
+
+        with pa.memory_map(str(path)) as source:
+            for batch in pa.ipc.open_file(source).read_all().to_batches(max_chunksize=chunksize):
+                yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+# ============================================================
+# 💾 Écriture incrémentale
+# ============================================================
+class ChunkWriter:
+    """💾 Ajoute les morceaux scorés à un CSV (en-tête unique) ou à un Parquet."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.parquet = self.path.suffix.lower() in PARQUET_SUFFIXES
+        self.writer = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, frame):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.path, table.schema)
+            self.writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="w" if self.writer is None else "a", header=self.writer is None, index=False)
+            self.writer = True
+
+    def close(self):
+        if self.parquet and self.writer is not None:
+            self.writer.close()
+
+
+# ============================================================
+# 🔮 Scoring d'un morceau
+# ============================================================
+def score_chunk(chunk, models, id_columns=()):
+    """
+    📄 **Description :**
+    - Retourne un DataFrame `id_columns + une colonne de prédiction par modèle`.
+    - Les modèles sont appliqués dans l'ordre : une prédiction peut servir
+      de feature au modèle suivant si la colonne manque en entrée.
+    """
+    result = chunk[list(id_columns)].copy()
+    for scoring_model in models:
+        missing = [f for f in scoring_model.features if f not in chunk.columns]
+        if missing:
+            raise ValueError(f"❌ Colonnes manquantes pour '{scoring_model.output}' : {missing}")
+        predictions = scoring_model.predict(chunk)
+        result[scoring_model.output] = predictions
+        if scoring_model.output not in chunk.columns:
+            chunk = chunk.assign(**{scoring_model.output: predictions})
+    return result
+
+
+# ============================================================
+# 🧵 Scoring parallèle (pool de processus)
+# ============================================================
+_worker_models = None  # Modèles chargés une fois par processus du pool
+
+
+def _init_worker(models, threads):
+    """🧵 Initialise un processus : plafond de threads, puis chargement des modèles."""
+    global _worker_models
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads)  # ⚠️ Avant le chargement d'OpenMP par LightGBM
+    _worker_models = [m if isinstance(m, ScoringModel) else load_scoring_model(m) for m in models]
+    for scoring_model in _worker_models:
+        if hasattr(scoring_model.model, "n_jobs"):
+            scoring_model.model.n_jobs = threads  # LightGBM / XGBoost : threads utilisés par `predict`
+    from threadpoolctl import threadpool_limits  # Fourni avec scikit-learn
+    threadpool_limits(limits=threads)
+
+
+def _score_shard(args):
+    shard, id_columns = args
+    return score_chunk(shard, _worker_models, id_columns)
+
+
+class ParallelScorer:
+    """
+    📄 **Description :**
+    - Pool de `workers` processus (démarrage `spawn`, sans état OpenMP hérité).
+    - `models` : noms de cibles (`"energy"`, `"co2"`, chargés depuis le store
+      dans chaque processus) ou objets `ScoringModel` déjà construits.
+    - `score(frame)` découpe en tranches, les score en parallèle et les
+      réassemble dans l'ordre d'origine.
+
+    💡 S'utilise comme contexte : `with ParallelScorer(["energy", "co2"], workers=4) as scorer: ...`
+    """
+
+    def __init__(self, models, workers=SCORING_WORKERS, threads_per_worker=SCORING_THREADS_PER_WORKER):
+        self.workers = max(1, int(workers))
+        context = multiprocessing.get_context("spawn")
+        self.pool = context.Pool(self.workers, initializer=_init_worker, initargs=(list(models), threads_per_worker))
+        logger.info(f"🧵 Pool de scoring : {self.workers} processus × {threads_per_worker} thread(s).")
+
+    def score(self, frame, id_columns=()):
+        """🔮 Score un DataFrame ; résultat dans l'ordre des lignes d'entrée."""
+        bounds = np.linspace(0, len(frame), min(self.workers, len(frame)) + 1, dtype=int)
+        shards = [(frame.iloc[start:stop], list(id_columns)) for start, stop in zip(bounds[:-1], bounds[1:])]
+        return pd.concat(self.pool.map(_score_shard, shards), ignore_index=True)
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def score_file(input_path, output_path, models, chunksize=SCORING_CHUNKSIZE, id_columns=(), workers=1,
+               threads_per_worker=SCORING_THREADS_PER_WORKER):
+    """
+    📄 **Description :**
+    - Lit `input_path` par morceaux, score chaque morceau et l'écrit aussitôt.
+    - La mémoire utilisée ne dépend que de `chunksize`, pas de la taille du fichier.
+    - `workers > 1` : chaque morceau est réparti sur un `ParallelScorer`
+      (`models` peut alors aussi contenir des noms de cibles).
+
+    📤 Retourne le nombre de lignes scorées.
+    """
+    writer = ChunkWriter(output_path)
+    scorer = ParallelScorer(models, workers, threads_per_worker) if workers > 1 else None
+    n_rows = 0
+    start = time.perf_counter()
+    try:
+        for chunk in iter_chunks(input_path, chunksize):
+            scored = scorer.score(chunk, id_columns) if scorer else score_chunk(chunk, models, id_columns)
+            writer.write(scored)
+            n_rows += len(chunk)
+            logger.info(f"🔮 {n_rows} lignes scorées...")
+    finally:
+        writer.close()
+        if scorer:
+            scorer.close()
+    elapsed = time.perf_counter() - start
+    logger.success(f"✅ {n_rows} lignes scorées en {elapsed:.2f}s → {output_path}")
+    return n_rows
+
+
+# ============================================================
+# 🏃 Point d'entrée `score`
+# ============================================================
+def build_parser():
+    parser = argparse.ArgumentParser(prog="score", description="Scoring hors ligne d'un fichier CSV / Parquet.")
+    parser.add_argument("input", type=Path, help="Fichier d'entrée (.csv, .parquet).")
+    parser.add_argument("output", type=Path, help="Fichier de sortie (.csv, .parquet).")
+    parser.add_argument("--models", nargs="+", choices=sorted(SCORING_TARGETS), default=["energy", "co2"],
+                        help="Modèles à appliquer (Énergie avant CO₂ pour le chaînage).")
+    parser.add_argument("--chunksize", type=int, default=SCORING_CHUNKSIZE)
+    parser.add_argument("--id-columns", nargs="*", default=[], help="Colonnes recopiées telles quelles en sortie.")
+    parser.add_argument("--workers", type=int, default=SCORING_WORKERS, help="Processus de scoring (1 = séquentiel).")
+    parser.add_argument("--threads-per-worker", type=int, default=SCORING_THREADS_PER_WORKER,
+                        help="Plafond de threads OpenMP/BLAS par processus.")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    targets = sorted(set(args.models), key=list(SCORING_TARGETS).index)  # ⚡ Énergie d'abord
+    # 🧵 En parallèle, chaque processus charge lui-même les modèles (rien de gros à transférer)
+    models = targets if args.workers > 1 else [load_scoring_model(target) for target in targets]
+    score_file(args.input, args.output, models, chunksize=args.chunksize, id_columns=args.id_columns,
+               workers=args.workers, threads_per_worker=args.threads_per_worker)
+
+
+if __name__ == "__main__":
+    main()
+
+# ============================================================
+# 🎉 Exemples :
+#     ➔ python src/scoring.py data/processed/dataset_cleaned.csv logs/scores.csv
+#     ➔ score buildings.parquet scores.parquet --models energy --chunksize 500000
+#     ➔ score buildings.parquet scores.parquet --workers 8 --threads-per-worker 1
+# ============================================================
@@ -0,0 +1,213 @@
+# ============================================================
+# 🏢 **API BentoML : Service combiné Énergie + CO₂**
+# 📚 **Un seul processus, deux runners, prédiction chaînée**
+# ============================================================
+
+# ============================================================
+# 🔧 **Service : Énergie + CO₂ (src/service.py)**
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Servir les deux modèles dans un même service
+#     (référencé par `bentofile.yaml`).
+# 📌 **Rôle :**
+#     - Réexpose les endpoints des services Énergie et CO₂
+#       (mêmes fonctions, mêmes runners, aucun code dupliqué).
+#     - Ajoute `/predict_building` : la consommation prédite est
+#       injectée dans la feature `site_energy_use` du modèle CO₂
+#       sans aller-retour réseau entre deux services.
+# ✅ **Port dédié :** 3000 par défaut (COMBINED_SERVICE_PORT)
+# ============================================================
+
+# 📦 **Imports nécessaires et leur rôle**
+from functools import lru_cache  # Disposition bâtiment par couple de versions
+import bentoml  # Framework pour le déploiement rapide de modèles ML
+from bentoml.io import JSON, File  # Entrées/sorties JSON et binaires
+from pydantic import BaseModel, Field  # Validation robuste des données
+from typing import Optional  # Variante facultative
+import numpy as np  # Manipulation numérique efficace
+from loguru import logger  # Gestion avancée et lisible des logs
+from src.prediction_cache import predict_with_cache  # Cache LRU/TTL des prédictions
+from src.observability import timed, sample_request_log  # Métriques et logs échantillonnés
+from src.validation import FeatureValidator  # Finitude et plages en une passe numpy
+from src.grpc_service import mount_prediction_servicer  # Interface gRPC (mêmes runners)
+from src.hot_swap import select_slot  # Modèle complet ou variante allégée
+from src.config import (  # Port, taille de lot et validation
+    COMBINED_SERVICE_PORT, RUNNER_MAX_BATCH_SIZE, VALIDATION_MAX_ERRORS,
+)
+from src.energy_service import (  # Runner, version servie et endpoints Énergie
+    energy_runner, energy_variant_runners, energy_slot, energy_slots, energy_cache, energy_cache_stats,
+    energy_grpc_target, EnergyRawInputData,
+    predict_energy, predict_energy_batch, predict_energy_binary, predict_energy_raw, reload_energy_model,
+    what_if_energy, explain_energy, drift_energy,
+)
+from src.co2_service import (  # Runner, version servie et endpoints CO₂
+    co2_runner, co2_variant_runners, co2_slot, co2_slots, co2_cache, co2_cache_stats,
+    co2_grpc_target, CO2RawInputData,
+    predict_co2, predict_co2_batch, predict_co2_binary, predict_co2_raw, reload_co2_model,
+    what_if_co2, explain_co2, drift_co2,
+)
+
+# 🔗 **Features attendues pour un bâtiment complet**
+#    `site_energy_use` est exclue : elle est prédite par le modèle Énergie.
+#    La disposition dépend des deux versions servies (remplacement à chaud) :
+#    recalculée une fois par couple de versions.
+CHAINED_FEATURE = "site_energy_use"
+
+
+class BuildingLayout:
+    """
+    📄 **Description :**
+    - Union des features Énergie et CO₂ (hors `site_energy_use`), colonnes de
+      chaque modèle dans ce vecteur et validateur bâtiment.
+    - Plages par feature (marge déjà appliquée) : modèle Énergie, sinon modèle CO₂.
+    """
+
+    def __init__(self, energy_version, co2_version):
+        self.features = list(dict.fromkeys(
+            [f for f in energy_version.features + co2_version.features if f != CHAINED_FEATURE]
+        ))
+        self.energy_columns = [self.features.index(f) for f in energy_version.features]
+        self.co2_columns = [self.features.index(f) if f != CHAINED_FEATURE else -1 for f in co2_version.features]
+        self.chained_position = (co2_version.features.index(CHAINED_FEATURE)
+                                 if CHAINED_FEATURE in co2_version.features else None)
+        bounds = [self._bounds(f, energy_version, co2_version) for f in self.features]
+        self.validator = FeatureValidator(self.features, {"min": [lo for lo, _ in bounds], "max": [hi for _, hi in bounds]},
+                                          margin=0.0, max_errors=VALIDATION_MAX_ERRORS)
+
+    @staticmethod
+    def _bounds(feature, energy_version, co2_version):
+        version = energy_version if feature in energy_version.features else co2_version
+        position = version.features.index(feature)
+        return version.validator.lower[position], version.validator.upper[position]
+
+
+@lru_cache(maxsize=2)
+def building_layout(energy_version, co2_version):
+    """🏢 Disposition du bâtiment pour ce couple de versions (mise en cache)."""
+    return BuildingLayout(energy_version, co2_version)
+
+
+building_features = building_layout(energy_slot.current, co2_slot.current).features
+logger.info(f"🏢 Features bâtiment (Énergie ∪ CO₂) : {building_features}")
+
+# 🌐 **Définition du service combiné (nom attendu par bentofile.yaml)**
+EnergyCO2PredictionService = bentoml.Service(
+    name="energy_co2_prediction_service",
+    runners=[energy_runner, co2_runner,
+             *(runner for runner, _ in [*energy_variant_runners.values(), *co2_variant_runners.values()])]
+)
+
+# ♻️ **Endpoints existants réexposés sur le service combiné**
+EnergyCO2PredictionService.api(input=JSON(), output=JSON())(predict_energy)
+EnergyCO2PredictionService.api(input=JSON(), output=JSON())(predict_energy_batch)
+EnergyCO2PredictionService.api(input=JSON(), output=JSON())(predict_co2)
+EnergyCO2PredictionService.api(input=JSON(), output=JSON())(predict_co2_batch)
+EnergyCO2PredictionService.api(input=File(), output=JSON())(predict_energy_binary)
+EnergyCO2PredictionService.api(input=File(), output=JSON())(predict_co2_binary)
+EnergyCO2PredictionService.api(input=JSON(pydantic_model=EnergyRawInputData), output=JSON())(predict_energy_raw)
+EnergyCO2PredictionService.api(input=JSON(pydantic_model=CO2RawInputData), output=JSON())(predict_co2_raw)
+EnergyCO2PredictionService.api(input=JSON(), output=JSON())(energy_cache_stats)
+EnergyCO2PredictionService.api(input=JSON(), output=JSON())(co2_cache_stats)
+EnergyCO2PredictionService.api(input=JSON(), output=JSON())(reload_energy_model)
+EnergyCO2PredictionService.api(input=JSON(), output=JSON())(reload_co2_model)
+EnergyCO2PredictionService.api(input=JSON(), output=JSON())(what_if_energy)
+EnergyCO2PredictionService.api(input=JSON(), output=JSON())(what_if_co2)
+EnergyCO2PredictionService.api(input=JSON(), output=JSON())(explain_energy)
+EnergyCO2PredictionService.api(input=JSON(), output=JSON())(explain_co2)
+EnergyCO2PredictionService.api(input=JSON(), output=JSON())(drift_energy)
+EnergyCO2PredictionService.api(input=JSON(), output=JSON())(drift_co2)
+
+# 📡 **Interface gRPC : les deux cibles sur le même serveur (`serve-grpc`)**
+mount_prediction_servicer(EnergyCO2PredictionService, {"energy": energy_grpc_target, "co2": co2_grpc_target})
+
+# 📜 **Validation des données d'un bâtiment complet**
+class BuildingInputData(BaseModel):
+    """
+    📄 **Description :**
+    - Reçoit les features nommées d'un bâtiment (union des features Énergie et CO₂).
+    - `site_energy_use` n'est pas fournie : elle est prédite puis réinjectée.
+
+    💡 **Exemple JSON attendu :**
+    ```json
+    {
+        "features": {"site_eui": 0.46, "f_is_large_building": 0, "floors_cat": 3, "...": 0.0}
+    }
+    ```
+    """
+    features: dict[str, float] = Field(..., description=f"{len(building_features)} features nommées attendues.")
+    variant: Optional[str] = Field(None, description="Variante allégée des deux modèles (défaut : modèles complets).")
+
+# ✨ **Endpoint chaîné Énergie → CO₂**
+@EnergyCO2PredictionService.api(input=JSON(pydantic_model=BuildingInputData), output=JSON())
+async def predict_building(data: BuildingInputData):
+    """
+    🏢 **Endpoint :** `/predict_building`
+    - ⚡ Prédit la consommation énergétique du bâtiment.
+    - 🔗 Injecte cette prédiction dans la feature `site_energy_use` du modèle CO₂.
+    - 🌿 Prédit les émissions de CO₂ dans le même processus.
+    - 🪶 `"variant"` (optionnel) : même variante allégée pour les deux modèles.
+
+    📝 **Réponse JSON exemple :**
+    ```json
+    {
+        "site_energy_use": 135000.50,
+        "ghg_emissions_total": 250.75,
+        "model_tags": {"energy": "site_energy_use_model:3yq2nbq5ngkcqhqa", "co2": "ghg_emissions_model:4ffx2ybq5ogkcqhq"}
+    }
+    ```
+    """
+    try:
+        energy_version = select_slot(energy_slots, data.variant).acquire()  # ♻️ Versions de la requête
+        co2_version = select_slot(co2_slots, data.variant).acquire()
+        layout = building_layout(energy_version, co2_version)
+        with timed("predict_building", "validation"):
+            missing = [f for f in layout.features if f not in data.features]
+            if missing:
+                raise ValueError(f"❌ Features manquantes : {missing}")
+        with timed("predict_building", "array_conversion"):
+            building = np.array([data.features[f] for f in layout.features], dtype=np.float64)
+        with timed("predict_building", "validation"):
+            layout.validator.check(building.reshape(1, -1))
+        with timed("predict_building", "array_conversion"):
+            energy_input = building[layout.energy_columns].reshape(1, -1)
+        energy_pred = await predict_with_cache(energy_cache, energy_version.runner_method, energy_input,
+                                               energy_version.tag, RUNNER_MAX_BATCH_SIZE, endpoint="predict_building")
+
+        co2_input = building[layout.co2_columns].reshape(1, -1)  # -1 : colonne remplacée ci-dessous
+        if layout.chained_position is not None:
+            co2_input[0, layout.chained_position] = energy_pred[0]
+        with timed("predict_building", "drift_stats"):
+            energy_version.observe(energy_input)  # 📡 Entrées réellement vues par chaque modèle
+            co2_version.observe(co2_input)
+        co2_pred = await predict_with_cache(co2_cache, co2_version.runner_method, co2_input, co2_version.tag,
+                                            RUNNER_MAX_BATCH_SIZE, endpoint="predict_building")
+
+        if sample_request_log():
+            logger.info(f"🏢 Résultat : {energy_pred[0]:.2f} kBtu → {co2_pred[0]:.2f} tonnes.")
+        with timed("predict_building", "serialization"):
+            return {"site_energy_use": float(energy_pred[0]), "ghg_emissions_total": float(co2_pred[0]),
+                    "model_tags": {"energy": str(energy_version.tag), "co2": str(co2_version.tag)}}
+    except Exception as e:
+        logger.error(f"❌ Erreur bâtiment : {str(e)}")
+        return {"error": str(e)}
+
+# ============================================================
+# 🏃 **Commandes d'exécution locale**
+# ------------------------------------------------------------
+# 🏢 Énergie + CO₂ :
+#    ➔ bentoml serve src.service:EnergyCO2PredictionService --reload --port 3000
+#    ➔ gRPC : bentoml serve-grpc src.service:EnergyCO2PredictionService --port 50051
+#             (service `energy_co2.prediction.v1.Prediction`, voir src/protos/prediction.proto)
+#    ➔ Endpoints : /predict_energy, /predict_energy_batch, /predict_energy_binary,
+#                  /predict_energy_raw, /predict_co2, /predict_co2_batch,
+#                  /predict_co2_binary, /predict_co2_raw,
+#                  /predict_building, /what_if_energy, /what_if_co2,
+#                  /explain_energy, /explain_co2, /drift_energy, /drift_co2,
+#                  /energy_cache_stats, /co2_cache_stats,
+#                  /reload_energy_model, /reload_co2_model (admin, remplacement à chaud)
+# 🌐 Swagger UI :
+#    ➔ http://127.0.0.1:3000
+# ============================================================
+
+if __name__ == "__main__":
+    logger.info(f"🚀 ✅ Service combiné Énergie + CO₂ prêt sur le port {COMBINED_SERVICE_PORT}.")
+    logger.info("📝 Lancement manuel : bentoml serve src.service:EnergyCO2PredictionService --reload --port 3000")
@@ -0,0 +1,430 @@
+# ============================================================
+# 🏋️ Recherche d'hyperparamètres et entraînement (src/training.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Remplacer la session notebook (p6_ml_analysis)
+#     par une commande rejouable : recherche, sélection et
+#     enregistrement du meilleur modèle dans le store BentoML.
+# 📌 **Fonctionnement :**
+#     - Données : `CLEANED_DATA_PATH` (features + cibles, `.feather` si présent), features
+#       finales du notebook (`*_FEATURES_PATH`), jeu de test 20 %.
+#     - Familles : LightGBM, XGBoost (si installé), Random Forest ;
+#       candidats tirés au hasard dans des espaces de recherche.
+#     - Successive halving : tous les candidats sont évalués en
+#       validation croisée sur peu de lignes, seul le meilleur tiers
+#       passe au palier suivant avec 3× plus de lignes.
+#     - Boosting : arrêt anticipé sur le pli de validation ; le modèle
+#       final garde la médiane des meilleures itérations.
+#     - Essais (candidat × pli) répartis sur tous les cœurs (joblib),
+#       un thread par modèle pour ne pas sursouscrire le CPU.
+# 💾 Le gagnant est enregistré via `src/model_registry.py`
+#     (mêmes custom_objects que `register_models_bentoml.py`).
+# ♻️ Mode incrémental (`--incremental NOUVEAU.csv`) : le modèle
+#     `:latest` est prolongé de quelques arbres entraînés sur les
+#     seules nouvelles lignes, puis ré-enregistré avec sa lignée.
+#     Fichier attendu : `data/processed/<brut>_model_features.csv`,
+#     écrit par `preprocess_data_for_models.py --append <brut>.csv`.
+# ============================================================
+
+import argparse  # Ligne de commande `train`
+import copy
+import hashlib  # Empreinte des fichiers ajoutés (lignée)
+import json
+import sys
+import time
+from pathlib import Path
+import joblib  # Features finales + parallélisme des essais
+import numpy as np  # Manipulation numérique efficace
+from loguru import logger  # Gestion avancée et lisible des logs
+from scipy.stats import loguniform, randint, uniform  # Distributions des espaces de recherche
+from sklearn.model_selection import KFold, ParameterSampler, train_test_split
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))  # 🔗 Racine du projet (import `src.*`)
+
+from src.config import (
+    CLEANED_DATA_PATH, ENERGY_FEATURES_PATH, CO2_FEATURES_PATH, LOGS_DIR, RANDOM_STATE,
+    TRAINING_CV_FOLDS, TRAINING_TEST_SIZE, TRAINING_CANDIDATES, TRAINING_HALVING_FACTOR,
+    TRAINING_MAX_TREES, TRAINING_EARLY_STOPPING_ROUNDS, TRAINING_N_JOBS,
+    INCREMENTAL_EXTRA_TREES, INCREMENTAL_HOLDOUT,
+)
+from src.datasets import load_dataset  # Feather projeté en mémoire si disponible, sinon CSV
+
+# 🎯 Cibles entraînables : cible → (colonne cible, modèle BentoML, fichier des features)
+TRAINING_TARGETS = {
+    "energy": ("site_energy_use", "site_energy_use_model", ENERGY_FEATURES_PATH),
+    "co2": ("ghg_emissions_total", "ghg_emissions_model", CO2_FEATURES_PATH),
+}
+
+# 🔍 Espaces de recherche par famille (distributions scipy ou listes)
+SEARCH_SPACES = {
+    "lightgbm": {
+        "learning_rate": loguniform(0.01, 0.3),
+        "num_leaves": randint(8, 128),
+        "min_child_samples": randint(5, 60),
+        "subsample": uniform(0.6, 0.4),
+        "subsample_freq": [1],
+        "colsample_bytree": uniform(0.6, 0.4),
+        "reg_lambda": loguniform(1e-3, 10),
+    },
+    "xgboost": {
+        "learning_rate": loguniform(0.01, 0.3),
+        "max_depth": randint(3, 10),
+        "min_child_weight": loguniform(0.5, 20),
+        "subsample": uniform(0.6, 0.4),
+        "colsample_bytree": uniform(0.6, 0.4),
+        "reg_lambda": loguniform(1e-3, 10),
+    },
+    "random_forest": {
+        "n_estimators": randint(100, 400),
+        "max_depth": [None, 8, 12, 20],
+        "min_samples_leaf": randint(1, 10),
+        "max_features": [1.0, 0.7, 0.5, "sqrt"],
+    },
+}
+
+
+# ============================================================
+# 🧱 Construction et ajustement d'un modèle d'une famille donnée
+# ============================================================
+def available_families(families=None):
+    """🧩 Familles demandées dont la bibliothèque est installée (XGBoost est optionnel)."""
+    selected = []
+    for family in families or list(SEARCH_SPACES):
+        if family == "xgboost":
+            try:
+                import xgboost  # noqa: F401
+            except ImportError:
+                logger.warning("⚠️ XGBoost non installé : famille ignorée.")
+                continue
+        selected.append(family)
+    return selected
+
+
+def make_estimator(family, params, n_estimators=None):
+    """🏗️ Estimateur sklearn-compatible, un seul thread (le parallélisme est entre essais)."""
+    params = dict(params)
+    if family == "lightgbm":
+        import lightgbm as lgb
+        return lgb.LGBMRegressor(n_estimators=n_estimators or TRAINING_MAX_TREES, random_state=RANDOM_STATE,
+                                 n_jobs=1, verbose=-1, **params)
+    if family == "xgboost":
+        import xgboost as xgb
+        early_stopping = None if n_estimators else TRAINING_EARLY_STOPPING_ROUNDS
+        return xgb.XGBRegressor(n_estimators=n_estimators or TRAINING_MAX_TREES, random_state=RANDOM_STATE,
+                                n_jobs=1, early_stopping_rounds=early_stopping, **params)
+    if family == "random_forest":
+        from sklearn.ensemble import RandomForestRegressor
+        return RandomForestRegressor(random_state=RANDOM_STATE, n_jobs=1, **params)
+    raise ValueError(f"❌ Famille de modèles inconnue : {family}")
+
+
+def fit_with_early_stopping(family, params, X_train, y_train, X_valid, y_valid):
+    """⏱️ Ajuste un candidat ; retourne `(modèle, meilleure itération ou None)`."""
+    model = make_estimator(family, params)
+    if family == "lightgbm":
+        import lightgbm as lgb
+        model.fit(X_train, y_train, eval_set=[(X_valid, y_valid)],
+                  callbacks=[lgb.early_stopping(TRAINING_EARLY_STOPPING_ROUNDS, verbose=False)])
+        return model, int(model.best_iteration_ or TRAINING_MAX_TREES)
+    if family == "xgboost":
+        model.fit(X_train, y_train, eval_set=[(X_valid, y_valid)], verbose=False)
+        return model, int(model.best_iteration) + 1
+    model.fit(X_train, y_train)
+    return model, None
+
+
+def evaluate_trial(family, params, X, y, train_index, valid_index):
+    """🧪 Un essai = un candidat sur un pli ; retourne `(rmse, meilleure itération)`."""
+    model, best_iteration = fit_with_early_stopping(family, params, X[train_index], y[train_index],
+                                                    X[valid_index], y[valid_index])
+    rmse = float(np.sqrt(mean_squared_error(y[valid_index], model.predict(X[valid_index]))))
+    return rmse, best_iteration
+
+
+# ============================================================
+# ✂️ Successive halving sur les candidats de toutes les familles
+# ============================================================
+def sample_candidates(families, n_candidates, random_state=RANDOM_STATE):
+    """🎲 `n_candidates` jeux d'hyperparamètres par famille."""
+    candidates = []
+    for offset, family in enumerate(families):
+        sampler = ParameterSampler(SEARCH_SPACES[family], n_iter=n_candidates, random_state=random_state + offset)
+        candidates += [{"family": family, "params": params} for params in sampler]
+    return candidates
+
+
+def successive_halving(candidates, X, y, folds=TRAINING_CV_FOLDS, factor=TRAINING_HALVING_FACTOR,
+                       n_jobs=TRAINING_N_JOBS, random_state=RANDOM_STATE):
+    """
+    📄 **Description :**
+    - Palier `r` : candidats survivants évalués sur tous les plis, avec
+      `factor^(r - dernier)` des lignes d'entraînement de chaque pli.
+    - Les sous-échantillons sont emboîtés (mêmes premières lignes d'une
+      permutation fixe) : un palier n'ajoute que des données.
+    - Retourne les candidats du dernier palier triés par RMSE moyen, avec
+      l'historique des paliers.
+    """
+    n_rungs = 1  # Dernier palier : au moins `factor` candidats
+    while len(candidates) // factor ** n_rungs >= factor:
+        n_rungs += 1
+    splits = list(KFold(n_splits=folds, shuffle=True, random_state=random_state).split(X))
+    rng = np.random.default_rng(random_state)
+    splits = [(rng.permutation(train_index), valid_index) for train_index, valid_index in splits]
+    survivors, history = list(candidates), []
+
+    for rung in range(n_rungs):
+        fraction = factor ** (rung - n_rungs + 1)
+        start = time.perf_counter()
+        trials = [(candidate, train_index[:max(int(len(train_index) * fraction), folds * 2)], valid_index)
+                  for candidate in survivors for train_index, valid_index in splits]
+        results = joblib.Parallel(n_jobs=n_jobs)(
+            joblib.delayed(evaluate_trial)(c["family"], c["params"], X, y, train_index, valid_index)
+            for c, train_index, valid_index in trials
+        )
+        for position, candidate in enumerate(survivors):
+            scores = results[position * folds:(position + 1) * folds]
+            candidate["cv_rmse"] = float(np.mean([rmse for rmse, _ in scores]))
+            iterations = [iteration for _, iteration in scores if iteration is not None]
+            candidate["n_estimators"] = int(np.median(iterations)) if iterations else None
+        survivors.sort(key=lambda c: c["cv_rmse"])
+        history.append({"rung": rung, "fraction": fraction, "candidates": len(survivors),
+                        "best_rmse": survivors[0]["cv_rmse"], "seconds": round(time.perf_counter() - start, 2)})
+        logger.info(f"✂️ Palier {rung} : {len(survivors)} candidats sur {fraction:.0%} des lignes, "
+                    f"meilleur RMSE {survivors[0]['cv_rmse']:.4f} ({survivors[0]['family']}) "
+                    f"en {history[-1]['seconds']} s")
+        if rung < n_rungs - 1:
+            survivors = survivors[:max(1, len(survivors) // factor)]
+    return survivors, history
+
+
+# ============================================================
+# 🏆 Pipeline complet pour une cible
+# ============================================================
+def load_training_data(target, data_path=CLEANED_DATA_PATH, features=None):
+    """📂 `(X, y, features, frame)` pour une cible de `TRAINING_TARGETS`."""
+    target_column, _, features_path = TRAINING_TARGETS[target]
+    features = list(features or joblib.load(features_path))
+    frame = load_dataset(data_path)
+    missing = [col for col in features + [target_column] if col not in frame.columns]
+    if missing:
+        raise ValueError(f"❌ Colonnes absentes de {data_path} : {missing}")
+    frame = frame[features + [target_column]].dropna()
+    return frame[features].to_numpy(dtype=np.float64), frame[target_column].to_numpy(dtype=np.float64), features, frame
+
+
+def train_target(target, families=None, n_candidates=TRAINING_CANDIDATES, n_jobs=TRAINING_N_JOBS,
+                 data_path=CLEANED_DATA_PATH, register=True):
+    """
+    📄 **Description :**
+    - Recherche sur 80 % des lignes, évaluation du gagnant sur les 20 % restants.
+    - Enregistre le gagnant (si `register`) et retourne le rapport d'entraînement.
+    """
+    start = time.perf_counter()
+    X, y, features, frame = load_training_data(target, data_path)
+    train_index, test_index = train_test_split(np.arange(len(y)), test_size=TRAINING_TEST_SIZE,
+                                               random_state=RANDOM_STATE)
+    families = available_families(families)
+    candidates = sample_candidates(families, n_candidates)
+    logger.info(f"🏋️ {target} : {len(candidates)} candidats ({', '.join(families)}), {len(train_index)} lignes, "
+                f"{n_jobs} essais en parallèle")
+
+    ranked, history = successive_halving(candidates, X[train_index], y[train_index], n_jobs=n_jobs)
+    best = ranked[0]
+    model = make_estimator(best["family"], best["params"], n_estimators=best["n_estimators"])
+    model.fit(X[train_index], y[train_index])
+    predictions = model.predict(X[test_index])
+    metrics = {
+        "rmse": float(np.sqrt(mean_squared_error(y[test_index], predictions))),
+        "mae": float(mean_absolute_error(y[test_index], predictions)),
+        "r2": float(r2_score(y[test_index], predictions)),
+        "cv_rmse": best["cv_rmse"],
+    }
+    report = {
+        "target": target, "family": best["family"], "params": best["params"],
+        "n_estimators": best["n_estimators"], "metrics": metrics, "features": features,
+        "n_train": int(len(train_index)), "n_test": int(len(test_index)), "n_candidates": len(candidates),
+        "rungs": history, "data_path": str(data_path), "seconds": round(time.perf_counter() - start, 2),
+    }
+    logger.success(f"🏆 {target} : {best['family']} RMSE test {metrics['rmse']:.4f}, R² {metrics['r2']:.4f} "
+                   f"({report['seconds']} s)")
+
+    if register:
+        from src.model_registry import register_model, load_preprocessing_params
+        _, model_name, _ = TRAINING_TARGETS[target]
+        saved = register_model(model_name, model, features, frame, load_preprocessing_params(),
+                               metadata={"training": json.loads(json.dumps(report, default=str))})
+        report["model_tag"] = str(saved.tag)
+        logger.success(f"💾 Modèle enregistré : {saved.tag}")
+    return model, report
+
+
+# ============================================================
+# ♻️ Ré-entraînement incrémental (nouvelle année de benchmarking)
+# ============================================================
+def model_family(model):
+    """🧩 Famille d'un modèle entraîné (ValueError si non prolongeable)."""
+    families = {"LGBMRegressor": "lightgbm", "XGBRegressor": "xgboost",
+                "RandomForestRegressor": "random_forest", "ExtraTreesRegressor": "random_forest"}
+    family = families.get(type(model).__name__)
+    if family is None:
+        raise ValueError(f"❌ Ré-entraînement incrémental non pris en charge : {type(model).__name__}")
+    return family
+
+
+def count_trees(model):
+    family = model_family(model)
+    if family == "lightgbm":
+        return model.booster_.num_trees()
+    if family == "xgboost":
+        return model.get_booster().num_boosted_rounds()
+    return len(model.estimators_)
+
+
+def extend_model(model, X_new, y_new, extra_trees=INCREMENTAL_EXTRA_TREES):
+    """
+    📄 **Description :**
+    - Retourne un nouveau modèle = arbres existants + `extra_trees` arbres
+      ajustés sur les seules nouvelles lignes (le modèle d'origine est intact).
+    - Boosting : entraînement poursuivi depuis le booster existant
+      (les nouveaux arbres corrigent les résidus du modèle actuel).
+    - Random Forest : `warm_start`, les nouveaux arbres s'ajoutent à la moyenne.
+    """
+    family = model_family(model)
+    if family == "lightgbm":
+        import lightgbm as lgb
+        params = {**model.get_params(), "n_estimators": extra_trees, "verbose": -1}
+        return lgb.LGBMRegressor(**params).fit(X_new, y_new, init_model=model.booster_)
+    if family == "xgboost":
+        import xgboost as xgb
+        params = {**model.get_params(), "n_estimators": extra_trees, "early_stopping_rounds": None}
+        return xgb.XGBRegressor(**params).fit(X_new, y_new, xgb_model=model.get_booster())
+    extended = copy.deepcopy(model)
+    extended.set_params(warm_start=True, n_estimators=len(model.estimators_) + extra_trees)
+    return extended.fit(X_new, y_new)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def lineage_metadata(parent_tag, parent_metadata, increment):
+    """🧬 Métadonnées du nouveau modèle : parent, chaîne d'ancêtres et historique des ajouts."""
+    lineage = parent_metadata.get("lineage", {})
+    return {
+        **{k: v for k, v in parent_metadata.items() if k != "lineage"},
+        "lineage": {
+            "parent": str(parent_tag),
+            "ancestors": lineage.get("ancestors", []) + [str(parent_tag)],
+            "increments": lineage.get("increments", []) + [increment],
+        },
+    }
+
+
+def incremental_update(target, new_data_path, extra_trees=INCREMENTAL_EXTRA_TREES, holdout=INCREMENTAL_HOLDOUT,
+                       force=False, register=True):
+    """
+    📄 **Description :**
+    - Charge `<modèle>:latest`, prolonge le modèle sur les lignes de `new_data_path`
+      (colonnes : features du modèle + cible), sans relire l'historique.
+    - Contrôle : RMSE sur `holdout` des nouvelles lignes, avant / après ; si le
+      modèle prolongé est moins bon, rien n'est enregistré (sauf `force`).
+    - Le modèle enregistré est prolongé sur toutes les nouvelles lignes ; ses
+      plages de features et sa référence de dérive couvrent l'historique et les
+      nouvelles lignes (histogrammes additionnés sur les bornes du parent).
+    """
+    import bentoml
+    from src.model_registry import register_model
+    from src.validation import feature_ranges, merge_ranges
+    from src.drift import merge_reference
+
+    start = time.perf_counter()
+    _, model_name, _ = TRAINING_TARGETS[target]
+    parent = bentoml.models.get(f"{model_name}:latest")
+    model = bentoml.sklearn.load_model(parent)
+    features = parent.custom_objects["features"]
+    X, y, _, frame = load_training_data(target, new_data_path, features)
+
+    fit_index, check_index = train_test_split(np.arange(len(y)), test_size=holdout, random_state=RANDOM_STATE)
+    candidate = extend_model(model, X[fit_index], y[fit_index], extra_trees)
+    rmse_before = float(np.sqrt(mean_squared_error(y[check_index], model.predict(X[check_index]))))
+    rmse_after = float(np.sqrt(mean_squared_error(y[check_index], candidate.predict(X[check_index]))))
+    logger.info(f"♻️ {target} : RMSE sur les nouvelles lignes {rmse_before:.4f} → {rmse_after:.4f} "
+                f"(+{extra_trees} arbres, {len(y)} lignes)")
+
+    increment = {
+        "data_path": str(new_data_path), "sha256": file_sha256(new_data_path), "n_rows": int(len(y)),
+        "extra_trees": extra_trees, "trees_before": count_trees(model),
+        "holdout_rmse_before": rmse_before, "holdout_rmse_after": rmse_after,
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    if rmse_after > rmse_before and not force:
+        logger.warning(f"⚠️ {target} : le modèle prolongé est moins bon sur les nouvelles lignes, "
+                       "aucun enregistrement (utiliser --force pour passer outre).")
+        return None, increment
+
+    extended = extend_model(model, X, y, extra_trees)
+    increment["trees_after"] = count_trees(extended)
+    increment["seconds"] = round(time.perf_counter() - start, 2)
+    if register:
+        saved = register_model(model_name, extended, features, frame, parent.custom_objects.get("preprocessing"),
+                               metadata=lineage_metadata(parent.tag, dict(parent.info.metadata), increment),
+                               ranges=merge_ranges(parent.custom_objects.get("feature_ranges"),
+                                                   feature_ranges(frame, features)),
+                               drift_reference=merge_reference(parent.custom_objects.get("drift_reference"),
+                                                               frame, features))
+        increment["model_tag"] = str(saved.tag)
+        logger.success(f"💾 {saved.tag} enregistré (parent {parent.tag}, {increment['trees_after']} arbres).")
+    return extended, increment
+
+
+# ============================================================
+# 🖥️ Ligne de commande
+# ============================================================
+def build_parser():
+    parser = argparse.ArgumentParser(prog="train", description="Recherche d'hyperparamètres et enregistrement BentoML.")
+    parser.add_argument("--targets", nargs="+", choices=sorted(TRAINING_TARGETS), default=["energy", "co2"])
+    parser.add_argument("--families", nargs="+", choices=sorted(SEARCH_SPACES), default=None,
+                        help="Familles de modèles (défaut : toutes celles installées).")
+    parser.add_argument("--candidates", type=int, default=TRAINING_CANDIDATES, help="Candidats tirés par famille.")
+    parser.add_argument("--n-jobs", type=int, default=TRAINING_N_JOBS, help="Essais en parallèle.")
+    parser.add_argument("--data", type=Path, default=CLEANED_DATA_PATH, help="CSV avec features et cibles.")
+    parser.add_argument("--no-register", action="store_true", help="Ne pas écrire dans le store BentoML.")
+    parser.add_argument("--incremental", type=Path, default=None, metavar="NOUVEAU_CSV",
+                        help="Prolonge `:latest` sur ces seules lignes (features + cible) au lieu de tout ré-entraîner.")
+    parser.add_argument("--extra-trees", type=int, default=INCREMENTAL_EXTRA_TREES, help="Arbres ajoutés (incrémental).")
+    parser.add_argument("--force", action="store_true", help="Enregistrer même si le contrôle incrémental régresse.")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.incremental is not None:
+        for target in args.targets:
+            _, increment = incremental_update(target, args.incremental, args.extra_trees, force=args.force,
+                                              register=not args.no_register)
+            report_path = LOGS_DIR / f"training_{target}_incremental.json"
+            report_path.write_text(json.dumps(increment, indent=2))
+            logger.info(f"📝 Rapport : {report_path}")
+        return
+    for target in args.targets:
+        _, report = train_target(target, args.families, args.candidates, args.n_jobs, args.data,
+                                 register=not args.no_register)
+        report_path = LOGS_DIR / f"training_{target}.json"
+        report_path.write_text(json.dumps(report, indent=2, default=str))
+        logger.info(f"📝 Rapport : {report_path}")
+
+
+if __name__ == "__main__":
+    main()
+
+# ============================================================
+# 🎉 Exemples :
+#     ➔ python src/training.py --targets energy --no-register
+#     ➔ train --families lightgbm random_forest --candidates 54 --n-jobs 16
+#     ➔ python src/preprocess_data_for_models.py --append data/raw/buildings_2017.csv
+#     ➔ train --incremental data/processed/buildings_2017_model_features.csv --extra-trees 50
+# ============================================================
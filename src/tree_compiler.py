@@ -0,0 +1,248 @@
+# ============================================================
+# 🌲 Compilation des ensembles d'arbres en tables de nœuds (src/tree_compiler.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Prédire sans passer par le wrapper sklearn,
+#     la validation d'entrée et le dispatch du booster.
+# 📌 **Principe :**
+#     - Tous les nœuds de tous les arbres sont rangés dans des
+#       tableaux plats (feature, seuil, enfant gauche/droit, valeur).
+#     - Une feuille pointe sur elle-même : la descente se fait
+#       niveau par niveau, pour toutes les lignes et tous les arbres
+#       à la fois ; les chemins arrivés en feuille sont retirés.
+# 🧩 **Modèles pris en charge :**
+#     - LightGBM (`LGBMRegressor` / `Booster`, objectifs sans transformation),
+#     - scikit-learn (`DecisionTreeRegressor`, `RandomForestRegressor`,
+#       `ExtraTreesRegressor`).
+# ============================================================
+
+from pathlib import Path  # Répertoire des tables `.npy`
+import numpy as np  # Seule dépendance de calcul
+
+# 🩹 Règles de valeurs manquantes (codes LightGBM)
+MISSING_NONE, MISSING_ZERO, MISSING_NAN = 0, 1, 2
+MISSING_TYPES = {"None": MISSING_NONE, "Zero": MISSING_ZERO, "NaN": MISSING_NAN}
+LIGHTGBM_ZERO_THRESHOLD = 1e-35
+# 🎯 Objectifs LightGBM dont la prédiction est la somme brute des feuilles
+LIGHTGBM_IDENTITY_OBJECTIVES = {"regression", "regression_l1", "huber", "fair", "quantile", "mape"}
+
+ARRAY_FIELDS = ["feature", "threshold", "left", "right", "value", "missing_type", "default_left", "roots"]
+FLAT_TREES_DIR = "flat_trees"  # Sous-répertoire du modèle BentoML contenant les `.npy`
+
+
+class FlatTreeEnsemble:
+    """
+    📄 **Description :**
+    - Ensemble d'arbres « aplati » : un nœud = un indice dans les tableaux.
+    - `predict(X)` = `scale × Σ feuilles + base` (somme pour le boosting,
+      moyenne pour les forêts).
+    - `input_dtype` : float32 pour scikit-learn (les seuils y sont comparés
+      à des valeurs float32), float64 pour LightGBM.
+    - `precision` : type des seuils, des feuilles et des comparaisons ;
+      "float32" divise par deux les tables (variante allégée, `with_precision`).
+    """
+
+    def __init__(self, feature, threshold, left, right, value, missing_type, default_left, roots,
+                 max_depth, n_features, scale=1.0, base=0.0, input_dtype="float64", precision="float64"):
+        self.precision = str(precision)
+        self.feature = np.asarray(feature, dtype=np.int32)
+        self.threshold = np.asarray(threshold, dtype=self.precision)
+        self.left = np.asarray(left, dtype=np.int32)
+        self.right = np.asarray(right, dtype=np.int32)
+        self.value = np.asarray(value, dtype=self.precision)
+        self.missing_type = np.asarray(missing_type, dtype=np.int8)
+        self.default_left = np.asarray(default_left, dtype=bool)
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.scale = float(scale)
+        self.base = float(base)
+        self.input_dtype = str(input_dtype)
+        self.is_leaf = self.left == np.arange(len(self.left))
+        # ⚡ Cas courant : aucune règle de manquant → NaN ramené à 0 une seule fois
+        self.simple_missing = not np.any(self.missing_type != MISSING_NONE)
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    def predict(self, X):
+        """🔮 Prédiction vectorisée d'une matrice `(n, n_features)`."""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"❌ Matrice (n, {self.n_features}) attendue, {X.shape} reçue.")
+        X = X.astype(self.input_dtype).astype(np.float64)
+        if self.simple_missing and self.input_dtype == "float64":
+            X = np.where(np.isnan(X), 0.0, X)  # LightGBM : NaN traité comme 0 (missing_type None)
+        X = X.astype(self.precision, copy=False)  # Comparaisons au type des seuils
+
+        # 🌲 Un chemin par (ligne, arbre) ; seuls les chemins pas encore en feuille avancent
+        n_rows = X.shape[0]
+        node = np.tile(self.roots, n_rows)
+        row_offset = np.repeat(np.arange(n_rows) * self.n_features, self.n_trees)
+        flat_X = X.ravel()
+        active = np.flatnonzero(~self.is_leaf[node])
+        while active.size:
+            current = node[active]
+            x = flat_X[row_offset[active] + self.feature[current]]
+            go_left = x <= self.threshold[current] if self.simple_missing else self._go_left(x, current)
+            current = np.where(go_left, self.left[current], self.right[current])
+            node[active] = current
+            active = active[~self.is_leaf[current]]
+        return self.value[node].reshape(n_rows, self.n_trees).sum(axis=1, dtype=np.float64) * self.scale + self.base
+
+    def with_precision(self, precision):
+        """🪶 Copie dont seuils et feuilles sont convertis en `precision` (ex. "float32")."""
+        arrays = {name: getattr(self, name) for name in ARRAY_FIELDS}
+        return FlatTreeEnsemble(**arrays, max_depth=self.max_depth, n_features=self.n_features, scale=self.scale,
+                                base=self.base, input_dtype=self.input_dtype, precision=precision)
+
+    def _go_left(self, x, node):
+        """🩹 Décision avec les règles de manquants LightGBM (`NumericalDecision`)."""
+        missing_type = self.missing_type[node]
+        nan = np.isnan(x)
+        x = np.where(nan & (missing_type != MISSING_NAN), 0.0, x)
+        use_default = ((missing_type == MISSING_ZERO) & (np.abs(x) <= LIGHTGBM_ZERO_THRESHOLD)) | \
+                      ((missing_type == MISSING_NAN) & nan)
+        return np.where(use_default, self.default_left[node], x <= self.threshold[node])
+
+    # ============================================================
+    # 💾 Sérialisation en tableaux (stockage avec le modèle BentoML)
+    # ============================================================
+    def to_arrays(self):
+        """💾 Dict de tableaux numpy + scalaires, sans objet Python à dépickler."""
+        arrays = {name: getattr(self, name) for name in ARRAY_FIELDS}
+        arrays["meta"] = np.array([self.max_depth, self.n_features, self.scale, self.base], dtype=np.float64)
+        arrays["input_dtype"] = np.array(self.input_dtype)
+        arrays["precision"] = np.array(self.precision)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        max_depth, n_features, scale, base = arrays["meta"]
+        precision = str(arrays["precision"]) if "precision" in arrays else "float64"  # Tables antérieures : float64
+        return cls(**{name: arrays[name] for name in ARRAY_FIELDS}, max_depth=int(max_depth),
+                   n_features=int(n_features), scale=scale, base=base, input_dtype=str(arrays["input_dtype"]),
+                   precision=precision)
+
+    def save(self, directory):
+        """💾 Un fichier `.npy` par tableau : rechargeable en mémoire partagée (mmap)."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, array in self.to_arrays().items():
+            np.save(directory / f"{name}.npy", array)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        📂 Recharge les tables sans dépickler : avec `mmap=True`, les processus
+        d'un même hôte partagent les pages du cache système au lieu d'en garder
+        chacun une copie.
+        """
+        mmap_mode = "r" if mmap else None
+        arrays = {path.stem: np.load(path, mmap_mode=mmap_mode) for path in Path(directory).glob("*.npy")}
+        return cls.from_arrays(arrays)
+
+
+# ============================================================
+# 🧱 Construction des tables à partir d'arbres « nœud par nœud »
+# ============================================================
+class _TableBuilder:
+    def __init__(self):
+        self.columns = {name: [] for name in ["feature", "threshold", "left", "right", "value", "missing_type", "default_left"]}
+        self.roots = []
+        self.max_depth = 0
+
+    def add_node(self, feature=0, threshold=np.inf, value=0.0, missing_type=MISSING_NONE, default_left=False):
+        index = len(self.columns["feature"])
+        for name, item in zip(self.columns, [feature, threshold, index, index, value, missing_type, default_left]):
+            self.columns[name].append(item)
+        return index
+
+    def link(self, parent, left, right):
+        self.columns["left"][parent] = left
+        self.columns["right"][parent] = right
+
+    def build(self, n_features, **kwargs):
+        return FlatTreeEnsemble(**self.columns, roots=self.roots, max_depth=self.max_depth, n_features=n_features, **kwargs)
+
+
+def compile_lightgbm(model):
+    """🌿 Compile un `LGBMRegressor` (ou un `lightgbm.Booster`)."""
+    booster = getattr(model, "booster_", model)
+    dump = booster.dump_model()  # ⚠️ Utilise best_iteration si défini, comme `predict`
+    if dump.get("num_class", 1) != 1 or dump["objective"].split()[0] not in LIGHTGBM_IDENTITY_OBJECTIVES:
+        raise ValueError(f"❌ Objectif LightGBM non pris en charge : {dump['objective']}")
+    if dump.get("average_output"):
+        raise ValueError("❌ Mode random forest de LightGBM non pris en charge.")
+
+    builder = _TableBuilder()
+    for tree in dump["tree_info"]:
+        stack = [(tree["tree_structure"], None, None, 0)]
+        root = None
+        while stack:
+            node, parent, side, depth = stack.pop()
+            builder.max_depth = max(builder.max_depth, depth)
+            if "leaf_value" in node:
+                index = builder.add_node(value=node["leaf_value"])
+            else:
+                if node["decision_type"] != "<=" or tree.get("is_linear") or "leaf_coeff" in node:
+                    raise ValueError("❌ Seuls les splits numériques `<=` sont pris en charge.")
+                index = builder.add_node(feature=node["split_feature"], threshold=node["threshold"],
+                                         missing_type=MISSING_TYPES[node["missing_type"]],
+                                         default_left=node["default_left"])
+                stack.append((node["right_child"], index, "right", depth + 1))
+                stack.append((node["left_child"], index, "left", depth + 1))
+            if parent is None:
+                root = index
+            else:
+                builder.columns[side][parent] = index
+        builder.roots.append(root)
+    return builder.build(n_features=dump["max_feature_idx"] + 1)
+
+
+def compile_sklearn_trees(model):
+    """🌳 Compile un arbre ou une forêt de régression scikit-learn."""
+    estimators = getattr(model, "estimators_", [model])
+    builder = _TableBuilder()
+    for estimator in estimators:
+        tree = estimator.tree_
+        if tree.n_outputs != 1:
+            raise ValueError("❌ Seuls les modèles à une sortie sont pris en charge.")
+        offset = len(builder.columns["feature"])
+        is_leaf = tree.children_left == -1
+        for node in range(tree.node_count):
+            if is_leaf[node]:
+                builder.add_node(value=tree.value[node, 0, 0])
+            else:
+                builder.add_node(feature=tree.feature[node], threshold=tree.threshold[node])
+                builder.link(offset + node, offset + tree.children_left[node], offset + tree.children_right[node])
+        builder.roots.append(offset)
+        builder.max_depth = max(builder.max_depth, tree.max_depth)
+    return builder.build(n_features=model.n_features_in_, scale=1.0 / len(estimators), input_dtype="float32")
+
+
+def compile_tree_ensemble(model):
+    """
+    📄 **Description :**
+    - Choisit le compilateur selon le type du modèle.
+
+    - Un estimateur qui embarque déjà ses tables (`ensemble`, ex. variante
+      float32 de src/variants.py) est retourné tel quel.
+
+    ⚠️ Lève `ValueError` pour un modèle non pris en charge (catégories,
+    arbres linéaires, objectif avec transformation, …).
+    """
+    if isinstance(getattr(model, "ensemble", None), FlatTreeEnsemble):
+        return model.ensemble
+    if hasattr(model, "booster_") or type(model).__module__.startswith("lightgbm"):
+        return compile_lightgbm(model)
+    if hasattr(model, "tree_") or (hasattr(model, "estimators_") and hasattr(model.estimators_[0], "tree_")):
+        if type(model).__name__ not in {"DecisionTreeRegressor", "ExtraTreeRegressor",
+                                        "RandomForestRegressor", "ExtraTreesRegressor"}:
+            raise ValueError(f"❌ Modèle scikit-learn non pris en charge : {type(model).__name__}")
+        return compile_sklearn_trees(model)
+    raise ValueError(f"❌ Modèle non pris en charge : {type(model).__name__}")
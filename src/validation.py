@@ -0,0 +1,169 @@
+# ============================================================
+# 🛡️ Validation vectorisée des features (src/validation.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Convertir et contrôler en une seule passe
+#     numpy les matrices de features reçues par les services.
+# 📌 **Rôle :** Partagé par les services Énergie et CO₂ pour
+#     éviter une boucle Python par bâtiment.
+# ============================================================
+
+import operator  # Comparaisons du chemin rapide (une ligne)
+import numpy as np  # Manipulation numérique efficace
+
+
+# ============================================================
+# 🧮 Conversion d'un lot de lignes en matrice float64
+# ============================================================
+def to_feature_matrix(rows, features):
+    """
+    📄 **Description :**
+    - Convertit une liste de lignes (ou un tableau) en matrice `(n, len(features))`.
+    - Vérifie la forme en une seule opération numpy, sans boucle par ligne.
+
+    ⚠️ Lève `ValueError` si le lot est vide, irrégulier ou mal dimensionné.
+    """
+    try:
+        matrix = np.asarray(rows, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError("❌ Lignes de longueurs différentes ou valeurs non numériques.")
+
+    if matrix.ndim != 2:
+        raise ValueError(f"❌ Matrice 2D attendue, {matrix.ndim} dimension(s) reçue(s).")
+    if matrix.shape[0] == 0:
+        raise ValueError("❌ Lot vide : au moins une ligne attendue.")
+    if matrix.shape[1] != len(features):
+        raise ValueError(f"❌ {len(features)} attendues par ligne, {matrix.shape[1]} reçues.")
+    return matrix
+
+
+# ============================================================
+# 🏗️ Conversion d'un lot colonnaire (attributs bruts) en tableaux
+# ============================================================
+def to_column_arrays(columns):
+    """
+    📄 **Description :**
+    - Convertit un dict `nom → liste` en dict `nom → tableau float64`.
+    - Les valeurs `null` deviennent NaN (imputées ensuite par la transformation).
+
+    ⚠️ Lève `ValueError` si le lot est vide ou si les colonnes n'ont pas la même longueur.
+    """
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"❌ Colonnes de longueurs différentes : {sorted(lengths)}.")
+    if not lengths or lengths == {0}:
+        raise ValueError("❌ Lot vide : au moins une ligne attendue.")
+    return {name: np.asarray(values, dtype=np.float64) for name, values in columns.items()}
+
+
+# ============================================================
+# 📏 Validation vectorisée : forme, finitude et plages par feature
+# ============================================================
+class FeatureValidationError(ValueError):
+    """⚠️ Erreur de validation portant la liste des erreurs indexées (ligne, feature)."""
+
+    def __init__(self, details, total):
+        self.details = details
+        self.total = total
+        suffix = f" (+{total - len(details)} autres)" if total > len(details) else ""
+        super().__init__(f"❌ {total} valeur(s) invalide(s) : " + " ; ".join(details) + suffix)
+
+
+def feature_ranges(data, features):
+    """📐 Plages `{"min": [...], "max": [...]}` observées sur les données d'entraînement."""
+    values = np.asarray(data[list(features)], dtype=np.float64)
+    return {"min": np.nanmin(values, axis=0).tolist(), "max": np.nanmax(values, axis=0).tolist()}
+
+
+def merge_ranges(*ranges):
+    """🔗 Union de plusieurs plages `{"min", "max"}` (les entrées None sont ignorées)."""
+    ranges = [r for r in ranges if r]
+    if not ranges:
+        return None
+    return {"min": np.min([r["min"] for r in ranges], axis=0).tolist(),
+            "max": np.max([r["max"] for r in ranges], axis=0).tolist()}
+
+
+class FeatureValidator:
+    """
+    📄 **Description :**
+    - Convertit le corps JSON (`{"features": ...}`) en matrice float64 en un seul
+      appel numpy, sans coercition élément par élément.
+    - Vérifie en une passe vectorisée : forme, valeurs finies (NaN / inf refusés)
+      et plages par feature issues des données d'entraînement.
+    - Sans `ranges` (ancien modèle), seule la finitude est contrôlée.
+    - ⚡ Chemin rapide : les bornes sont remplacées par des bornes finies
+      (`±float64 max`), de sorte qu'un seul test « dans les bornes » couvre aussi
+      NaN / inf ; le masque indexé des erreurs n'est construit qu'en cas d'échec.
+    """
+
+    def __init__(self, features, ranges=None, margin=0.1, max_errors=10):
+        self.features = list(features)
+        self.max_errors = max_errors
+        n_features = len(self.features)
+        if ranges:
+            lower = np.asarray(ranges["min"], dtype=np.float64)
+            upper = np.asarray(ranges["max"], dtype=np.float64)
+            span = upper - lower
+            self.lower, self.upper = lower - margin * span, upper + margin * span
+        else:
+            self.lower, self.upper = np.full(n_features, -np.inf), np.full(n_features, np.inf)
+        # 🚧 Bornes finies : `lower <= x <= upper` est faux pour NaN et ±inf
+        largest = np.finfo(np.float64).max
+        self.finite_lower = np.maximum(self.lower, -largest)
+        self.finite_upper = np.minimum(self.upper, largest)
+        self._lower_list, self._upper_list = self.finite_lower.tolist(), self.finite_upper.tolist()
+
+    def validate_row(self, payload):
+        """🔢 `{"features": [k valeurs]}` → matrice `(1, k)`."""
+        values = self._extract(payload)
+        # ⚡ Une ligne de k nombres dans les bornes : comparaisons Python sur la liste
+        #    (moins coûteuses que des ufuncs numpy sur 10 valeurs), puis une conversion
+        if type(values) is list and len(values) == len(self.features):
+            try:
+                if all(map(operator.le, self._lower_list, values)) and all(map(operator.le, values, self._upper_list)):
+                    return np.array(values, dtype=np.float64).reshape(1, -1)
+            except TypeError:
+                pass  # None, texte, ligne imbriquée : diagnostic complet ci-dessous
+        try:
+            row = np.asarray(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise ValueError("❌ Valeurs non numériques dans `features`.")
+        if row.ndim == 2:
+            raise ValueError("❌ Une seule ligne attendue : utiliser l'endpoint `_batch` pour une matrice.")
+        if row.ndim != 1 or row.shape[0] != len(self.features):
+            raise ValueError(f"❌ {len(self.features)} attendues, {row.size} reçues.")
+        return self.check(row.reshape(1, -1))
+
+    def validate_rows(self, payload):
+        """🧮 `{"features": [[k valeurs], ...]}` → matrice `(n, k)`."""
+        return self.check(to_feature_matrix(self._extract(payload), self.features))
+
+    def validate_flat(self, values, n_rows=1):
+        """📡 Tableau plat ligne par ligne (ex. `repeated double` gRPC) → matrice `(n_rows, k)`."""
+        n_rows = max(int(n_rows), 1)
+        values = np.asarray(values, dtype=np.float64)
+        if values.size != n_rows * len(self.features):
+            raise ValueError(f"❌ {n_rows} × {len(self.features)} valeurs attendues, {values.size} reçues.")
+        return self.check(values.reshape(n_rows, -1))
+
+    def check(self, matrix):
+        """📏 Finitude + plages en une passe ; lève `FeatureValidationError` avec les indices fautifs."""
+        if ((matrix >= self.finite_lower) & (matrix <= self.finite_upper)).all():
+            return matrix
+        invalid = ~np.isfinite(matrix) | (matrix < self.lower) | (matrix > self.upper)
+        rows, columns = np.nonzero(invalid)
+        details = [self._describe(matrix, row, column) for row, column in zip(rows[:self.max_errors], columns[:self.max_errors])]
+        raise FeatureValidationError(details, total=int(len(rows)))
+
+    def _describe(self, matrix, row, column):
+        value = matrix[row, column]
+        where = f"ligne {row}, '{self.features[column]}' (index {column})"
+        if not np.isfinite(value):
+            return f"{where} : valeur non finie ({value})"
+        return f"{where} : {value:g} hors plage [{self.lower[column]:g}, {self.upper[column]:g}]"
+
+    @staticmethod
+    def _extract(payload):
+        if not isinstance(payload, dict) or "features" not in payload:
+            raise ValueError("❌ Corps JSON attendu : {\"features\": ...}.")
+        return payload["features"]
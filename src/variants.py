@@ -0,0 +1,161 @@
+# ============================================================
+# 🪶 Variantes allégées des modèles (src/variants.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Offrir un palier « estimation rapide » : des
+#     modèles moins coûteux, au prix d'une perte de précision mesurée.
+# 📌 **Variantes** (construites à partir du modèle final) :
+#     - "float32"   : tables de nœuds aux seuils et feuilles float32 ;
+#     - "first_n"   : ensemble réduit à ses `VARIANT_FIRST_N_TREES` premiers arbres ;
+#     - "distilled" : arbre de décision peu profond ajusté sur les
+#       prédictions du modèle complet (distillation).
+# 💾 Chaque variante est enregistrée sous `<modèle>_<variante>` avec,
+#     dans `metadata`, RMSE / R² sur une réserve des données, latence
+#     mesurée (backends sklearn et flat_trees) et les mêmes mesures du
+#     modèle complet pour comparaison.
+# 🌐 Les services servent les variantes enregistrées (`SERVED_VARIANTS`) ;
+#     une requête en choisit une avec `"variant": "<nom>"`.
+# ============================================================
+
+import copy
+import json
+import time
+import numpy as np  # Manipulation numérique efficace
+from loguru import logger  # Gestion avancée et lisible des logs
+from sklearn.base import BaseEstimator, RegressorMixin  # Variante float32 enregistrable par bentoml.sklearn
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.model_selection import train_test_split
+from src.tree_compiler import compile_tree_ensemble  # Tables de nœuds (variante float32, latence flat_trees)
+from src.explain import EXPLAIN_FAMILIES  # Variantes dont les attributions sont calculables
+from src.config import (
+    LOGS_DIR, RANDOM_STATE, VARIANT_FIRST_N_TREES, VARIANT_DISTILLED_DEPTH, VARIANT_HOLDOUT,
+    VARIANT_LATENCY_REPEATS, RUNNER_MAX_BATCH_SIZE,
+)
+
+VARIANTS = ("float32", "first_n", "distilled")
+
+
+class FlatTreeRegressor(RegressorMixin, BaseEstimator):
+    """🌲 Estimateur scikit-learn minimal autour de tables de nœuds (servi par les deux backends)."""
+
+    def __init__(self, ensemble=None):
+        self.ensemble = ensemble
+
+    @property
+    def n_features_in_(self):
+        return self.ensemble.n_features
+
+    def predict(self, X):
+        return self.ensemble.predict(X)
+
+
+# ============================================================
+# 🏗️ Construction des variantes
+# ============================================================
+def first_trees(model, n_trees):
+    """✂️ Copie du modèle limitée à ses `n_trees` premiers arbres (LightGBM, XGBoost, forêts)."""
+    from src.training import model_family  # Import paresseux : familles prises en charge
+
+    family = model_family(model)
+    truncated = copy.deepcopy(model)
+    if family == "lightgbm":
+        import lightgbm as lgb
+        truncated._Booster = lgb.Booster(model_str=model.booster_.model_to_string(num_iteration=n_trees))
+    elif family == "xgboost":
+        truncated._Booster = model.get_booster()[:n_trees]
+    else:
+        truncated.estimators_ = model.estimators_[:n_trees]
+        truncated.n_estimators = len(truncated.estimators_)
+    return truncated
+
+
+def build_variant(variant, model, X_train, first_n=VARIANT_FIRST_N_TREES, depth=VARIANT_DISTILLED_DEPTH):
+    """🪶 Construit la variante `variant` du modèle complet (`X_train` : lignes de distillation)."""
+    if variant == "float32":
+        return FlatTreeRegressor(compile_tree_ensemble(model).with_precision("float32"))
+    if variant == "first_n":
+        return first_trees(model, first_n)
+    if variant == "distilled":
+        from sklearn.tree import DecisionTreeRegressor
+        return DecisionTreeRegressor(max_depth=depth, random_state=RANDOM_STATE).fit(X_train, model.predict(X_train))
+    raise ValueError(f"❌ Variante inconnue : {variant} (attendu : {VARIANTS})")
+
+
+# ============================================================
+# 📏 Précision et latence
+# ============================================================
+def accuracy(model, X, y):
+    """📏 RMSE et R² sur `(X, y)`."""
+    predictions = model.predict(X)
+    return {"rmse": float(np.sqrt(mean_squared_error(y, predictions))), "r2": float(r2_score(y, predictions))}
+
+
+def _median_seconds(function, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def latency(model, X, repeats=VARIANT_LATENCY_REPEATS, batch_size=RUNNER_MAX_BATCH_SIZE):
+    """
+    📄 **Description :**
+    - Médiane sur `repeats` appels : une ligne (µs), puis un lot de `batch_size`
+      lignes (µs par ligne), pour chaque backend qui peut servir le modèle.
+    - "flat_trees" absent si le modèle ne se compile pas en tables de nœuds.
+    """
+    row, batch = X[:1], X[np.arange(batch_size) % len(X)]
+    backends = {"sklearn": model.predict}
+    try:
+        backends["flat_trees"] = compile_tree_ensemble(model).predict
+    except ValueError:
+        pass
+    return {name: {"row_us": _median_seconds(lambda: predict(row), repeats) * 1e6,
+                   "batch_us_per_row": _median_seconds(lambda: predict(batch), repeats) * 1e6 / batch_size}
+            for name, predict in backends.items()}
+
+
+# ============================================================
+# 💾 Construction, mesure et enregistrement
+# ============================================================
+def register_variants(name, model, features, frame, target_column, variants=VARIANTS, preprocessing=None,
+                      parent_tag=None, register=True):
+    """
+    📄 **Description :**
+    - Réserve `VARIANT_HOLDOUT` des lignes de `frame` pour la mesure ; les
+      autres servent à la distillation.
+    - Mesure le modèle complet puis chaque variante (RMSE, R², latence) et
+      enregistre chaque variante sous `<name>_<variante>` (si `register`).
+    - Écrit le comparatif précision / latence dans `logs/variants_<name>.json`.
+    """
+    from src.model_registry import register_model  # Import paresseux : store BentoML
+
+    data = frame[list(features) + [target_column]].dropna()
+    X = data[list(features)].to_numpy(dtype=np.float64)
+    y = data[target_column].to_numpy(dtype=np.float64)
+    train_index, test_index = train_test_split(np.arange(len(y)), test_size=VARIANT_HOLDOUT, random_state=RANDOM_STATE)
+    X_train, X_test, y_test = X[train_index], X[test_index], y[test_index]
+
+    reference = {"metrics": accuracy(model, X_test, y_test), "latency": latency(model, X_test)}
+    report = {"model": name, "parent_tag": parent_tag, "n_test": int(len(test_index)), "full": reference, "variants": {}}
+    for variant in variants:
+        variant_model = build_variant(variant, model, X_train)
+        measures = {"metrics": accuracy(variant_model, X_test, y_test), "latency": latency(variant_model, X_test)}
+        entry = {"variant": variant, "parent_tag": parent_tag, **measures, "reference": reference,
+                 "explainable": type(variant_model).__name__ in EXPLAIN_FAMILIES}
+        if register:
+            saved = register_model(f"{name}_{variant}", variant_model, features, data, preprocessing,
+                                   metadata=json.loads(json.dumps(entry)),
+                                   labels={"variant": variant, "parent": name})
+            entry["model_tag"] = str(saved.tag)
+        report["variants"][variant] = entry
+        sklearn_us = measures["latency"]["sklearn"]["row_us"]
+        logger.info(f"🪶 {name}_{variant} : RMSE {measures['metrics']['rmse']:.4f} "
+                    f"(complet {reference['metrics']['rmse']:.4f}), R² {measures['metrics']['r2']:.4f}, "
+                    f"{sklearn_us:.0f} µs/ligne (complet {reference['latency']['sklearn']['row_us']:.0f} µs)")
+
+    output = LOGS_DIR / f"variants_{name}.json"
+    output.write_text(json.dumps(report, indent=2))
+    logger.info(f"💾 Comparatif précision / latence écrit dans : {output}")
+    return report
@@ -0,0 +1,168 @@
+# ============================================================
+# 🔀 Analyses « what-if » / de sensibilité (src/what_if.py)
+# ------------------------------------------------------------
+# 🎯 **Objectif :** Répondre à « que devient le CO₂ si `gas_ratio`
+#     baisse de 0,1 sur ces 5 000 bâtiments ? » en quelques appels
+#     vectorisés au lieu de N × M requêtes d'une ligne.
+# 📌 **Principe :**
+#     - Une matrice de base (n bâtiments) et M scénarios : changements
+#       explicites par feature ou grille de valeurs (produit cartésien).
+#     - Chaque changement : `new = base × scale + delta`, ou `set` (valeur
+#       imposée). Un nombre seul vaut `{"delta": nombre}`.
+#     - `WhatIfPlan.matrix` construit en mémoire UNE matrice
+#       `(n × (M + 1), k)` : les n lignes de base puis chaque scénario
+#       (une opération numpy par feature modifiée, tous scénarios confondus) ;
+#       la grille est développée par `np.meshgrid`, après contrôle de sa taille.
+#     - Prédiction en un seul passage (`predict_bulk` des runners, par
+#       tranches de `WHAT_IF_CHUNK_ROWS`), puis écarts au scénario de base.
+# 💡 **Exemple de spécification :**
+#     {"scenarios": [{"name": "gaz -0,1", "changes": {"gas_ratio": -0.1}},
+#                    {"changes": {"electricity_ratio": {"scale": 1.1}}}],
+#      "grid": {"gas_ratio": [0.0, 0.25, 0.5]}}
+# ============================================================
+
+import math  # Taille du produit cartésien des grilles
+import numpy as np  # Manipulation numérique efficace
+from src.validation import FeatureValidationError  # Scénario hors du domaine d'entraînement
+from src.config import WHAT_IF_MAX_ROWS
+
+OPERATIONS = ("delta", "scale", "set")
+
+
+class WhatIfPlan:
+    """
+    📄 **Description :**
+    - Scénarios sous forme de tableaux `(M, c)` pour les c features modifiées :
+      `set_values` (NaN : non imposée), `scale` et `delta`.
+    - `from_spec` lit la spécification JSON ; `matrix` l'applique à une base.
+    """
+
+    def __init__(self, names, columns, set_values, scale, delta):
+        self.names = list(names)
+        self.columns = np.asarray(columns, dtype=np.intp)
+        self.set_values = np.asarray(set_values, dtype=np.float64).reshape(len(self.names), len(self.columns))
+        self.scale = np.asarray(scale, dtype=np.float64).reshape(self.set_values.shape)
+        self.delta = np.asarray(delta, dtype=np.float64).reshape(self.set_values.shape)
+
+    @property
+    def n_scenarios(self):
+        return len(self.names)
+
+    @classmethod
+    def from_spec(cls, spec, features, n_rows=1, max_rows=WHAT_IF_MAX_ROWS):
+        """
+        📄 **Description :**
+        - `spec["scenarios"]` : liste de `{"name": ..., "changes": {feature: changement}}`.
+        - `spec["grid"]` : `{feature: [valeurs]}` ; un scénario `set` par combinaison.
+        - Refuse les features inconnues et tout plan dépassant `max_rows` lignes
+          une fois développé (`n_rows × (M + 1)`), avant toute allocation.
+        """
+        features = list(features)
+        scenarios = [cls._parse_scenario(scenario, i) for i, scenario in enumerate(spec.get("scenarios") or [])]
+        grid = {name: np.asarray(values, dtype=np.float64).ravel() for name, values in (spec.get("grid") or {}).items()}
+        n_grid = math.prod(len(values) for values in grid.values()) if grid else 0
+        n_scenarios = len(scenarios) + n_grid
+        if not n_scenarios:
+            raise ValueError("❌ Aucun scénario : fournir `scenarios` et/ou `grid`.")
+        total = n_rows * (n_scenarios + 1)
+        if total > max_rows:
+            raise ValueError(f"❌ {n_rows} lignes × {n_scenarios} scénarios = {total} lignes "
+                             f"(maximum : {max_rows}).")
+
+        touched = sorted({name for _, changes in scenarios for name in changes} | set(grid))
+        unknown = [name for name in touched if name not in features]
+        if unknown:
+            raise ValueError(f"❌ Features inconnues : {unknown} (attendues : {features}).")
+        position = {name: j for j, name in enumerate(touched)}
+        shape = (n_scenarios, len(touched))
+        set_values, scale, delta = np.full(shape, np.nan), np.ones(shape), np.zeros(shape)
+        for i, (_, changes) in enumerate(scenarios):
+            for name, change in changes.items():
+                j = position[name]
+                set_values[i, j] = change.get("set", np.nan)
+                scale[i, j] = change.get("scale", 1.0)
+                delta[i, j] = change.get("delta", 0.0)
+        names = [name for name, _ in scenarios]
+        if n_grid:  # Produit cartésien (ordre de itertools.product) : une colonne `set` par feature de la grille
+            columns = [mesh.ravel() for mesh in np.meshgrid(*grid.values(), indexing="ij")]
+            for name, column in zip(grid, columns):
+                set_values[len(scenarios):, position[name]] = column
+            names += [", ".join(f"{name}={value:g}" for name, value in zip(grid, values))
+                      for values in zip(*(column.tolist() for column in columns))]
+        return cls(names, [features.index(name) for name in touched], set_values, scale, delta)
+
+    @staticmethod
+    def _parse_scenario(scenario, index):
+        """🔎 `{"name", "changes"}` → (nom, {feature: {opération: valeur}})."""
+        changes = {}
+        for name, change in (scenario.get("changes") or {}).items():
+            if not isinstance(change, dict):
+                change = {"delta": change}
+            if not change or set(change) - set(OPERATIONS) or ("set" in change and len(change) > 1):
+                raise ValueError(f"❌ Changement invalide pour '{name}' : {change} "
+                                 f"(attendu : nombre, {{\"delta\"}}, {{\"scale\"}} ou {{\"set\"}} seul).")
+            changes[name] = {op: float(value) for op, value in change.items()}
+        if not changes:
+            raise ValueError(f"❌ Scénario {index} sans changement.")
+        return str(scenario.get("name") or f"scenario_{index}"), changes
+
+    def matrix(self, base, validator=None):
+        """
+        📄 **Description :**
+        - Retourne la matrice `(n × (M + 1), k)` : la base puis les M scénarios.
+        - Si `validator` est fourni, les lignes modifiées sont contrôlées comme
+          une requête ; l'erreur nomme le premier scénario hors domaine.
+        """
+        n_rows = base.shape[0]
+        stacked = np.empty(((self.n_scenarios + 1) * n_rows, base.shape[1]), dtype=np.float64)
+        stacked[:n_rows] = base
+        scenarios = stacked[n_rows:].reshape(self.n_scenarios, n_rows, base.shape[1])
+        scenarios[:] = base
+        for j, column in enumerate(self.columns):
+            changed = base[:, column] * self.scale[:, j, None] + self.delta[:, j, None]
+            fixed = self.set_values[:, j, None]
+            scenarios[:, :, column] = np.where(np.isnan(fixed), changed, fixed)
+        if validator is not None:
+            self._check(validator, stacked[n_rows:], scenarios)
+        return stacked
+
+    def _check(self, validator, rows, scenarios):
+        try:
+            validator.check(rows)
+        except FeatureValidationError:
+            for name, block in zip(self.names, scenarios):
+                try:
+                    validator.check(block)
+                except FeatureValidationError as e:
+                    raise ValueError(f"❌ Scénario '{name}' hors du domaine du modèle : {e}") from None
+
+    def summarize(self, predictions, n_rows, details=True):
+        """
+        📄 **Description :**
+        - `predictions` : sortie du modèle sur `matrix(base)`.
+        - Par scénario : écart moyen / min / max à la base et prédiction moyenne ;
+          écarts par bâtiment si `details`.
+        """
+        predictions = np.asarray(predictions, dtype=np.float64)
+        baseline = predictions[:n_rows]
+        deltas = predictions[n_rows:].reshape(self.n_scenarios, n_rows) - baseline
+        summary = {"count": int(n_rows), "n_scenarios": self.n_scenarios, "rows_evaluated": int(len(predictions)),
+                   "baseline_mean": float(baseline.mean())}
+        if details:
+            summary["baseline"] = baseline.tolist()
+        summary["scenarios"] = []
+        for name, scenario_deltas in zip(self.names, deltas):
+            entry = {"name": name, "mean_delta": float(scenario_deltas.mean()),
+                     "min_delta": float(scenario_deltas.min()), "max_delta": float(scenario_deltas.max()),
+                     "mean_prediction": float((baseline + scenario_deltas).mean())}
+            if details:
+                entry["deltas"] = scenario_deltas.tolist()
+            summary["scenarios"].append(entry)
+        return summary
+
+
+def predict_scenarios(predict, base, spec, features, details=True):
+    """🔀 Version hors service (notebooks, scripts) : `predict` = `model.predict`, un seul appel."""
+    base = np.asarray(base, dtype=np.float64)
+    plan = WhatIfPlan.from_spec(spec, features, n_rows=len(base))
+    return plan.summarize(predict(plan.matrix(base)), len(base), details=details)
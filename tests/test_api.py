@@ -22,12 +22,16 @@ BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Remonte à la racine d
 sys.path.append(str(BASE_DIR / "src"))  # 🔗 Ajoute src/ au chemin Python
 
 from src.config import PROCESSED_ENERGY_PATH, PROCESSED_CO2_PATH, ENERGY_SERVICE_PORT, CO2_SERVICE_PORT
+from src.datasets import load_dataset  # Feather projeté en mémoire si disponible, sinon CSV
 
 # ============================================================
 # 🌐 Configuration des endpoints API dynamiques
 # ============================================================
 energy_url = f"http://127.0.0.1:{ENERGY_SERVICE_PORT}/predict_energy"
 co2_url = f"http://127.0.0.1:{CO2_SERVICE_PORT}/predict_co2"
+energy_batch_url = f"http://127.0.0.1:{ENERGY_SERVICE_PORT}/predict_energy_batch"
+co2_batch_url = f"http://127.0.0.1:{CO2_SERVICE_PORT}/predict_co2_batch"
+energy_raw_url = f"http://127.0.0.1:{ENERGY_SERVICE_PORT}/predict_energy_raw"
 headers = {"Content-Type": "application/json"}
 
 # ============================================================
@@ -37,8 +41,8 @@ headers = {"Content-Type": "application/json"}
 def load_data():
     """📂 Charge les datasets traités une seule fois par session de test."""
     try:
-        data_energy = pd.read_csv(PROCESSED_ENERGY_PATH)
-        data_co2 = pd.read_csv(PROCESSED_CO2_PATH)
+        data_energy = load_dataset(PROCESSED_ENERGY_PATH)
+        data_co2 = load_dataset(PROCESSED_CO2_PATH)
         logger.success("✅ Données chargées avec succès.")
         return data_energy, data_co2
     except FileNotFoundError as e:
@@ -104,6 +108,39 @@ def test_co2_prediction(load_data, load_models, index):
     response = run_endpoint_test(co2_url, {"features": sample}, "🌿 Émissions de CO₂")
     assert "ghg_emissions_total" in response, "❌ Clé 'ghg_emissions_total' manquante dans la réponse."
 
+# ============================================================
+# 📦 Tests des endpoints par lot (une requête pour plusieurs bâtiments)
+# ============================================================
+def test_energy_batch_prediction(load_data, load_models):
+    """📦 Teste l'endpoint de prédiction énergétique par lot."""
+    data_energy, _ = load_data
+    features_energy, _ = load_models
+
+    rows = data_energy[features_energy].iloc[:10].values.tolist()
+    response = run_endpoint_test(energy_batch_url, {"features": rows}, "📦 Énergie par lot")
+    assert len(response["site_energy_use"]) == len(rows), "❌ Nombre de prédictions incorrect."
+
+def test_co2_batch_prediction(load_data, load_models):
+    """📦 Teste l'endpoint de prédiction CO₂ par lot."""
+    _, data_co2 = load_data
+    _, features_co2 = load_models
+
+    rows = data_co2[features_co2].iloc[:10].values.tolist()
+    response = run_endpoint_test(co2_batch_url, {"features": rows}, "📦 CO₂ par lot")
+    assert len(response["ghg_emissions_total"]) == len(rows), "❌ Nombre de prédictions incorrect."
+
+# ============================================================
+# 🏗️ Test de l'endpoint à partir des attributs bruts
+# ============================================================
+def test_energy_raw_rejects_missing_indicator(load_models):
+    """🛡️ Indicateur repris de l'entrée à `null` : refusé avant dérive et prédiction (pas de NaN au modèle)."""
+    features_energy, _ = load_models
+    columns = {"site_energy_use": [7226362.5], "electricity_kbtu": [3946027.0], "natural_gas_kbtu": [1276453.0],
+               "site_eui": [81.7], "gfa_total": [88434], "num_floors": [12], "year_built": [1927]}
+    columns.update({f: [None] for f in features_energy if f.startswith("property_type_")})
+    response = run_endpoint_test(energy_raw_url, {"columns": columns}, "🏗️ Énergie (attributs bruts)")
+    assert "non finie" in response.get("error", ""), "❌ Valeur manquante non refusée."
+
 # ============================================================
 # 🎉 Instructions pour exécuter les tests :
 #     ➔ pytest tests/test_api.py
@@ -0,0 +1,50 @@
+# ============================================================
+# 🧪 Script de test (pytest) : test_binary_io.py
+#     - Vérifie l'encodage/décodage des entrées binaires NDF8 et Arrow
+#     - Ne nécessite ni service BentoML ni modèle enregistré
+# ============================================================
+
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Remonte à la racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.binary_io import encode_feature_matrix, decode_feature_matrix
+
+FEATURES = ["site_eui", "floors_cat", "gas_ratio"]
+
+
+def test_ndf8_roundtrip_is_zero_copy():
+    """🔢 Le décodage NDF8 restitue la matrice sous forme de vue sur le buffer."""
+    matrix = np.random.default_rng(0).normal(size=(50, len(FEATURES)))
+    payload = encode_feature_matrix(matrix)
+
+    decoded = decode_feature_matrix(payload, FEATURES)
+    np.testing.assert_array_equal(decoded, matrix)
+    assert not decoded.flags.owndata, "❌ Le buffer reçu a été copié."
+
+
+@pytest.mark.parametrize("payload, message", [
+    (encode_feature_matrix(np.zeros((3, 2))), "3 colonnes attendues"),
+    (encode_feature_matrix(np.zeros((3, 3)))[:-8], "Taille incohérente"),
+    (b"{\"features\": []}", "Format binaire inconnu"),
+])
+def test_invalid_payloads_are_rejected(payload, message):
+    """🛡️ Les charges utiles mal formées sont refusées avec un message explicite."""
+    with pytest.raises(ValueError, match=message):
+        decode_feature_matrix(payload, FEATURES)
+
+
+def test_arrow_columns_are_selected_by_name():
+    """🏹 Les colonnes Arrow sont réordonnées selon les features du modèle."""
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table({"gas_ratio": [0.1, 0.2], "site_eui": [1.0, 2.0], "floors_cat": [3.0, 1.0]})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    decoded = decode_feature_matrix(sink.getvalue().to_pybytes(), FEATURES)
+    np.testing.assert_array_equal(decoded, [[1.0, 3.0, 0.1], [2.0, 1.0, 0.2]])
@@ -0,0 +1,29 @@
+# ============================================================
+# 🧪 Script de test (pytest) : test_binning.py
+#     - Vérifie les codes de catégorie de src/binning.py
+#       aux bornes (incluses à gauche) et pour les NaN
+# ============================================================
+
+import sys
+from pathlib import Path
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Remonte à la racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.binning import bin_codes, add_bins, FLOORS_EDGES, YEAR_BUILT_EDGES
+
+
+def test_edges_belong_to_lower_category():
+    """📏 Une valeur égale à une borne reste dans la catégorie inférieure."""
+    floors = np.array([0, 4, 4.5, 8, 9, 99])
+    np.testing.assert_array_equal(bin_codes(floors, FLOORS_EDGES), [1, 1, 2, 2, 3, 3])
+    years = np.array([1900, 1960, 1961, 1976, 1980, 1981, 1994, 1995, 2015])
+    np.testing.assert_array_equal(bin_codes(years, YEAR_BUILT_EDGES), [1, 1, 2, 2, 3, 4, 4, 5, 5])
+
+
+def test_nan_falls_in_last_category():
+    """🩹 Une année manquante tombe dans la dernière catégorie (ancien comportement)."""
+    codes = add_bins({"num_floors": [np.nan, 2.0], "year_built": [np.nan, 1950.0]})
+    np.testing.assert_array_equal(codes["floors_cat"], [3, 1])
+    np.testing.assert_array_equal(codes["year_built_cat"], [5, 1])
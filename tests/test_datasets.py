@@ -0,0 +1,84 @@
+# ============================================================
+# 🧪 Script de test (pytest) : test_datasets.py
+#     - Vérifie les types compacts choisis par `plan_dtypes`
+#     - Vérifie l'aller-retour CSV → Parquet / Feather → DataFrame
+#     - Vérifie le repli sur le CSV sans pyarrow (extra `columnar`)
+#     - Utilise un petit CSV synthétique (aucune donnée réelle requise)
+# ============================================================
+
+import os
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Remonte à la racine du projet
+sys.path.append(str(BASE_DIR))
+
+import src.datasets as datasets
+from src.datasets import (columnar_available, export_columnar, load_dataset, plan_dtypes, resolve_dataset_path,
+                          write_columnar)
+
+requires_pyarrow = pytest.mark.skipif(not columnar_available(), reason="pyarrow non installé (extra columnar)")
+
+
+@pytest.fixture
+def small_csv(tmp_path):
+    """📂 CSV avec codes entiers, réels « float32-safe », réels collisionnels et une cible."""
+    rng = np.random.default_rng(0)
+    n = 500
+    frame = pd.DataFrame({
+        "floors_cat": rng.integers(0, 5, n),
+        "year_built": rng.integers(1900, 2016, n),
+        "gas_ratio": np.round(rng.random(n), 4),
+        "fine_ratio": 0.5 + np.arange(n) * 1e-12,  # Valeurs distinctes fusionnées en float32
+        "site_energy_use": rng.lognormal(14, 1, n),
+        "property_type": rng.choice(["office", "storage"], n),
+    })
+    path = tmp_path / "dataset.csv"
+    frame.to_csv(path, index=False)
+    return path
+
+
+def test_plan_dtypes_narrows_without_merging_values(small_csv):
+    """🧮 int8/int16 pour les codes, float32 seulement sans collision, cible en float64."""
+    plan = plan_dtypes(small_csv, chunksize=64)
+    assert plan == {"floors_cat": "int8", "year_built": "int16", "gas_ratio": "float32",
+                    "fine_ratio": "float64", "site_energy_use": "float64"}
+
+
+@requires_pyarrow
+def test_columnar_round_trip_and_feather_preference(small_csv):
+    """🗄️ Le `.feather` est préféré au CSV et restitue les mêmes valeurs (types compacts)."""
+    write_columnar(small_csv, chunksize=64)
+    assert resolve_dataset_path(small_csv).suffix == ".feather"
+
+    reference = pd.read_csv(small_csv)
+    for path in [small_csv, small_csv.with_suffix(".parquet")]:
+        loaded = load_dataset(path)
+        assert loaded["floors_cat"].dtype == np.int8 and loaded["gas_ratio"].dtype == np.float32
+        pd.testing.assert_frame_equal(loaded, reference, check_dtype=False, rtol=1e-6)
+
+    subset = load_dataset(small_csv, columns=["gas_ratio", "site_energy_use"])
+    assert list(subset.columns) == ["gas_ratio", "site_energy_use"]
+
+
+@requires_pyarrow
+def test_stale_columnar_file_falls_back_to_csv(small_csv):
+    """⚠️ Un `.feather` / `.parquet` plus ancien que le CSV est ignoré."""
+    write_columnar(small_csv, chunksize=64)
+    stamp = small_csv.stat().st_mtime + 10
+    os.utime(small_csv, (stamp, stamp))
+    assert resolve_dataset_path(small_csv) == small_csv
+
+
+def test_without_pyarrow_export_is_skipped_and_csv_is_loaded(small_csv, monkeypatch):
+    """🔌 Sans pyarrow : export ignoré (aucun fichier écrit), chargement depuis le CSV."""
+    monkeypatch.setattr(datasets, "columnar_available", lambda: False)
+    assert export_columnar(small_csv, chunksize=64) is None
+    assert not small_csv.with_suffix(".feather").exists() and not small_csv.with_suffix(".parquet").exists()
+
+    small_csv.with_suffix(".feather").touch()  # Export d'une installation précédente : illisible sans pyarrow
+    assert resolve_dataset_path(small_csv) == small_csv
+    pd.testing.assert_frame_equal(load_dataset(small_csv), pd.read_csv(small_csv))
@@ -0,0 +1,75 @@
+# ============================================================
+# 🧪 Script de test (pytest) : test_drift.py
+#     - Vérifie les statistiques glissantes (src/drift.py) contre
+#       numpy, la fusion des références et les scores de dérive
+#     - Données synthétiques (aucun store BentoML requis)
+# ============================================================
+
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Remonte à la racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.drift import DriftMonitor, StreamingStats, merge_reference, reference_stats
+
+FEATURES = ["site_eui", "gas_ratio", "f_is_large_building"]
+
+
+def _frame(rng, n, shift=0.0):
+    return pd.DataFrame({"site_eui": rng.normal(shift, 1.0, n), "gas_ratio": rng.uniform(0, 1, n),
+                         "f_is_large_building": rng.integers(0, 2, n).astype(float)})
+
+
+def test_streaming_updates_match_numpy():
+    """🧮 Lignes une à une puis par lots : mêmes moyenne, variance et histogrammes que numpy."""
+    rng = np.random.default_rng(0)
+    values = _frame(rng, 500).to_numpy()
+    edges = [[-1.0, 0.0, 1.0], [0.5], [0.0]]
+    stats = StreamingStats(edges)
+    for row in values[:37]:
+        stats.update(row.reshape(1, -1))
+    for start in range(37, 500, 64):
+        stats.update(values[start:start + 64])
+
+    np.testing.assert_allclose(stats.mean, values.mean(axis=0))
+    np.testing.assert_allclose(stats.variance, values.var(axis=0))
+    for j, feature_edges in enumerate(edges):
+        expected = np.bincount(np.searchsorted(feature_edges, values[:, j], side="left"),
+                               minlength=len(feature_edges) + 1)
+        np.testing.assert_array_equal(stats.counts[j, :len(feature_edges) + 1], expected)
+    assert stats.counts.sum() == 500 * len(edges)
+
+
+def test_merged_reference_equals_reference_on_all_rows():
+    """🔗 Référence + nouvelles lignes (bornes du parent) = accumulateur de toutes les lignes."""
+    rng = np.random.default_rng(1)
+    history, new = _frame(rng, 400), _frame(rng, 100, shift=0.5)
+    merged = StreamingStats.from_dict(merge_reference(reference_stats(history, FEATURES), new, FEATURES))
+    direct = StreamingStats(reference_stats(history, FEATURES)["edges"])
+    direct.update(pd.concat([history, new])[FEATURES].to_numpy())
+    assert merged.count == 500
+    np.testing.assert_allclose(merged.mean, direct.mean)
+    np.testing.assert_allclose(merged.m2, direct.m2)
+    np.testing.assert_array_equal(merged.counts, direct.counts)
+
+
+def test_shifted_feature_is_flagged():
+    """🚨 Même distribution : stable ; `site_eui` décalée d'un écart-type : drift sur cette feature seule."""
+    rng = np.random.default_rng(2)
+    reference = reference_stats(_frame(rng, 5000), FEATURES)
+
+    monitor = DriftMonitor("model", FEATURES, reference, publish_seconds=0)
+    monitor.observe(_frame(rng, 50).to_numpy())
+    assert monitor.report()["status"] == "insufficient_data"
+    monitor.observe(_frame(rng, 950).to_numpy())
+    assert monitor.report()["status"] == "stable"
+
+    shifted = DriftMonitor("model", FEATURES, reference, publish_seconds=0)
+    shifted.observe(_frame(rng, 1000, shift=1.0).to_numpy())
+    report = shifted.report()
+    assert report["status"] == "drift" and report["max_psi_feature"] == "site_eui"
+    assert report["features"]["site_eui"]["mean_shift"] > 0.8
+    assert report["features"]["gas_ratio"]["status"] == "stable"
@@ -0,0 +1,61 @@
+# ============================================================
+# 🧪 Script de test (pytest) : test_explain.py
+#     - Vérifie les attributions par feature (src/explain.py) :
+#       additivité (somme = prédiction) pour chaque famille d'arbres
+#     - Petits modèles synthétiques (aucun store BentoML requis)
+# ============================================================
+
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.tree import DecisionTreeRegressor
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Remonte à la racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.explain import path_contributions, tree_contributions
+
+
+@pytest.fixture(scope="module")
+def data():
+    """📂 300 lignes, la cible ne dépend que des deux premières features."""
+    rng = np.random.default_rng(7)
+    X = rng.normal(size=(300, 4))
+    return X, 3 * X[:, 0] + np.sin(X[:, 1])
+
+
+def _models(X, y):
+    yield RandomForestRegressor(n_estimators=20, max_depth=6, random_state=0).fit(X, y)
+    yield DecisionTreeRegressor(max_depth=4, random_state=0).fit(X, y)
+    lgb = pytest.importorskip("lightgbm")
+    yield lgb.LGBMRegressor(n_estimators=30, num_leaves=8, verbose=-1).fit(X, y)
+    xgb = pytest.importorskip("xgboost")
+    yield xgb.XGBRegressor(n_estimators=30, max_depth=3).fit(X, y)
+
+
+def test_contributions_sum_to_predictions(data):
+    """➕ Contributions + valeur de base = prédiction ; les features inutiles pèsent peu."""
+    X, y = data
+    for model in _models(X, y):
+        contributions = tree_contributions(model, X[:50])
+        assert contributions.shape == (50, X.shape[1] + 1)
+        np.testing.assert_allclose(contributions.sum(axis=1), model.predict(X[:50]), atol=1e-5)
+        weight = np.abs(contributions[:, :-1]).mean(axis=0)
+        assert weight[0] > 5 * weight[2:].max(), type(model).__name__
+
+
+def test_path_contributions_of_a_stump():
+    """🌳 Souche : la feuille atteinte moins la moyenne racine, attribuée à la feature de la séparation."""
+    X = np.array([[0.0, 5.0], [0.0, 6.0], [1.0, 5.0], [1.0, 6.0]])
+    stump = DecisionTreeRegressor(max_depth=1).fit(X, [1.0, 1.0, 3.0, 3.0])
+    np.testing.assert_allclose(path_contributions(stump, X), [[-1, 0, 2], [-1, 0, 2], [1, 0, 2], [1, 0, 2]])
+
+
+def test_unsupported_model_is_rejected(data):
+    """🚫 Modèle non arborescent : erreur explicite."""
+    X, y = data
+    with pytest.raises(ValueError, match="Explications non disponibles"):
+        tree_contributions(LinearRegression().fit(X, y), X)
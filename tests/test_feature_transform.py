@@ -0,0 +1,88 @@
+# ============================================================
+# 🧪 Script de test (pytest) : test_feature_transform.py
+#     - Vérifie que la transformation numpy côté service
+#       (src/feature_transform.py) reproduit les features sur
+#       lesquelles les modèles sont entraînés (dataset_cleaned.csv)
+#     - Utilise le CSV brut et le dataset nettoyé de data/
+# ============================================================
+
+import json
+import sys
+from pathlib import Path
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Remonte à la racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.config import (RAW_DATA_PATH, CLEANED_DATA_PATH, MODEL_FEATURES_PARAMS_PATH,
+                        ENERGY_FEATURES_PATH, CO2_FEATURES_PATH)
+from src.preprocessing import COLUMNS_MAPPING, fit_model_features, fit_preprocessing, model_scope
+from src.feature_transform import RawFeatureTransform, RAW_INPUT_COLUMNS, transform_for
+from src.validation import FeatureValidator, feature_ranges, to_column_arrays
+
+pytestmark = pytest.mark.skipif(not RAW_DATA_PATH.exists() or not CLEANED_DATA_PATH.exists(),
+                                reason="données brutes / nettoyées absentes")
+
+
+@pytest.fixture(scope="module")
+def params():
+    """📐 Espace des features ajusté en flux sur le CSV brut (petits morceaux)."""
+    return fit_model_features(RAW_DATA_PATH, chunksize=500)
+
+
+@pytest.fixture(scope="module")
+def raw():
+    return pd.read_csv(RAW_DATA_PATH).rename(columns=COLUMNS_MAPPING)
+
+
+def test_raw_training_rows_reproduce_training_features(params, raw):
+    """🎯 Lignes brutes du périmètre → features (et cibles) de `dataset_cleaned.csv`, ligne à ligne."""
+    cleaned = pd.read_csv(CLEANED_DATA_PATH)
+    scoped = model_scope(raw)
+    assert len(scoped) == len(cleaned)
+
+    transform = RawFeatureTransform(params.to_dict())
+    derived = transform.derive({col: scoped[col].to_numpy() for col in RAW_INPUT_COLUMNS + ["ghg_emissions_total"]})
+    for feature, values in derived.items():
+        np.testing.assert_allclose(values, cleaned[feature].to_numpy(dtype=np.float64), rtol=1e-9, atol=1e-12,
+                                   err_msg=feature)
+
+    # 📐 Matrices complètes des deux modèles (indicateurs repris de l'entrée) : parité et plages respectées
+    for features_path in (ENERGY_FEATURES_PATH, CO2_FEATURES_PATH):
+        features = joblib.load(features_path)
+        columns = {col: scoped[col].to_numpy() for col in RAW_INPUT_COLUMNS}
+        columns.update({f: cleaned[f].to_numpy() for f in features if f not in derived})
+        matrix = transform.to_matrix(columns, features)
+        np.testing.assert_allclose(matrix, cleaned[features].to_numpy(dtype=np.float64), rtol=1e-9, atol=1e-12)
+        FeatureValidator(features, feature_ranges(cleaned, features)).check(matrix)
+
+
+def test_persisted_params_match_a_fresh_fit(params):
+    """💾 Les paramètres embarqués avec les modèles sont ceux de la recette."""
+    persisted = json.loads(MODEL_FEATURES_PARAMS_PATH.read_text())
+    fresh = params.to_dict()
+    assert persisted["recipe"] == fresh["recipe"] and persisted["continuous_cols"] == fresh["continuous_cols"]
+    assert persisted["medians"] == pytest.approx(fresh["medians"])
+    for col, bound in fresh["bounds"].items():
+        assert persisted["bounds"][col] == pytest.approx(list(bound)), col
+    np.testing.assert_allclose(persisted["scaler_mean"], fresh["scaler_mean"])
+    np.testing.assert_allclose(persisted["scaler_scale"], fresh["scaler_scale"])
+
+
+def test_other_feature_spaces_are_refused(tmp_path, raw):
+    """🛡️ Paramètres du script historique (autre espace de features) : pas de transformation `*_raw`."""
+    raw.head(200).rename(columns={v: k for k, v in COLUMNS_MAPPING.items()}).to_csv(tmp_path / "raw.csv", index=False)
+    historical = fit_preprocessing(tmp_path / "raw.csv").to_dict()
+    assert transform_for(historical) is None and transform_for(None) is None
+    with pytest.raises(ValueError, match="recette"):
+        RawFeatureTransform(historical)
+
+
+def test_missing_raw_column_is_rejected(params):
+    """⚠️ Une colonne brute absente lève une erreur explicite."""
+    columns = to_column_arrays({col: [1.0, None] for col in RAW_INPUT_COLUMNS if col != "year_built"})
+    with pytest.raises(ValueError, match="year_built"):
+        RawFeatureTransform(params.to_dict()).to_matrix(columns, ["year_built_cat"])
@@ -0,0 +1,102 @@
+# ============================================================
+# 🧪 Script de test (pytest) : test_grpc_service.py
+#     - Vérifie l'interface gRPC (src/grpc_service.py) sur un
+#       serveur grpc.aio local, en unaire et en flux bidirectionnel
+#     - Utilise un faux runner : aucun service BentoML nécessaire
+# ============================================================
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+import grpc
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Remonte à la racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.grpc_service import GrpcTarget, PredictionServicer
+from src.hot_swap import ModelSlot
+from src.prediction_cache import PredictionCache
+from src.protos import prediction_pb2, prediction_pb2_grpc
+
+
+class FakeRunnerMethod:
+    """🏃 Imite `runner.predict` : somme des features, et compte les appels."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def async_run(self, matrix, keys=None):
+        self.calls += 1
+        return matrix.sum(axis=1)
+
+
+async def _with_stub(servicer, scenario):
+    server = grpc.aio.server()
+    prediction_pb2_grpc.add_PredictionServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    try:
+        async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+            return await scenario(prediction_pb2_grpc.PredictionStub(channel))
+    finally:
+        await server.stop(None)
+
+
+def _servicer(runner, stream_window=64):
+    model_ref = SimpleNamespace(tag="model:v1", custom_objects={
+        "features": ["a", "b", "c"], "feature_ranges": {"min": [0, 0, 0], "max": [100, 100, 100]}})
+    slot = ModelSlot("model", runner, model_ref, poll_seconds=0)
+    target = GrpcTarget({"full": slot}, PredictionCache(max_bytes=0, ttl_seconds=60))
+    return PredictionServicer({"energy": target}, stream_window=stream_window)
+
+
+def test_unary_predict_decodes_packed_rows_and_reports_errors():
+    """📡 Une matrice packée ligne par ligne → une prédiction par ligne ; erreurs dans `error`."""
+    async def scenario(stub):
+        ok = await stub.Predict(prediction_pb2.PredictRequest(target="energy", features=[1, 2, 3, 4, 5, 6], n_rows=2))
+        bad = await stub.Predict(prediction_pb2.PredictRequest(target="energy", features=[1, 2, 1e6], request_id="x"))
+        unknown = await stub.Predict(prediction_pb2.PredictRequest(target="co2", features=[1, 2, 3]))
+        return ok, bad, unknown
+
+    ok, bad, unknown = asyncio.run(_with_stub(_servicer(FakeRunnerMethod()), scenario))
+    assert list(ok.predictions) == [6.0, 15.0] and ok.model_tag == "model:v1" and not ok.error
+    assert "hors plage" in bad.error and bad.request_id == "x" and not bad.predictions
+    assert "Cible inconnue" in unknown.error
+
+
+def test_stream_keeps_order_and_groups_pending_messages():
+    """🔄 Réponses dans l'ordre d'envoi ; un message invalide n'interrompt pas le flux."""
+    runner = FakeRunnerMethod()
+
+    async def scenario(stub):
+        async def requests():
+            for i in range(50):
+                features = [i, 1, np.nan] if i == 7 else [i, 1, 1]
+                yield prediction_pb2.PredictRequest(target="energy", features=features, request_id=str(i))
+        return [response async for response in stub.PredictStream(requests())]
+
+    responses = asyncio.run(_with_stub(_servicer(runner, stream_window=16), scenario))
+    assert [r.request_id for r in responses] == [str(i) for i in range(50)]
+    assert "non finie" in responses[7].error
+    assert [r.predictions[0] for i, r in enumerate(responses) if i != 7] == [i + 2.0 for i in range(50) if i != 7]
+    assert runner.calls <= 50 - 1
+
+
+def test_abandoned_stream_with_a_full_window_releases_the_reader():
+    """🛑 Flux quitté alors que la fenêtre est pleine : la tâche de lecture se termine (pas de tâche bloquée)."""
+    async def scenario():
+        async def endless_requests():
+            while True:
+                yield prediction_pb2.PredictRequest(target="energy", features=[1, 2, 3])
+
+        stream = _servicer(FakeRunnerMethod(), stream_window=2).PredictStream(endless_requests(), context=None)
+        await stream.__anext__()
+        await asyncio.sleep(0.05)  # ⏳ Le lecteur remplit la fenêtre puis attend sur `put`
+        reader = next(task for task in asyncio.all_tasks() if task is not asyncio.current_task())
+        await stream.aclose()  # Annulation côté client : le générateur sort de son `finally`
+        await asyncio.wait([reader], timeout=1)
+        return reader.done()
+
+    assert asyncio.run(scenario())
@@ -0,0 +1,144 @@
+# ============================================================
+# 🧪 Script de test (pytest) : test_hot_swap.py
+#     - Vérifie le remplacement à chaud (src/hot_swap.py) côté API
+#       et le service multi-versions du runnable (src/runners.py)
+#     - Store BentoML simulé : aucun modèle enregistré nécessaire
+# ============================================================
+
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+import bentoml
+import numpy as np
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Remonte à la racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src import runners
+from src.hot_swap import ModelSlot, version_key
+from src.runners import VersionedRunnable
+
+RANGES = {"min": [0, 0], "max": [10, 10]}
+
+
+def _ref(version, ranges=RANGES):
+    return SimpleNamespace(tag=bentoml.Tag("model", version), custom_objects={"features": ["a", "b"], "feature_ranges": ranges})
+
+
+class OffsetModel:
+    """🤖 Prédit `somme des features + offset` (offset propre à chaque version)."""
+
+    def __init__(self, offset):
+        self.offset = offset
+
+    def predict(self, matrix):
+        return matrix.sum(axis=1) + self.offset
+
+
+class OffsetRunnable(VersionedRunnable):
+    """🏃 Runnable de test : la version `vN` prédit avec un offset de N × 100."""
+
+    SUPPORTS_CPU_MULTI_THREADING = False
+
+    def load_model(self, model_ref):
+        return OffsetModel(int(model_ref.tag.version[1:]) * 100)
+
+
+class RunnableMethod:
+    """🏃 Imite `runner.predict` en appelant le runnable dans la boucle (option : pause avant réponse)."""
+
+    def __init__(self, runnable):
+        self.runnable = runnable
+        self.gate = None
+
+    async def async_run(self, matrix, keys=None):
+        if self.gate is not None:
+            await self.gate.wait()
+        return self.runnable.predict(matrix, keys)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """🗄️ Store simulé : `:latest` pointe sur la dernière version ajoutée."""
+    refs = {"model:v1": _ref("v1")}
+    latest = ["model:v1"]
+
+    def get(tag):
+        return refs[latest[0] if tag.endswith(":latest") else tag]
+
+    bentoml.models.get  # ⚠️ Module chargé paresseusement : le charger avant de le patcher
+    monkeypatch.setattr(bentoml.models, "get", get)
+    monkeypatch.setattr(bentoml.models, "list", lambda name: list(refs.values()))
+
+    def publish(version, ranges=RANGES):
+        refs[f"model:{version}"] = _ref(version, ranges)
+        latest[0] = f"model:{version}"
+    return publish
+
+
+def test_in_flight_request_finishes_on_old_version_then_old_model_is_freed(store, monkeypatch):
+    """♻️ Bascule atomique : la requête en vol garde v1, les suivantes ont v2 ; v1 libérée après drainage."""
+    runnable = OffsetRunnable("model:v1")
+    method = RunnableMethod(runnable)
+    slot = ModelSlot("model", method, _ref("v1"), poll_seconds=0)
+    row = np.array([[1.0, 2.0]])
+
+    async def scenario():
+        method.gate = asyncio.Event()
+        version = slot.acquire()
+        in_flight = asyncio.create_task(version.runner_method.async_run(row))
+        await asyncio.sleep(0)
+        store("v2")
+        method.gate.set()  # La chauffe de v2 et la requête en vol se terminent
+        status = await slot.reload()
+        return version.tag, await in_flight, status, await slot.acquire().runner_method.async_run(row)
+
+    old_tag, old_pred, status, new_pred = asyncio.run(scenario())
+    assert str(old_tag) == "model:v1" and old_pred.tolist() == [103.0]
+    assert status["swapped"] and status["model_tag"] == "model:v2" and new_pred.tolist() == [203.0]
+    assert set(runnable._versions) == {version_key("model:v1"), version_key("model:v2")}
+
+    monkeypatch.setattr(runners, "HOT_SWAP_DRAIN_SECONDS", 0.0)
+    runnable.predict(row, np.full(1, version_key("model:v2")))
+    assert set(runnable._versions) == {version_key("model:v2")}
+
+
+def test_mixed_batch_is_split_by_version(store):
+    """🧮 Un lot micro-batché à cheval sur deux versions : chaque ligne prédite par la sienne."""
+    store("v2")
+    runnable = OffsetRunnable("model:v1")
+    keys = np.array([version_key("model:v1"), version_key("model:v2"), version_key("model:v1")])
+    predictions = runnable.predict(np.zeros((3, 2)), keys)
+    assert predictions.tolist() == [100.0, 200.0, 100.0]
+    assert runnable.predict_bulk(np.zeros((3, 2)), keys).tolist() == predictions.tolist()  # Hors micro-batching
+
+
+def test_concurrent_batches_survive_eviction(store, monkeypatch):
+    """🧵 Lots concurrents sur deux versions pendant que l'autre est drainée : aucune KeyError."""
+    store("v2")
+    monkeypatch.setattr(runners, "HOT_SWAP_DRAIN_SECONDS", 0.0)  # Chaque lot peut évincer la version non courante
+    runnable = OffsetRunnable("model:v1")
+    row = np.zeros((1, 2))
+
+    def predict(i):
+        version = "v1" if i % 2 else "v2"
+        return runnable.predict(row, np.full(1, version_key(f"model:{version}"))).tolist()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(predict, range(2000)))
+    assert results == [[100.0] if i % 2 else [200.0] for i in range(2000)]
+
+
+def test_failed_warmup_keeps_serving_current_version(store):
+    """🛡️ Nouvelle version qui ne chauffe pas (prédiction non finie) : refusée, v1 conservée."""
+    runnable = OffsetRunnable("model:v1")
+    slot = ModelSlot("model", RunnableMethod(runnable), _ref("v1"), poll_seconds=0)
+    store("v9", ranges={"min": [np.inf, 0], "max": [np.inf, 10]})  # Sonde non finie
+
+    with pytest.raises(ValueError, match="chauffe"):
+        asyncio.run(slot.reload())
+    assert str(slot.current.tag) == "model:v1" and slot.status()["last_error"]
+    assert asyncio.run(slot.reload("model:v1")) == {"swapped": False, "model_tag": "model:v1"}
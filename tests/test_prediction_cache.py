@@ -0,0 +1,84 @@
+# ============================================================
+# 🧪 Script de test (pytest) : test_prediction_cache.py
+#     - Vérifie le cache LRU/TTL des prédictions (src/prediction_cache.py)
+#     - Utilise un faux runner : aucun service BentoML nécessaire
+# ============================================================
+
+import asyncio
+import sys
+from pathlib import Path
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Remonte à la racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.prediction_cache import PredictionCache, predict_with_cache, ENTRY_BYTES
+
+
+class FakeRunnerMethod:
+    """🏃 Imite `runner.predict` : somme des features, et compte les lignes reçues."""
+
+    def __init__(self):
+        self.rows_seen = 0
+
+    async def async_run(self, matrix):
+        self.rows_seen += matrix.shape[0]
+        return matrix.sum(axis=1)
+
+
+def test_only_missing_rows_reach_the_runner():
+    """🗃️ Les lignes déjà prédites sont servies par le cache."""
+    cache = PredictionCache(max_bytes=100 * ENTRY_BYTES, ttl_seconds=60)
+    runner = FakeRunnerMethod()
+    matrix = np.arange(12, dtype=float).reshape(4, 3)
+
+    first = asyncio.run(predict_with_cache(cache, runner, matrix, "model:v1", 256))
+    second = asyncio.run(predict_with_cache(cache, runner, matrix[::-1], "model:v1", 256))
+
+    np.testing.assert_array_equal(second, first[::-1])
+    assert runner.rows_seen == 4
+    assert cache.stats()["hits"] == 4 and cache.stats()["misses"] == 4
+
+
+def test_new_model_tag_invalidates_entries():
+    """🔑 Un nouveau tag de modèle ne réutilise pas les anciennes clés."""
+    cache = PredictionCache(max_bytes=100 * ENTRY_BYTES, ttl_seconds=60)
+    runner = FakeRunnerMethod()
+    matrix = np.ones((2, 3))
+
+    asyncio.run(predict_with_cache(cache, runner, matrix, "model:v1", 256))
+    asyncio.run(predict_with_cache(cache, runner, matrix, "model:v2", 256))
+    assert runner.rows_seen == 4
+
+
+def test_lru_budget_and_ttl():
+    """♻️ Le budget mémoire évince les plus anciennes entrées ; le TTL les expire."""
+    cache = PredictionCache(max_bytes=2 * ENTRY_BYTES, ttl_seconds=60)
+    keys = cache.keys_for(np.eye(3), "model:v1")
+    cache.put_many(keys, [1.0, 2.0, 3.0])
+    _, missing = cache.get_many(keys)
+    assert missing.tolist() == [True, False, False]
+
+    expired = PredictionCache(max_bytes=10 * ENTRY_BYTES, ttl_seconds=-1)
+    expired.put_many(keys, [1.0, 2.0, 3.0])
+    _, missing = expired.get_many(keys)
+    assert missing.all()
+
+
+def test_vector_entries_for_explanations():
+    """🔍 Un vecteur par ligne (attributions) : servi depuis le cache, budget mémoire par taille de vecteur."""
+    cache = PredictionCache(max_bytes=100 * ENTRY_BYTES, ttl_seconds=60, width=3)
+    assert cache.max_entries < 100
+
+    class VectorRunnerMethod(FakeRunnerMethod):
+        async def async_run(self, matrix):
+            self.rows_seen += matrix.shape[0]
+            return matrix * 2
+
+    runner = VectorRunnerMethod()
+    matrix = np.arange(12, dtype=float).reshape(4, 3)
+    first = asyncio.run(predict_with_cache(cache, runner, matrix, "model:v1", 256, width=3))
+    second = asyncio.run(predict_with_cache(cache, runner, matrix[[3, 0]], "model:v1", 256, width=3))
+    np.testing.assert_array_equal(first, matrix * 2)
+    np.testing.assert_array_equal(second, matrix[[3, 0]] * 2)
+    assert runner.rows_seen == 4
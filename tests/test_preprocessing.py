@@ -0,0 +1,106 @@
+# ============================================================
+# 🧪 Script de test (pytest) : test_preprocessing.py
+#     - Vérifie que le pipeline en flux (src/preprocessing.py)
+#       reproduit le calcul historique en mémoire
+#     - Utilise un petit CSV brut synthétique (aucune donnée réelle requise)
+# ============================================================
+
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Remonte à la racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.preprocessing import (
+    COLUMNS_MAPPING, CONTINUOUS_COLS, WINSORIZE_COLS,
+    QuantileSketch, FittedPreprocessing, fit_preprocessing, transform_to_files,
+)
+
+
+# ============================================================
+# 📂 Fixture : CSV brut synthétique avec valeurs manquantes
+# ============================================================
+@pytest.fixture(scope="module")
+def raw_csv(tmp_path_factory):
+    """📂 Génère 1 000 bâtiments aux colonnes du fichier de benchmarking."""
+    rng = np.random.default_rng(42)
+    n = 1000
+    raw = pd.DataFrame({
+        "SiteEnergyUse(kBtu)": rng.lognormal(14, 1.2, n),
+        "Electricity(kWh)": rng.lognormal(12, 1.2, n),
+        "Electricity(kBtu)": rng.lognormal(13, 1.2, n),
+        "NaturalGas(kBtu)": rng.lognormal(12, 1.5, n),
+        "SiteEUI(kBtu/sf)": rng.lognormal(4, 0.6, n),
+        "PropertyGFATotal": rng.lognormal(11, 1.0, n),
+        "NumberofFloors": rng.integers(1, 40, n).astype(float),
+        "YearBuilt": rng.integers(1900, 2016, n).astype(float),
+    })
+    raw.loc[rng.choice(n, 30, replace=False), "PropertyGFATotal"] = np.nan
+    raw.loc[rng.choice(n, 10, replace=False), "SiteEnergyUse(kBtu)"] = np.nan
+    path = tmp_path_factory.mktemp("raw") / "raw.csv"
+    raw.to_csv(path, index=False)
+    return path
+
+
+def test_streaming_fit_matches_in_memory_reference(raw_csv):
+    """📐 Médiane, bornes et standardisation identiques au calcul en mémoire."""
+    params = fit_preprocessing(raw_csv, chunksize=128)
+
+    df = pd.read_csv(raw_csv).rename(columns=COLUMNS_MAPPING)
+    assert params.medians["gfa_total"] == pytest.approx(df["gfa_total"].median())
+    df = df.fillna(params.medians)
+    for col in WINSORIZE_COLS:
+        expected = (df[col].quantile(0.01), df[col].quantile(0.99))
+        assert params.bounds[col] == pytest.approx(expected), f"❌ Bornes de '{col}'"
+        df[col] = df[col].clip(*expected)
+
+    df["electricity_ratio"] = df["electricity_kbtu"] / (df["site_energy_use"] + 1e-9)
+    df["gas_ratio"] = df["natural_gas_kbtu"] / (df["site_energy_use"] + 1e-9)
+    df["building_density"] = df["gfa_total"] / (df["site_energy_use"] + 1e-9)
+    scaler = StandardScaler().fit(df[CONTINUOUS_COLS])
+    np.testing.assert_allclose(params.scaler_mean, scaler.mean_)
+    np.testing.assert_allclose(params.scaler_scale, scaler.scale_)
+
+
+def test_transform_is_independent_of_chunksize(raw_csv, tmp_path):
+    """🌊 Les fichiers exportés ne dépendent pas de la taille des morceaux."""
+    params = fit_preprocessing(raw_csv, chunksize=1000)
+    params.save(tmp_path / "params.json")
+    reloaded = FittedPreprocessing.load(tmp_path / "params.json")
+
+    transform_to_files(raw_csv, params, tmp_path / "co2_a.csv", tmp_path / "energy_a.csv", chunksize=1000)
+    transform_to_files(raw_csv, reloaded, tmp_path / "co2_b.csv", tmp_path / "energy_b.csv", chunksize=77)
+    for name in ["co2", "energy"]:
+        pd.testing.assert_frame_equal(pd.read_csv(tmp_path / f"{name}_a.csv"), pd.read_csv(tmp_path / f"{name}_b.csv"))
+
+
+def test_quantile_sketch_stays_accurate_after_compaction():
+    """📏 Au-delà de sa capacité, le sketch garde une erreur de rang faible dans les queues."""
+    values = np.random.default_rng(0).lognormal(14, 1.5, 200_000)
+    sketch = QuantileSketch(capacity=2048)
+    for chunk in np.array_split(values, 40):
+        sketch.update(chunk)
+
+    assert len(sketch.values) <= 2048
+    for q in (0.01, 0.5, 0.99):
+        rank = np.searchsorted(np.sort(values), sketch.quantile(q)) / len(values)
+        assert abs(rank - q) < 0.002, f"❌ Quantile {q} : rang obtenu {rank:.4f}"
+
+
+def test_append_mode_only_transforms_new_rows(raw_csv, tmp_path):
+    """♻️ Ajouter une nouvelle année avec les paramètres figés = transformer le fichier complet."""
+    params = fit_preprocessing(raw_csv, chunksize=1000)
+    raw = pd.read_csv(raw_csv)
+    raw.iloc[:600].to_csv(tmp_path / "old.csv", index=False)
+    raw.iloc[600:].to_csv(tmp_path / "new.csv", index=False)
+
+    transform_to_files(raw_csv, params, tmp_path / "co2_full.csv", tmp_path / "energy_full.csv")
+    transform_to_files(tmp_path / "old.csv", params, tmp_path / "co2.csv", tmp_path / "energy.csv")
+    n_new = transform_to_files(tmp_path / "new.csv", params, tmp_path / "co2.csv", tmp_path / "energy.csv", append=True)
+    assert n_new == 400
+    for name in ["co2", "energy"]:
+        pd.testing.assert_frame_equal(pd.read_csv(tmp_path / f"{name}.csv"), pd.read_csv(tmp_path / f"{name}_full.csv"))
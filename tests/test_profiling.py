@@ -0,0 +1,96 @@
+# ============================================================
+# 🧪 Script de test (pytest) : test_profiling.py
+#     - Vérifie le profilage opt-in (src/profiling.py) : balises
+#       inactives hors session, agrégation par étape, fichiers écrits
+#     - Profile le prétraitement d'un petit CSV brut synthétique
+# ============================================================
+
+import json
+import pstats
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Remonte à la racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src import profiling as profiling_module
+from src.profiling import profiling, stage, compare_to_baseline
+from src.preprocessing import fit_preprocessing, transform_to_files
+
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    """📂 300 bâtiments aux colonnes du fichier de benchmarking."""
+    rng = np.random.default_rng(7)
+    n = 300
+    raw = pd.DataFrame({
+        "SiteEnergyUse(kBtu)": rng.lognormal(14, 1.2, n),
+        "Electricity(kWh)": rng.lognormal(12, 1.2, n),
+        "Electricity(kBtu)": rng.lognormal(13, 1.2, n),
+        "NaturalGas(kBtu)": rng.lognormal(12, 1.5, n),
+        "SiteEUI(kBtu/sf)": rng.lognormal(4, 0.6, n),
+        "PropertyGFATotal": rng.lognormal(11, 1.0, n),
+        "NumberofFloors": rng.integers(1, 40, n).astype(float),
+        "YearBuilt": rng.integers(1900, 2016, n).astype(float),
+    })
+    path = tmp_path / "raw.csv"
+    raw.to_csv(path, index=False)
+    return path
+
+
+def test_stages_are_inactive_outside_a_session_and_nested_inside(tmp_path):
+    """🏷️ Hors session : rien n'est mesuré ; en session : appels, lignes et pic mémoire imbriqués."""
+    with stage("outside", rows=5) as timer:
+        timer.rows = 10
+    assert profiling_module._active is None
+
+    with profiling("unit", output_dir=tmp_path) as report:
+        for _ in range(3):
+            with stage("parent", rows=100):
+                with stage("child") as timer:
+                    buffer = np.ones(2 ** 20)  # 8 Mo alloués dans la sous-étape
+                    timer.rows = len(buffer)
+                del buffer
+    assert profiling_module._active is None
+
+    stages = report["stages"]
+    assert "outside" not in stages
+    assert stages["parent"]["calls"] == 3 and stages["parent"]["rows"] == 300
+    assert stages["child"]["rows"] == 3 * 2 ** 20
+    assert stages["child"]["peak_mb"] >= 8 and stages["parent"]["peak_mb"] >= stages["child"]["peak_mb"]
+    assert stages["parent"]["seconds"] >= stages["child"]["seconds"]
+
+    saved = json.loads((tmp_path / "profile_unit.json").read_text())
+    assert saved["stages"]["parent"]["calls"] == 3
+    assert pstats.Stats(str(tmp_path / "profile_unit.prof")).total_calls > 0
+
+
+def test_preprocessing_reports_every_pipeline_stage(raw_csv, tmp_path):
+    """🔄 Ajustement + transformation : chaque étape du pipeline est mesurée avec ses lignes."""
+    with profiling("preprocessing", output_dir=tmp_path, use_cprofile=False) as report:
+        params = fit_preprocessing(raw_csv, chunksize=100)
+        transform_to_files(raw_csv, params, tmp_path / "co2.csv", tmp_path / "energy.csv", chunksize=100)
+
+    stages = report["stages"]
+    # 📂 Deux lectures pour l'ajustement, une pour la transformation
+    assert stages["loading"]["rows"] == 900
+    assert stages["imputation"]["rows"] == 900
+    for name in ("winsorizing", "feature_derivation"):
+        assert stages[name]["rows"] == 600, name  # Passe B + transformation
+    for name in ("binning", "scaling", "export"):
+        assert stages[name]["rows"] == 300, name
+    assert stages["loading"]["rows_per_s"] > 0 and "top_functions" not in report
+
+
+def test_baseline_comparison_ignores_noise():
+    """🚨 Régression signalée seulement au-delà de la tolérance ET du plancher en secondes."""
+    baseline = {"stages": {"loading": {"seconds": 1.0}, "export": {"seconds": 0.01}, "fit": {"seconds": 2.0}}}
+    report = {"stages": {"loading": {"seconds": 1.5}, "export": {"seconds": 0.03}, "fit": {"seconds": 2.1},
+                         "binning": {"seconds": 9.0}}}
+
+    regressions = compare_to_baseline(report, baseline, tolerance=0.25, min_seconds=0.05)
+    assert [r["stage"] for r in regressions] == ["loading"]
+    assert regressions[0]["ratio"] == pytest.approx(1.5)
@@ -0,0 +1,75 @@
+# ============================================================
+# 🧪 Script de test (pytest) : test_scoring.py
+#     - Vérifie le scoring hors ligne par morceaux (src/scoring.py)
+#     - Utilise de petits modèles linéaires (aucun store BentoML requis)
+# ============================================================
+
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Remonte à la racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.scoring import ScoringModel, ParallelScorer, score_chunk, score_file
+
+
+@pytest.fixture(scope="module")
+def buildings():
+    """📂 300 bâtiments synthétiques avec un identifiant."""
+    rng = np.random.default_rng(3)
+    return pd.DataFrame({
+        "building_id": np.arange(300),
+        "site_eui": rng.normal(size=300),
+        "gas_ratio": rng.uniform(size=300),
+    })
+
+
+@pytest.fixture(scope="module")
+def models(buildings):
+    """🤖 Énergie(site_eui, gas_ratio) puis CO₂(site_energy_use, gas_ratio)."""
+    X = buildings[["site_eui", "gas_ratio"]].to_numpy()
+    energy = LinearRegression().fit(X, 2 * X[:, 0] + X[:, 1])
+    co2 = LinearRegression().fit(X, 3 * X[:, 0] - X[:, 1])
+    return [
+        ScoringModel(energy, ["site_eui", "gas_ratio"], "site_energy_use"),
+        ScoringModel(co2, ["site_energy_use", "gas_ratio"], "ghg_emissions_total"),
+    ]
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_chunked_scoring_matches_single_predict(buildings, models, tmp_path, suffix):
+    """📦 Les résultats par morceaux égalent une prédiction unique, ordre conservé."""
+    if suffix == ".parquet":
+        pytest.importorskip("pyarrow")
+    input_path = tmp_path / f"in{suffix}"
+    output_path = tmp_path / f"out{suffix}"
+    buildings.to_csv(input_path, index=False) if suffix == ".csv" else buildings.to_parquet(input_path)
+
+    assert score_file(input_path, output_path, models, chunksize=64, id_columns=["building_id"]) == len(buildings)
+    scores = pd.read_csv(output_path) if suffix == ".csv" else pd.read_parquet(output_path)
+
+    energy = models[0].model.predict(buildings[["site_eui", "gas_ratio"]].to_numpy())
+    co2 = models[1].model.predict(np.column_stack([energy, buildings["gas_ratio"]]))
+    np.testing.assert_array_equal(scores["building_id"], buildings["building_id"])
+    np.testing.assert_allclose(scores["site_energy_use"], energy)
+    np.testing.assert_allclose(scores["ghg_emissions_total"], co2)
+
+
+def test_missing_feature_is_reported(buildings, models, tmp_path):
+    """⚠️ Une feature absente du fichier lève une erreur explicite."""
+    input_path = tmp_path / "in.csv"
+    buildings.drop(columns="gas_ratio").to_csv(input_path, index=False)
+    with pytest.raises(ValueError, match="gas_ratio"):
+        score_file(input_path, tmp_path / "out.csv", models)
+
+
+def test_parallel_scorer_preserves_row_order(buildings, models):
+    """🧵 Le pool de processus rend les mêmes prédictions, dans le même ordre."""
+    expected = score_chunk(buildings, models, ["building_id"])
+    with ParallelScorer(models, workers=2, threads_per_worker=1) as scorer:
+        result = scorer.score(buildings, ["building_id"])
+    pd.testing.assert_frame_equal(result, expected)
@@ -0,0 +1,142 @@
+# ============================================================
+# 🧪 Script de test (pytest) : test_training.py
+#     - Vérifie la recherche par successive halving (src/training.py)
+#     - Vérifie la chaîne `--append` (features des modèles) → `--incremental`
+#     - Utilise un petit CSV synthétique, sans écriture dans le store BentoML
+# ============================================================
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+import bentoml
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Remonte à la racine du projet
+sys.path.append(str(BASE_DIR))
+
+import src.training as training
+from src.preprocessing import fit_model_features, transform_model_features
+from src.tree_compiler import compile_tree_ensemble
+
+INCREMENT_FEATURES = ["site_eui", "gas_ratio", "building_density", "floors_cat", "property_type_office"]
+
+
+@pytest.fixture
+def synthetic_target(tmp_path, monkeypatch):
+    """📂 300 bâtiments synthétiques et une cible « energy » pointant dessus."""
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame(rng.normal(size=(300, 4)), columns=["a", "b", "c", "d"])
+    frame["y"] = 2 * frame["a"] - frame["b"] ** 2 + 0.1 * rng.normal(size=300)
+    frame.to_csv(tmp_path / "train.csv", index=False)
+    joblib.dump(["a", "b", "c", "d"], tmp_path / "features.pkl")
+    monkeypatch.setitem(training.TRAINING_TARGETS, "energy", ("y", "test_model", tmp_path / "features.pkl"))
+    return tmp_path / "train.csv"
+
+
+def test_successive_halving_keeps_the_best_third_each_rung(synthetic_target):
+    X, y, _, _ = training.load_training_data("energy", synthetic_target)
+    candidates = training.sample_candidates(["lightgbm", "random_forest"], n_candidates=9)
+    ranked, history = training.successive_halving(candidates, X, y, folds=3, factor=3, n_jobs=1)
+
+    assert [rung["candidates"] for rung in history] == [18, 6]
+    assert [rung["fraction"] for rung in history] == [pytest.approx(1 / 3), 1]
+    assert ranked[0]["cv_rmse"] == min(c["cv_rmse"] for c in ranked)
+    assert all(c["n_estimators"] for c in ranked if c["family"] == "lightgbm")
+
+
+def test_train_target_returns_a_fitted_compilable_winner(synthetic_target):
+    """🏆 Le gagnant est ré-ajusté, évalué sur le jeu de test et compilable (backend flat_trees)."""
+    model, report = training.train_target("energy", ["lightgbm"], n_candidates=6, n_jobs=2,
+                                          data_path=synthetic_target, register=False)
+    assert report["family"] == "lightgbm" and report["n_test"] == 60
+    assert report["metrics"]["r2"] > 0.5
+    X = pd.read_csv(synthetic_target)[report["features"]].to_numpy()
+    np.testing.assert_allclose(compile_tree_ensemble(model).predict(X), model.predict(X), atol=1e-9)
+
+
+def test_extend_model_keeps_existing_trees(synthetic_target):
+    """♻️ LightGBM prolongé : les 20 premiers arbres sont ceux du modèle d'origine ; forêt en warm start."""
+    X, y, _, _ = training.load_training_data("energy", synthetic_target)
+    base = training.make_estimator("lightgbm", {"num_leaves": 8}, n_estimators=20).fit(X[:200], y[:200])
+    extended = training.extend_model(base, X[200:], y[200:], extra_trees=10)
+    assert training.count_trees(base) == 20 and training.count_trees(extended) == 30
+    np.testing.assert_allclose(extended.booster_.predict(X, num_iteration=20), base.predict(X))
+
+    forest = training.make_estimator("random_forest", {"n_estimators": 5}).fit(X[:200], y[:200])
+    grown = training.extend_model(forest, X[200:], y[200:], extra_trees=3)
+    assert training.count_trees(forest) == 5 and training.count_trees(grown) == 8
+    first_five = np.mean([tree.predict(X) for tree in grown.estimators_[:5]], axis=0)
+    np.testing.assert_allclose(first_five, forest.predict(X))
+
+
+def test_lineage_accumulates_over_increments():
+    """🧬 Chaque ajout allonge la chaîne d'ancêtres et l'historique des increments."""
+    first = training.lineage_metadata("m:v1", {"training": {"family": "lightgbm"}}, {"n_rows": 10})
+    second = training.lineage_metadata("m:v2", first, {"n_rows": 20})
+    assert second["training"] == {"family": "lightgbm"}
+    assert second["lineage"]["parent"] == "m:v2"
+    assert second["lineage"]["ancestors"] == ["m:v1", "m:v2"]
+    assert [i["n_rows"] for i in second["lineage"]["increments"]] == [10, 20]
+
+
+def _raw_buildings(rng, n):
+    """📂 Bâtiments bruts (colonnes du fichier de benchmarking) + indicateur non dérivé, cibles parfois absentes."""
+    gfa = rng.lognormal(11, 1.0, n)
+    eui = rng.lognormal(4, 0.5, n)
+    energy = gfa * eui
+    gas = np.where(rng.random(n) < 0.3, 0.0, energy * rng.uniform(0.1, 0.5, n))
+    raw = pd.DataFrame({
+        "BuildingType": rng.choice(["NonResidential", "Campus", "Multifamily LR (1-4)"], n),
+        "SiteEnergyUse(kBtu)": energy, "Electricity(kBtu)": energy - gas, "NaturalGas(kBtu)": gas,
+        "SiteEUI(kBtu/sf)": eui, "PropertyGFATotal": gfa,
+        "NumberofFloors": rng.integers(1, 30, n).astype(float), "YearBuilt": rng.integers(1900, 2016, n).astype(float),
+        "TotalGHGEmissions": 5e-5 * energy + 3e-4 * gas, "property_type_office": rng.integers(0, 2, n),
+    })
+    raw.loc[rng.choice(n, 10, replace=False), "TotalGHGEmissions"] = np.nan
+    return raw
+
+
+def test_appended_raw_rows_feed_the_incremental_update(tmp_path, monkeypatch):
+    """♻️ Lignes brutes → features des modèles + cibles (paramètres figés) → `incremental_update`."""
+    rng = np.random.default_rng(1)
+    history, new = _raw_buildings(rng, 600), _raw_buildings(rng, 300)
+    history.to_csv(tmp_path / "raw_2016.csv", index=False)
+    new.to_csv(tmp_path / "raw_2017.csv", index=False)
+    params = fit_model_features(tmp_path / "raw_2016.csv", chunksize=128)
+    joblib.dump(INCREMENT_FEATURES, tmp_path / "features.pkl")
+    monkeypatch.setitem(training.TRAINING_TARGETS, "energy", ("site_energy_use", "test_model", tmp_path / "features.pkl"))
+
+    transform_model_features(tmp_path / "raw_2016.csv", params, tmp_path / "history.csv", INCREMENT_FEATURES, 128)
+    n_new = transform_model_features(tmp_path / "raw_2017.csv", params, tmp_path / "increment.csv",
+                                     INCREMENT_FEATURES, chunksize=128)
+    in_scope = ~new["BuildingType"].str.startswith("Multifamily") & new["TotalGHGEmissions"].notna()
+    assert n_new == int(in_scope.sum())
+    assert list(pd.read_csv(tmp_path / "increment.csv").columns) == INCREMENT_FEATURES + ["site_energy_use",
+                                                                                           "ghg_emissions_total"]
+
+    X, y, _, _ = training.load_training_data("energy", tmp_path / "history.csv")
+    parent_model = training.make_estimator("lightgbm", {"num_leaves": 8}, n_estimators=20).fit(X, y)
+    parent = SimpleNamespace(tag=bentoml.Tag("test_model", "v1"), custom_objects={"features": INCREMENT_FEATURES},
+                             info=SimpleNamespace(metadata={}))
+    bentoml.models.get, bentoml.sklearn.load_model  # ⚠️ Modules chargés paresseusement : les charger avant de les patcher
+    monkeypatch.setattr(bentoml.models, "get", lambda tag: parent)
+    monkeypatch.setattr(bentoml.sklearn, "load_model", lambda ref: parent_model)
+
+    extended, increment = training.incremental_update("energy", tmp_path / "increment.csv", extra_trees=5,
+                                                      force=True, register=False)
+    assert increment["n_rows"] == n_new
+    assert increment["trees_before"] == 20 and increment["trees_after"] == 25
+    np.testing.assert_allclose(extended.booster_.predict(X, num_iteration=20), parent_model.predict(X))
+
+
+def test_append_requires_non_derived_indicators(tmp_path):
+    """⚠️ Indicateur absent du CSV brut : erreur explicite plutôt qu'un fichier inutilisable."""
+    raw = _raw_buildings(np.random.default_rng(2), 200)
+    raw.to_csv(tmp_path / "raw.csv", index=False)
+    params = fit_model_features(tmp_path / "raw.csv")
+    raw.drop(columns="property_type_office").to_csv(tmp_path / "new.csv", index=False)
+    with pytest.raises(ValueError, match="property_type_office"):
+        transform_model_features(tmp_path / "new.csv", params, tmp_path / "out.csv", INCREMENT_FEATURES)
@@ -0,0 +1,85 @@
+# ============================================================
+# 🧪 Script de test (pytest) : test_tree_compiler.py
+#     - Parité entre les tables de nœuds (src/tree_compiler.py)
+#       et le `predict` d'origine des modèles
+#     - Petits modèles entraînés à la volée + modèles finaux de models/
+# ============================================================
+
+import sys
+from pathlib import Path
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Remonte à la racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.config import ENERGY_MODEL_PATH, ENERGY_FEATURES_PATH, CO2_MODEL_PATH, CO2_FEATURES_PATH, CLEANED_DATA_PATH
+from src.tree_compiler import FlatTreeEnsemble, compile_tree_ensemble
+
+lightgbm = pytest.importorskip("lightgbm")
+
+
+@pytest.fixture(scope="module")
+def training_data():
+    """📂 Données synthétiques avec des NaN et des zéros."""
+    rng = np.random.default_rng(11)
+    X = rng.normal(size=(2000, 6))
+    y = X[:, 0] * 3 + np.sin(X[:, 1]) + X[:, 2] * X[:, 3] + rng.normal(scale=0.1, size=2000)
+    X[rng.random(X.shape) < 0.05] = np.nan
+    X[rng.random(X.shape) < 0.05] = 0.0
+    return X, y
+
+
+def assert_parity(model, X):
+    ensemble = FlatTreeEnsemble.from_arrays(compile_tree_ensemble(model).to_arrays())
+    np.testing.assert_allclose(ensemble.predict(X), model.predict(X), rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("params", [{}, {"zero_as_missing": True}, {"use_missing": False}])
+def test_lightgbm_parity(training_data, params):
+    """🌿 LightGBM, avec les trois règles de valeurs manquantes."""
+    X, y = training_data
+    model = lightgbm.LGBMRegressor(n_estimators=50, num_leaves=15, verbose=-1, **params).fit(X, y)
+    assert_parity(model, X)
+
+
+def test_random_forest_parity(training_data):
+    """🌳 Forêt scikit-learn (seuils comparés en float32)."""
+    X, y = training_data
+    X = np.nan_to_num(X)
+    model = RandomForestRegressor(n_estimators=20, max_depth=8, random_state=0).fit(X, y)
+    assert_parity(model, X)
+
+
+@pytest.mark.parametrize("model_path, features_path", [
+    (ENERGY_MODEL_PATH, ENERGY_FEATURES_PATH),
+    (CO2_MODEL_PATH, CO2_FEATURES_PATH),
+])
+def test_final_models_parity(model_path, features_path):
+    """📦 Modèles finaux du dépôt sur le dataset nettoyé."""
+    if not (Path(model_path).exists() and CLEANED_DATA_PATH.exists()):
+        pytest.skip("Modèles ou données absents.")
+    model, features = joblib.load(model_path), joblib.load(features_path)
+    assert_parity(model, pd.read_csv(CLEANED_DATA_PATH)[features].to_numpy(dtype=np.float64))
+
+
+def test_unsupported_objective_is_rejected(training_data):
+    """⚠️ Un objectif avec transformation (poisson → exp) n'est pas compilé."""
+    X, y = training_data
+    model = lightgbm.LGBMRegressor(objective="poisson", n_estimators=5, verbose=-1).fit(X, np.abs(y))
+    with pytest.raises(ValueError, match="Objectif"):
+        compile_tree_ensemble(model)
+
+
+def test_npy_round_trip_is_memory_mapped(training_data, tmp_path):
+    """💾 Tables rechargées en mmap (pages partagées), prédictions identiques."""
+    X, y = training_data
+    model = lightgbm.LGBMRegressor(n_estimators=10, verbose=-1).fit(X, y)
+    compile_tree_ensemble(model).save(tmp_path / "flat_trees")
+
+    ensemble = FlatTreeEnsemble.load(tmp_path / "flat_trees", mmap=True)
+    assert not ensemble.threshold.flags.owndata and not ensemble.threshold.flags.writeable  # Vue sur le fichier
+    np.testing.assert_allclose(ensemble.predict(X), model.predict(X), rtol=1e-12, atol=1e-12)
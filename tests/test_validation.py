@@ -0,0 +1,80 @@
+# ============================================================
+# 🧪 Script de test (pytest) : test_validation.py
+#     - Vérifie la validation vectorisée des requêtes (src/validation.py)
+#     - Forme, valeurs non finies et plages d'entraînement, avec
+#       des erreurs indexées (ligne, feature)
+# ============================================================
+
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Remonte à la racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.validation import FeatureValidator, FeatureValidationError, feature_ranges
+
+FEATURES = ["site_eui", "gas_ratio", "floors_cat"]
+
+
+@pytest.fixture
+def validator():
+    """📐 Plages apprises sur un petit jeu d'entraînement, marge de 10 %."""
+    train = pd.DataFrame({"site_eui": [10.0, 110.0], "gas_ratio": [0.0, 1.0], "floors_cat": [1.0, 3.0]})
+    return FeatureValidator(FEATURES, feature_ranges(train, FEATURES), margin=0.1, max_errors=2)
+
+
+def test_valid_payloads_become_float64_matrices(validator):
+    """✅ Une ligne → (1, k), un lot → (n, k), sans copie supplémentaire côté appelant."""
+    row = validator.validate_row({"features": [50, 0.5, 2]})
+    assert row.shape == (1, 3) and row.dtype == np.float64
+    batch = validator.validate_rows({"features": [[50, 0.5, 2], [105.0, 1.05, 1]]})
+    assert batch.shape == (2, 3)
+
+
+def test_errors_are_indexed_by_row_and_feature(validator):
+    """📍 NaN, inf et hors plage sont signalés avec leur ligne et leur feature."""
+    with pytest.raises(FeatureValidationError) as excinfo:
+        validator.validate_rows({"features": [[50, 0.5, 2], [float("nan"), 0.5, 2], [50, np.inf, 99]]})
+    error = excinfo.value
+    assert error.total == 3
+    assert error.details == ["ligne 1, 'site_eui' (index 0) : valeur non finie (nan)",
+                             "ligne 2, 'gas_ratio' (index 1) : valeur non finie (inf)"]
+    assert "(+1 autres)" in str(error)
+
+
+@pytest.mark.parametrize("payload", [
+    {"features": [1, 2]},                  # mauvaise longueur
+    {"features": [[50, 0.5, 2]]},          # matrice sur l'endpoint unitaire
+    {"features": [50, "abc", 2]},          # valeur non numérique
+    {"values": [50, 0.5, 2]},              # clé absente
+])
+def test_malformed_single_row_is_rejected(validator, payload):
+    with pytest.raises(ValueError):
+        validator.validate_row(payload)
+
+
+def test_without_ranges_only_finiteness_is_checked():
+    """🩹 Ancien modèle sans `feature_ranges` : toute valeur finie est acceptée."""
+    validator = FeatureValidator(FEATURES)
+    assert validator.validate_row({"features": [1e9, -5, 42]}).shape == (1, 3)
+    with pytest.raises(FeatureValidationError):
+        validator.validate_row({"features": [1e9, None, 42]})
+
+
+@pytest.mark.parametrize("ranges", [None, {"min": [10.0, 0.0, 1.0], "max": [110.0, 1.0, 3.0]}])
+def test_single_row_fast_path_agrees_with_the_full_check(ranges):
+    """⚡ Chemin rapide d'une ligne : mêmes acceptations / refus que la validation d'un lot (bornes, NaN, ±inf)."""
+    validator = FeatureValidator(FEATURES, ranges, margin=0.1)
+    rows = [[50, 0.5, 2], [0.0, -0.1, 3.2], [120.0, 1.1, 0.8], [-1e300, 0.5, 2], [50, True, 2],
+            [np.inf, 0.5, 2], [50, -np.inf, 2], [50, 0.5, float("nan")], [50, None, 2]]
+    for row in rows:
+        try:
+            expected = validator.validate_rows({"features": [row]})
+        except FeatureValidationError:
+            with pytest.raises(FeatureValidationError):
+                validator.validate_row({"features": row})
+        else:
+            np.testing.assert_array_equal(validator.validate_row({"features": row}), expected)
@@ -0,0 +1,62 @@
+# ============================================================
+# 🧪 Script de test (pytest) : test_variants.py
+#     - Vérifie les variantes allégées (src/variants.py) sur un
+#       petit LightGBM synthétique (aucun modèle enregistré requis)
+#     - Vérifie le choix de l'emplacement servi par requête
+# ============================================================
+
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
+
+lgb = pytest.importorskip("lightgbm")
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Remonte à la racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.hot_swap import FULL_MODEL, select_slot, variant_of
+from src.tree_compiler import FlatTreeEnsemble, compile_tree_ensemble
+from src.variants import build_variant
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    """🤖 LightGBM de 40 arbres sur des données synthétiques."""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 4))
+    y = X[:, 0] * 2 + np.sin(X[:, 1]) + rng.normal(scale=0.1, size=400)
+    return lgb.LGBMRegressor(n_estimators=40, num_leaves=8, verbose=-1).fit(X, y), X
+
+
+def test_float32_variant_stays_close_to_full_model(fitted):
+    """🪶 Tables float32 : prédictions proches du modèle complet, aller-retour des tables conservé."""
+    model, X = fitted
+    variant = build_variant("float32", model, X)
+    assert variant.ensemble.threshold.dtype == np.float32
+    np.testing.assert_allclose(variant.predict(X), model.predict(X), atol=1e-4)
+    reloaded = FlatTreeEnsemble.from_arrays(variant.ensemble.to_arrays())
+    assert reloaded.precision == "float32"
+    np.testing.assert_array_equal(compile_tree_ensemble(variant).predict(X), variant.predict(X))
+
+
+def test_first_n_and_distilled_variants(fitted):
+    """✂️ Premiers arbres = prédiction LightGBM tronquée ; 🎓 distillé = arbre de profondeur bornée."""
+    model, X = fitted
+    first = build_variant("first_n", model, X, first_n=10)
+    np.testing.assert_allclose(first.predict(X), model.predict(X, num_iteration=10))
+    assert model.booster_.num_trees() == 40  # Modèle complet intact
+
+    distilled = build_variant("distilled", model, X, depth=3)
+    assert distilled.get_depth() <= 3
+    with pytest.raises(ValueError, match="inconnue"):
+        build_variant("int8", model, X)
+
+
+def test_select_slot_defaults_to_full_model_and_rejects_unknown_variant():
+    """🎯 Sans `variant` : modèle complet ; variante non servie : erreur listant les disponibles."""
+    slots = {FULL_MODEL: "full-slot", "distilled": "distilled-slot"}
+    assert select_slot(slots, variant_of({"features": {}})) == "full-slot"
+    assert select_slot(slots, variant_of({"variant": "distilled"})) == "distilled-slot"
+    with pytest.raises(ValueError, match="distilled"):
+        select_slot(slots, "first_n")
@@ -0,0 +1,87 @@
+# ============================================================
+# 🧪 Script de test (pytest) : test_what_if.py
+#     - Vérifie le développement des scénarios « what-if »
+#       (src/what_if.py) contre une boucle ligne à ligne
+#     - Utilise un petit modèle linéaire (aucun store BentoML requis)
+# ============================================================
+
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # 📍 Remonte à la racine du projet
+sys.path.append(str(BASE_DIR))
+
+from src.validation import FeatureValidator
+from src.what_if import WhatIfPlan, predict_scenarios
+
+FEATURES = ["site_eui", "gas_ratio", "electricity_ratio"]
+SPEC = {
+    "scenarios": [{"name": "gaz -0.1", "changes": {"gas_ratio": -0.1}},
+                  {"changes": {"electricity_ratio": {"scale": 1.1, "delta": 0.01}, "site_eui": {"set": 0.5}}}],
+    "grid": {"gas_ratio": [0.0, 0.5], "electricity_ratio": [0.2, 0.4, 0.6]},
+}
+
+
+@pytest.fixture(scope="module")
+def base():
+    """📂 20 bâtiments synthétiques (ratios dans [0, 1])."""
+    return np.random.default_rng(5).uniform(size=(20, 3))
+
+
+def test_expanded_matrix_matches_row_by_row_scenarios(base):
+    """🔀 Base puis scénarios explicites puis grille (produit cartésien), comme une boucle naïve."""
+    plan = WhatIfPlan.from_spec(SPEC, FEATURES, n_rows=len(base))
+    assert plan.n_scenarios == 2 + 2 * 3
+    assert plan.names[:3] == ["gaz -0.1", "scenario_1", "gas_ratio=0, electricity_ratio=0.2"]
+
+    gas_down, mixed = base.copy(), base.copy()
+    gas_down[:, 1] -= 0.1
+    mixed[:, 2] = mixed[:, 2] * 1.1 + 0.01
+    mixed[:, 0] = 0.5
+    expected = [base, gas_down, mixed]
+    for gas in [0.0, 0.5]:
+        for electricity in [0.2, 0.4, 0.6]:
+            block = base.copy()
+            block[:, 1], block[:, 2] = gas, electricity
+            expected.append(block)
+    np.testing.assert_allclose(plan.matrix(base), np.concatenate(expected))
+
+
+def test_deltas_from_a_single_model_call(base):
+    """📉 Écarts à la base = pente × changement pour un modèle linéaire ; un seul appel `predict`."""
+    model = LinearRegression().fit(base, base @ np.array([2.0, -3.0, 1.0]))
+    calls = []
+
+    def predict(matrix):
+        calls.append(len(matrix))
+        return model.predict(matrix)
+
+    summary = predict_scenarios(predict, base, {"scenarios": SPEC["scenarios"][:1]}, FEATURES)
+    assert calls == [2 * len(base)] and summary["rows_evaluated"] == 2 * len(base)
+    np.testing.assert_allclose(summary["scenarios"][0]["deltas"], 0.3, atol=1e-9)
+    assert summary["scenarios"][0]["mean_delta"] == pytest.approx(0.3)
+
+    light = predict_scenarios(model.predict, base, SPEC, FEATURES, details=False)
+    assert "baseline" not in light and "deltas" not in light["scenarios"][0]
+
+
+def test_invalid_plans_are_rejected_before_prediction(base):
+    """🛡️ Feature inconnue, plan trop grand, scénario hors plages : erreurs explicites."""
+    with pytest.raises(ValueError, match="inconnues"):
+        WhatIfPlan.from_spec({"grid": {"floors": [1, 2]}}, FEATURES)
+    with pytest.raises(ValueError, match="maximum"):
+        WhatIfPlan.from_spec(SPEC, FEATURES, n_rows=1000, max_rows=5000)
+    huge = {"grid": {"site_eui": range(200), "gas_ratio": range(200), "electricity_ratio": range(100)}}
+    with pytest.raises(ValueError, match="4000001 lignes"):  # Rejeté sans développer les 4 M combinaisons
+        WhatIfPlan.from_spec(huge, FEATURES)
+    with pytest.raises(ValueError, match="Aucun scénario"):
+        WhatIfPlan.from_spec({}, FEATURES)
+
+    validator = FeatureValidator(FEATURES, {"min": [0, 0, 0], "max": [1, 1, 1]}, margin=0.0)
+    plan = WhatIfPlan.from_spec({"scenarios": [{"name": "ok", "changes": {"gas_ratio": {"scale": 0.5}}},
+                                               {"name": "trop", "changes": {"gas_ratio": 2.0}}]}, FEATURES)
+    with pytest.raises(ValueError, match="Scénario 'trop'"):
+        plan.matrix(base, validator)